@@ -1,5 +1,17 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from jsondb import router
+from jsondb import router, tokens, revoked_tokens
 
-app = FastAPI(root_path="/mydb")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tokens.open()
+    revoked_tokens.open()
+    yield
+    # Commit writes still waiting for their group fsync
+    await tokens.close()
+    await revoked_tokens.close()
+
+
+app = FastAPI(root_path="/mydb", lifespan=lifespan)
 app.include_router(router=router)
@@ -1,40 +1,29 @@
-import os
-import json
-from threading import Lock
-from typing import Any, Dict
-from pydantic import BaseModel
+import time
+from typing import Any, Dict, List
+from pydantic import BaseModel, StrictFloat
 from fastapi import APIRouter, status
 from utils.standart_response import standard_response
 from http import HTTPStatus
+from logstore import LogStore
 
 router = APIRouter(prefix="/data", tags=["data"])
-DB_FILE = "data/simple_db.json"
-db_lock = Lock()
+# Loaded once and kept in memory; writes are appended to the `.jsonl` logs.
+# The `.json` files of earlier versions are imported on first start.
+tokens = LogStore("data/simple_db.jsonl", legacy_path="data/simple_db.json")
+revoked_tokens = LogStore("data/revoked.jsonl", legacy_path="data/revoked.json")
 
 
 class DataModel(BaseModel):
     data: Dict[str, Any] | None
 
 
-def load_db() -> Dict[str, Any]:
-    """Load the JSON database from file."""
-    dir_path = "/".join(DB_FILE.split("/")[:-1])
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path)
+class RevokedModel(BaseModel):
+    # `{jti: exp}`; a non-numeric `exp` is answered with 422
+    data: Dict[str, StrictFloat] | None
 
-    if not os.path.exists(DB_FILE):
-        with open(DB_FILE, "w") as f:
-            json.dump({}, f)
-        return {}
 
-    with open(DB_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def save_db(db: Dict[str, Any]) -> None:
-    """Save the JSON database to file."""
-    with open(DB_FILE, "w", encoding="utf-8") as f:
-        json.dump(db, f, indent=4)
+class BatchModel(BaseModel):
+    client_ids: List[str]
 
 
 @router.get("/token")
@@ -42,22 +31,40 @@ async def get_data(client_id: str):
     """
     Retrieve data for a given client_id from the JSON database.
     """
-    with db_lock:
-        db = load_db()
-        if client_id not in db:
-            return standard_response(
-                status="error",
-                message="Client ID not found",
-                code=HTTPStatus.NOT_FOUND,
-                details={"client_id": client_id},
-            )
+    data = tokens.get(client_id)
+    if data is None:
         return standard_response(
-            status="success",
-            message="Data retrieved successfully",
-            code=HTTPStatus.OK,
-            data=db[client_id],
+            status="error",
+            message="Client ID not found",
+            code=HTTPStatus.NOT_FOUND,
             details={"client_id": client_id},
         )
+    return standard_response(
+        status="success",
+        message="Data retrieved successfully",
+        code=HTTPStatus.OK,
+        data=data,
+        details={"client_id": client_id},
+    )
+
+
+@router.post("/token/batch")
+async def get_data_batch(payload: BatchModel):
+    """
+    Retrieve data for several client_ids at once, as `{client_id: data}`.
+    Unknown client_ids are left out of the result.
+    """
+    data = {
+        client_id: data
+        for client_id in payload.client_ids
+        if (data := tokens.get(client_id)) is not None
+    }
+    return standard_response(
+        status="success",
+        message="Data retrieved successfully",
+        code=HTTPStatus.OK,
+        data=data,
+    )
 
 
 @router.post("/token", response_model=DataModel)
@@ -65,13 +72,62 @@ async def save_data(client_id: str, payload: DataModel):
     """
     Save or update data for a given client_id in the JSON database.
     """
-    with db_lock:
-        db = load_db()
-        db[client_id] = payload.data
-        save_db(db)
+    await tokens.set(client_id, payload.data)
     return standard_response(
         status="success",
         message="Data saved successfully",
         code=HTTPStatus.OK,
         data={"client_id": client_id} | payload.data,
     )
+
+
+@router.put("/token/batch")
+async def save_data_batch(payload: DataModel):
+    """
+    Save or update data for several client_ids at once.
+    Payload data is `{client_id: {"access_token": ..., "refresh_token": ...}}`;
+    the whole batch is appended to the log with a single fsync.
+    """
+    await tokens.set_many(payload.data or {})
+    return standard_response(
+        status="success",
+        message="Data saved successfully",
+        code=HTTPStatus.OK,
+        data={"saved": len(payload.data or {})},
+    )
+
+
+@router.get("/revoked")
+async def get_revoked():
+    """
+    Retrieve the revoked token ids (`jti`) with their expiration, as `{jti: exp}`.
+    Used by fastauth stateless verification to sync its revocation list.
+    """
+    now = time.time()
+    expired = [jti for jti, exp in revoked_tokens.items() if exp <= now]
+    if expired:
+        await revoked_tokens.delete_many(expired)
+    return standard_response(
+        status="success",
+        message="Revoked tokens retrieved successfully",
+        code=HTTPStatus.OK,
+        data=dict(revoked_tokens.items()),
+    )
+
+
+@router.post("/revoked")
+async def revoke(payload: RevokedModel):
+    """
+    Add revoked token ids to the database. Payload data is `{jti: exp}`;
+    entries whose `exp` is already past are dropped.
+    """
+    now = time.time()
+    await revoked_tokens.set_many(
+        {jti: exp for jti, exp in (payload.data or {}).items() if exp > now}
+    )
+    return standard_response(
+        status="success",
+        message="Tokens revoked successfully",
+        code=HTTPStatus.OK,
+        data=payload.data,
+    )
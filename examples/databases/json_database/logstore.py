@@ -0,0 +1,209 @@
+import os
+import json
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class LogStore:
+    """
+    Key/value store kept in memory and persisted as an append-only JSONL log.
+
+    - Reads are dict lookups: O(1) whatever the number of keys, no file access.
+    - Each write updates the dict and appends one line
+      (`{"op": "set", "key": ..., "value": ...}` or `{"op": "del", "key": ...}`).
+      Lines are written in groups: writers arriving while the previous group is being
+      written (plus `commit_interval` seconds, if set) share one `write` + `fsync`,
+      done in a thread, and `set` / `delete_many` return once their group is on disk.
+    - When the log holds more than `compact_ratio` lines per live key (and at least
+      `compact_min_records`), it is rewritten as one `set` line per key and swapped in
+      atomically with `os.replace`.
+    - On startup the log is replayed; a truncated last line (crash while appending)
+      is dropped, and other unreadable lines are logged and skipped. A legacy JSON
+      file (`{key: value}`) is imported if no log exists yet.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        legacy_path: str | None = None,
+        commit_interval: float = 0.0,
+        compact_ratio: float = 2.0,
+        compact_min_records: int = 10000,
+    ):
+        self.path: str = path
+        self.legacy_path: str | None = legacy_path
+        self.commit_interval: float = commit_interval
+        self.compact_ratio: float = compact_ratio
+        self.compact_min_records: int = compact_min_records
+
+        self.data: Dict[str, Any] = {}
+        self.records: int = 0
+        self.__file = None
+        self.__loaded: bool = False
+        self.__buffer: List[str] = []
+        self.__waiters: List[asyncio.Future] = []
+        self.__wakeup: asyncio.Event | None = None
+        self.__task: asyncio.Task | None = None
+        self.__closing: bool = False
+
+    def open(self) -> None:
+        """Load the log (once). Called implicitly by the first read or write."""
+        if self.__loaded:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(self.path):
+            self.__replay()
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+            self.__rewrite(self.data)
+
+        self.__file = open(self.path, "a", encoding="utf-8")
+        self.__loaded = True
+
+    async def close(self) -> None:
+        """Commit pending writes, stop the commit task and close the log."""
+        if self.__task is not None:
+            self.__closing = True
+            self.__wakeup.set()
+            await self.__task
+            self.__task = None
+            self.__closing = False
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        self.__loaded = False
+
+    def __len__(self) -> int:
+        self.open()
+        return len(self.data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.open()
+        return self.data.get(key, default)
+
+    def items(self):
+        self.open()
+        return self.data.items()
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.set_many({key: value})
+
+    async def set_many(self, values: Dict[str, Any]) -> None:
+        self.open()
+        self.data.update(values)
+        await self.__append(
+            json.dumps({"op": "set", "key": key, "value": value}) + "\n"
+            for key, value in values.items()
+        )
+
+    async def delete_many(self, keys: List[str]) -> None:
+        self.open()
+        deleted = [key for key in keys if self.data.pop(key, None) is not None]
+        if deleted:
+            await self.__append(
+                json.dumps({"op": "del", "key": key}) + "\n" for key in deleted
+            )
+
+    async def __append(self, lines) -> None:
+        loop = asyncio.get_running_loop()
+        self.__buffer.extend(lines)
+        waiter: asyncio.Future = loop.create_future()
+        self.__waiters.append(waiter)
+
+        if self.__task is None:
+            self.__wakeup = asyncio.Event()
+            self.__task = loop.create_task(self.__commit_loop())
+        self.__wakeup.set()
+        await waiter
+
+    async def __commit_loop(self) -> None:
+        while True:
+            await self.__wakeup.wait()
+            self.__wakeup.clear()
+            if self.commit_interval and not self.__closing:
+                # Let more concurrent writers join this group
+                await asyncio.sleep(self.commit_interval)
+            await self.__commit()
+            if self.__closing:
+                return
+            if self.__should_compact():
+                await self.__compact()
+
+    async def __commit(self) -> None:
+        lines, waiters = self.__buffer, self.__waiters
+        if not waiters:
+            return
+        self.__buffer, self.__waiters = [], []
+        try:
+            await asyncio.to_thread(self.__write, "".join(lines))
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        self.records += len(lines)
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def __write(self, text: str) -> None:
+        self.__file.write(text)
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+    def __should_compact(self) -> bool:
+        return self.records >= self.compact_min_records and self.records > (
+            self.compact_ratio * max(len(self.data), 1)
+        )
+
+    async def __compact(self) -> None:
+        # Writes arriving meanwhile wait in the buffer and go to the new file; the old
+        # handle stays open until `os.replace` has swapped the files
+        snapshot: Dict[str, Any] = dict(self.data)
+        await asyncio.to_thread(self.__rewrite, snapshot)
+        old_file, self.__file = self.__file, open(self.path, "a", encoding="utf-8")
+        old_file.close()
+
+    def __rewrite(self, snapshot: Dict[str, Any]) -> None:
+        temp_path: str = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for key, value in snapshot.items():
+                f.write(json.dumps({"op": "set", "key": key, "value": value}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.records = len(snapshot)
+
+    def __replay(self) -> None:
+        good_offset: int = 0
+        with open(self.path, "rb") as f:
+            for number, line in enumerate(f, start=1):
+                # Every record ends with a newline: only the last line can lack it,
+                # a truncated tail (crash while appending)
+                if not line.endswith(b"\n"):
+                    break
+                good_offset += len(line)
+                try:
+                    record = json.loads(line)
+                    if record["op"] == "set":
+                        self.data[record["key"]] = record["value"]
+                    else:
+                        self.data.pop(record["key"], None)
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"{self.path}:{number}: unreadable record skipped")
+                    continue
+                self.records += 1
+
+        if good_offset < os.path.getsize(self.path):
+            logger.warning(f"{self.path}: truncated last record dropped")
+            with open(self.path, "r+b") as f:
+                f.truncate(good_offset)
@@ -0,0 +1,14 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from sqlitedb import router, database
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.open()
+    yield
+    database.close()
+
+
+app = FastAPI(root_path="/mydb", lifespan=lifespan)
+app.include_router(router=router)
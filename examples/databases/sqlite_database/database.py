@@ -0,0 +1,212 @@
+import os
+import time
+import json
+import sqlite3
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS tokens (
+        client_id TEXT PRIMARY KEY,
+        access_token TEXT NOT NULL,
+        refresh_token TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS revoked (
+        jti TEXT PRIMARY KEY,
+        exp REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS revoked_exp ON revoked (exp)",
+)
+
+SELECT_TOKEN = "SELECT access_token, refresh_token FROM tokens WHERE client_id = ?"
+# One statement for the whole batch: the ids are passed as a single JSON array
+SELECT_TOKENS = """
+    SELECT client_id, access_token, refresh_token FROM tokens
+    WHERE client_id IN (SELECT value FROM json_each(?))
+"""
+UPSERT_TOKEN = """
+    INSERT INTO tokens (client_id, access_token, refresh_token, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (client_id) DO UPDATE SET
+        access_token = excluded.access_token,
+        refresh_token = excluded.refresh_token,
+        updated_at = excluded.updated_at
+"""
+# Keyset pagination: each page is an index range scan, whatever the offset
+EXPORT_PAGE = """
+    SELECT client_id, access_token, refresh_token FROM tokens
+    WHERE client_id > ? ORDER BY client_id LIMIT ?
+"""
+COUNT_TOKENS = "SELECT count(*) FROM tokens"
+SELECT_REVOKED = "SELECT jti, exp FROM revoked WHERE exp > ?"
+INSERT_REVOKED = "INSERT OR REPLACE INTO revoked (jti, exp) VALUES (?, ?)"
+DELETE_EXPIRED = "DELETE FROM revoked WHERE exp <= ?"
+
+
+class TokenDatabase:
+    """
+    Tokens and revoked ids in a SQLite file, queried from a thread pool so the event
+    loop never waits on the disk.
+
+    - WAL journal with `synchronous=NORMAL`: readers never block on the writer, and
+      a commit is an append to the WAL file.
+    - Each worker thread keeps its own connection (SQLite connections are not meant
+      to be shared across threads); statements are reused from its statement cache.
+    - `client_id` is the clustered primary key (`WITHOUT ROWID`), so a lookup is a
+      single B-tree search: O(log n) page reads, most of them from the page cache.
+    - Batch writes run in one transaction, i.e. one WAL commit per batch.
+    """
+
+    def __init__(self, path: str, max_workers: int = 4, cache_size_mb: int = 64):
+        self.path: str = path
+        self.max_workers: int = max_workers
+        self.cache_size_mb: int = cache_size_mb
+        self.__local = threading.local()
+        self.__connections: List[sqlite3.Connection] = []
+        self.__connections_lock = threading.Lock()
+        self.__executor: ThreadPoolExecutor | None = None
+
+    def open(self) -> None:
+        if self.__executor is not None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Create the schema once, before any worker thread connects
+        self.connection()
+        self.__executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="sqlitedb"
+        )
+
+    def close(self) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+        with self.__connections_lock:
+            for connection in self.__connections:
+                connection.close()
+            self.__connections.clear()
+        self.__local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        """The connection of the calling thread, opened on first use."""
+        connection: sqlite3.Connection | None = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=64,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            connection.execute(f"PRAGMA cache_size=-{self.cache_size_mb * 1024}")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self.__local.connection = connection
+            with self.__connections_lock:
+                self.__connections.append(connection)
+        return connection
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """Run `function(connection, *args)` in the thread pool."""
+        self.open()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.__executor, lambda: function(self.connection(), *args)
+        )
+
+    async def get(self, client_id: str) -> Dict[str, str] | None:
+        return await self.run(_get, client_id)
+
+    async def get_many(self, client_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        return await self.run(_get_many, client_ids)
+
+    async def put(self, client_id: str, data: Dict[str, Any]) -> None:
+        await self.run(_put_many, {client_id: data})
+
+    async def put_many(self, data: Dict[str, Dict[str, Any]]) -> None:
+        await self.run(_put_many, data)
+
+    async def export_page(self, after: str, limit: int) -> List[Tuple[str, str, str]]:
+        return await self.run(_export_page, after, limit)
+
+    async def count(self) -> int:
+        return await self.run(_count)
+
+    async def revoked(self) -> Dict[str, float]:
+        return await self.run(_revoked, time.time())
+
+    async def revoke_many(self, data: Dict[str, float]) -> None:
+        await self.run(_revoke_many, data, time.time())
+
+
+def _get(connection: sqlite3.Connection, client_id: str) -> Dict[str, str] | None:
+    row = connection.execute(SELECT_TOKEN, (client_id,)).fetchone()
+    if row is None:
+        return None
+    return {"access_token": row[0], "refresh_token": row[1]}
+
+
+def _get_many(
+    connection: sqlite3.Connection, client_ids: List[str]
+) -> Dict[str, Dict[str, str]]:
+    rows = connection.execute(SELECT_TOKENS, (json.dumps(client_ids),))
+    return {
+        client_id: {"access_token": access_token, "refresh_token": refresh_token}
+        for client_id, access_token, refresh_token in rows
+    }
+
+
+def _put_many(connection: sqlite3.Connection, data: Dict[str, Dict[str, Any]]) -> None:
+    now: float = time.time()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        connection.executemany(
+            UPSERT_TOKEN,
+            (
+                (client_id, tokens["access_token"], tokens["refresh_token"], now)
+                for client_id, tokens in data.items()
+            ),
+        )
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def _export_page(
+    connection: sqlite3.Connection, after: str, limit: int
+) -> List[Tuple[str, str, str]]:
+    return connection.execute(EXPORT_PAGE, (after, limit)).fetchall()
+
+
+def _count(connection: sqlite3.Connection) -> int:
+    return connection.execute(COUNT_TOKENS).fetchone()[0]
+
+
+def _revoked(connection: sqlite3.Connection, now: float) -> Dict[str, float]:
+    connection.execute(DELETE_EXPIRED, (now,))
+    return dict(connection.execute(SELECT_REVOKED, (now,)).fetchall())
+
+
+def _revoke_many(connection: sqlite3.Connection, data: Dict[str, float], now: float) -> None:
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        connection.executemany(
+            INSERT_REVOKED, ((jti, exp) for jti, exp in data.items() if exp > now)
+        )
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
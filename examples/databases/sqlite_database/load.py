@@ -0,0 +1,175 @@
+"""
+Fill the SQLite database example with synthetic clients and measure the API at that size.
+
+1. Inserts rows directly into the database file (no HTTP), in large transactions,
+   until the table holds `--rows` clients (`client-000000000`, `client-000000001`, ...).
+2. Against the running server at `--url`: random single lookups, batch lookups,
+   batch saves and an export, each with `--concurrency` concurrent requests,
+   printing throughput and latency percentiles.
+
+Run (in `examples/databases/sqlite_database`):
+    uvicorn api:app --port 6789
+    python load.py --rows 1000000 [--url http://127.0.0.1:6789/mydb/data]
+        [--requests 10000] [--concurrency 32] [--batch-size 100] [--skip-http]
+
+Rerunning with a larger `--rows` only inserts the missing clients.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import secrets
+import sqlite3
+import statistics
+import sys
+import time
+
+import httpx
+
+from database import SCHEMA, UPSERT_TOKEN
+
+INSERT_CHUNK = 50000
+
+
+def client_id(index: int) -> str:
+    return f"client-{index:09d}"
+
+
+def fake_token(client: str) -> str:
+    # Same length as an HS256 token pair member issued by fastauth (~240 characters)
+    return f"eyJ.{client}.{secrets.token_urlsafe(160)}"
+
+
+def populate(path: str, rows: int) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    for statement in SCHEMA:
+        connection.execute(statement)
+
+    existing: int = connection.execute("SELECT count(*) FROM tokens").fetchone()[0]
+    if existing >= rows:
+        print(f"{path}: {existing:,} clients already present")
+        connection.close()
+        return
+
+    print(f"{path}: inserting {rows - existing:,} clients ({existing:,} present)")
+    start: float = time.perf_counter()
+    now: float = time.time()
+    for first in range(existing, rows, INSERT_CHUNK):
+        last: int = min(first + INSERT_CHUNK, rows)
+        connection.execute("BEGIN")
+        connection.executemany(
+            UPSERT_TOKEN,
+            (
+                (client, fake_token(client), fake_token(client), now)
+                for client in map(client_id, range(first, last))
+            ),
+        )
+        connection.execute("COMMIT")
+        elapsed: float = time.perf_counter() - start
+        print(f"  {last:>12,} rows  {(last - existing) / elapsed:>10,.0f} rows/s", end="\r")
+    connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    connection.close()
+    print(f"\n  done in {time.perf_counter() - start:.1f}s, {os.path.getsize(path) / 2**20:,.0f} MiB")
+
+
+async def measure(name: str, call, requests: int, concurrency: int, items: int = 1) -> None:
+    """Run `call()` `requests` times from `concurrency` tasks and print the latencies."""
+    latencies: list[float] = []
+    counter = iter(range(requests))
+
+    async def worker():
+        for _ in counter:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start: float = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed: float = time.perf_counter() - start
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(
+        f"{name:<22} {requests / elapsed:>10,.0f} req/s {requests * items / elapsed:>12,.0f} rows/s"
+        f"  p50 {quantiles[49] * 1e3:>7.2f} ms  p95 {quantiles[94] * 1e3:>7.2f} ms"
+        f"  p99 {quantiles[98] * 1e3:>7.2f} ms"
+    )
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=30) as client:
+        response = await client.get("/stats")
+        response.raise_for_status()
+        clients: int = response.json()["data"]["clients"]
+        print(f"\n{args.url}: {clients:,} clients, concurrency {args.concurrency}\n")
+        if clients == 0:
+            raise SystemExit("The server database is empty; is it using the same file?")
+
+        def random_id() -> str:
+            return client_id(random.randrange(clients))
+
+        async def lookup():
+            response = await client.get("/token", params={"client_id": random_id()})
+            if response.status_code != 200:
+                raise RuntimeError(f"lookup answered {response.status_code}")
+
+        async def lookup_unknown():
+            response = await client.get("/token", params={"client_id": "unknown-" + secrets.token_hex(8)})
+            if response.status_code != 404:
+                raise RuntimeError(f"unknown lookup answered {response.status_code}")
+
+        async def lookup_batch():
+            ids = [random_id() for _ in range(args.batch_size)]
+            response = await client.post("/token/batch", json={"client_ids": ids})
+            response.raise_for_status()
+
+        async def save_batch():
+            # Overwrites existing clients: the table size does not change
+            ids = [random_id() for _ in range(args.batch_size)]
+            data = {cid: {"access_token": fake_token(cid), "refresh_token": fake_token(cid)} for cid in ids}
+            response = await client.put("/token/batch", json={"data": data})
+            response.raise_for_status()
+
+        batches: int = max(1, args.requests // args.batch_size)
+        await measure("GET /token", lookup, args.requests, args.concurrency)
+        await measure("GET /token (unknown)", lookup_unknown, args.requests, args.concurrency)
+        await measure(f"POST /token/batch x{args.batch_size}", lookup_batch, batches, args.concurrency, args.batch_size)
+        await measure(f"PUT /token/batch x{args.batch_size}", save_batch, batches, args.concurrency, args.batch_size)
+
+        exported: int = min(clients, args.export)
+        start: float = time.perf_counter()
+        lines: int = 0
+        async with client.stream("GET", "/export", params={"limit": exported}) as response:
+            async for _ in response.aiter_lines():
+                lines += 1
+        elapsed: float = time.perf_counter() - start
+        print(f"{'GET /export':<22} {lines:>10,} rows in {elapsed:.2f}s ({lines / elapsed:,.0f} rows/s)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--path", default=os.environ.get("SQLITE_DATABASE_PATH", "data/tokens.db"))
+    parser.add_argument("--url", default="http://127.0.0.1:6789/mydb/data")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--export", type=int, default=100000, help="rows streamed by the export test")
+    parser.add_argument("--skip-http", action="store_true", help="only fill the database")
+    args = parser.parse_args()
+
+    populate(args.path, args.rows)
+    if not args.skip_http:
+        asyncio.run(benchmark(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
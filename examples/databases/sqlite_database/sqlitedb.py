@@ -0,0 +1,193 @@
+import os
+import json
+from typing import Any, Dict, List
+from pydantic import BaseModel, StrictFloat
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from utils.standart_response import standard_response
+from http import HTTPStatus
+from database import TokenDatabase
+
+router = APIRouter(prefix="/data", tags=["data"])
+database = TokenDatabase(os.environ.get("SQLITE_DATABASE_PATH", "data/tokens.db"))
+
+EXPORT_PAGE_SIZE = 5000
+
+
+class DataModel(BaseModel):
+    data: Dict[str, Any] | None
+
+
+class RevokedModel(BaseModel):
+    # `{jti: exp}`; a non-numeric `exp` is answered with 422
+    data: Dict[str, StrictFloat] | None
+
+
+class BatchModel(BaseModel):
+    client_ids: List[str]
+
+
+@router.get("/token")
+async def get_data(client_id: str):
+    """
+    Retrieve data for a given client_id.
+    """
+    data = await database.get(client_id)
+    if data is None:
+        return standard_response(
+            status="error",
+            message="Client ID not found",
+            code=HTTPStatus.NOT_FOUND,
+            details={"client_id": client_id},
+        )
+    return standard_response(
+        status="success",
+        message="Data retrieved successfully",
+        code=HTTPStatus.OK,
+        data=data,
+        details={"client_id": client_id},
+    )
+
+
+@router.post("/token/batch")
+async def get_data_batch(payload: BatchModel):
+    """
+    Retrieve data for several client_ids at once, as `{client_id: data}`, with a
+    single query. Unknown client_ids are left out of the result.
+    """
+    data = await database.get_many(payload.client_ids)
+    return standard_response(
+        status="success",
+        message="Data retrieved successfully",
+        code=HTTPStatus.OK,
+        data=data,
+    )
+
+
+@router.post("/token", response_model=DataModel)
+async def save_data(client_id: str, payload: DataModel):
+    """
+    Save or update data for a given client_id.
+    """
+    if not payload.data or "access_token" not in payload.data or "refresh_token" not in payload.data:
+        return standard_response(
+            status="error",
+            message="`access_token` and `refresh_token` are required",
+            code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            details={"client_id": client_id},
+        )
+    await database.put(client_id, payload.data)
+    return standard_response(
+        status="success",
+        message="Data saved successfully",
+        code=HTTPStatus.OK,
+        data={"client_id": client_id} | payload.data,
+    )
+
+
+@router.put("/token/batch")
+async def save_data_batch(payload: DataModel):
+    """
+    Save or update data for several client_ids at once, in one transaction.
+    Payload data is `{client_id: {"access_token": ..., "refresh_token": ...}}`.
+    """
+    data: Dict[str, Any] = payload.data or {}
+    invalid = [
+        client_id
+        for client_id, tokens in data.items()
+        if not isinstance(tokens, dict) or "access_token" not in tokens or "refresh_token" not in tokens
+    ]
+    if invalid:
+        return standard_response(
+            status="error",
+            message="`access_token` and `refresh_token` are required",
+            code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            details={"client_ids": invalid[:100]},
+        )
+    await database.put_many(data)
+    return standard_response(
+        status="success",
+        message="Data saved successfully",
+        code=HTTPStatus.OK,
+        data={"saved": len(data)},
+    )
+
+
+@router.get("/export")
+async def export_data(
+    after: str = "",
+    limit: int | None = Query(default=None, ge=1),
+):
+    """
+    Stream every stored client as NDJSON, one
+    `{"client_id": ..., "access_token": ..., "refresh_token": ...}` per line, ordered by
+    client_id. Rows are read in pages of `EXPORT_PAGE_SIZE`, so memory stays flat
+    whatever the table size. `after` resumes an interrupted export from the last
+    client_id received; `limit` caps the number of rows.
+    """
+
+    async def rows():
+        last: str = after
+        remaining: int | None = limit
+        while remaining is None or remaining > 0:
+            size: int = EXPORT_PAGE_SIZE if remaining is None else min(EXPORT_PAGE_SIZE, remaining)
+            page = await database.export_page(last, size)
+            if not page:
+                return
+            yield "".join(
+                json.dumps(
+                    {"client_id": client_id, "access_token": access_token, "refresh_token": refresh_token}
+                )
+                + "\n"
+                for client_id, access_token, refresh_token in page
+            )
+            last = page[-1][0]
+            if remaining is not None:
+                remaining -= len(page)
+            if len(page) < size:
+                return
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@router.get("/stats")
+async def get_stats():
+    """
+    Number of stored clients.
+    """
+    return standard_response(
+        status="success",
+        message="Stats retrieved successfully",
+        code=HTTPStatus.OK,
+        data={"clients": await database.count()},
+    )
+
+
+@router.get("/revoked")
+async def get_revoked():
+    """
+    Retrieve the revoked token ids (`jti`) with their expiration, as `{jti: exp}`.
+    Expired entries are deleted. Used by fastauth stateless verification.
+    """
+    revoked = await database.revoked()
+    return standard_response(
+        status="success",
+        message="Revoked tokens retrieved successfully",
+        code=HTTPStatus.OK,
+        data=revoked,
+    )
+
+
+@router.post("/revoked")
+async def revoke(payload: RevokedModel):
+    """
+    Add revoked token ids. Payload data is `{jti: exp}`; entries whose `exp` is
+    already past are dropped.
+    """
+    await database.revoke_many(payload.data or {})
+    return standard_response(
+        status="success",
+        message="Tokens revoked successfully",
+        code=HTTPStatus.OK,
+        data=payload.data,
+    )
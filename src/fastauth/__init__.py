@@ -3,22 +3,69 @@ Fastauth — Token-based authentication for FastAPI.
 ### Features
 - `Fastauth`: adds middleware, token routes, and OpenAPI schema.
 - `TokenRouter`: endpoints for generating/refreshing tokens.
+- `MetricsRouter`: master-protected Prometheus metrics endpoint.
+- `InvalidationRouter`: receives token invalidations from peer nodes.
 - `AccessTokenMiddleware`: validates ACCESS-TOKEN and MASTER-TOKEN.
+- `AccessTokenASGIMiddleware`: pure ASGI variant of `AccessTokenMiddleware`.
 - `websocket_middleware` / `TokenType`: WebSocket protection.
 
+Names are imported on first access (PEP 562), so `import fastauth` alone does not
+load FastAPI, the config file or the logging handlers.
+
 [documentation](https://github.com/rb58853/fastauth-api)
 """
 
-from .routers.auth import TokenRouter
-from .app import Fastauth, FastauthSettings
-from .openapi.openapi import FastauthOpenAPI
-from .middleware import AccessTokenMiddleware, websocket_middleware, TokenType
+import importlib
+from typing import TYPE_CHECKING
+
+_EXPORTS: dict[str, str] = {
+    "Fastauth": ".app",
+    "FastauthSettings": ".app",
+    "TokenRouter": ".routers.auth",
+    "MetricsRouter": ".routers.metrics",
+    "InvalidationRouter": ".routers.invalidation",
+    "FastauthOpenAPI": ".openapi.openapi",
+    "AccessTokenMiddleware": ".middleware",
+    "AccessTokenASGIMiddleware": ".middleware",
+    "websocket_middleware": ".middleware",
+    "TokenType": ".middleware",
+}
+
+if TYPE_CHECKING:
+    from .routers.auth import TokenRouter
+    from .routers.metrics import MetricsRouter
+    from .routers.invalidation import InvalidationRouter
+    from .app import Fastauth, FastauthSettings
+    from .openapi.openapi import FastauthOpenAPI
+    from .middleware import (
+        AccessTokenMiddleware,
+        AccessTokenASGIMiddleware,
+        websocket_middleware,
+        TokenType,
+    )
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    # Cache it: next accesses are plain module attribute lookups
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_EXPORTS])
 
 
 __all__ = [
     "Fastauth",
     "TokenRouter",
+    "MetricsRouter",
+    "InvalidationRouter",
     "AccessTokenMiddleware",
+    "AccessTokenASGIMiddleware",
     "FastauthOpenAPI",
     "websocket_middleware",
     "TokenType",
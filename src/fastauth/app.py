@@ -1,23 +1,86 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter
-from .middleware import AccessTokenMiddleware
+from .middleware import AccessTokenMiddleware, AccessTokenASGIMiddleware
+from .middleware.policy import compile_policy
 from .openapi import FastauthOpenAPI
-from .routers import TokenRouter
-from .config import DatabaseConfig, ConfigServer, TokenConfig
+from .routers import TokenRouter, MetricsRouter, InvalidationRouter
+from .client_db.stores import token_store
+from .client_db.revocation import revocation_list
+from .client_db.sessions import websocket_sessions
+from .client_db.shared_cache import shared_tokens
+from .client_db.invalidation import invalidation_bus
+from .reload import config_watcher
+from .config import (
+    DatabaseConfig,
+    ConfigServer,
+    TokenConfig,
+    CacheConfig,
+    InvalidationConfig,
+    MetricsConfig,
+    configure_logging,
+    load_config,
+)
 from pydantic import BaseModel
 
 
 class FastauthSettings(BaseModel):
     app_name: str = "fastauth-api"
     database_api_path: str | None = None
+    token_store: str | None = None
+    sqlite_path: str | None = None
     master_token: str | None = None
     cryptography_key: str | None = None
     headers: dict | None = None
     master_token_paths: list | None = []
     access_token_paths: list | None = []
+    asgi_middleware: bool | None = None
+    websocket_denial: str | None = None
+    websocket_sessions: bool | None = None
+    openapi_prebuild: bool | None = None
+    config_reload_interval: float | None = None
+    stateless_verification: bool | None = None
+    revocation_sync_interval: float | None = None
+    jwt_codec: str | None = None
+    bulk_chunk_size: int | None = None
+    bulk_process_threshold: int | None = None
+    bulk_max_workers: int | None = None
+    database_timeout: float | None = None
+    database_max_connections: int | None = None
+    database_max_keepalive_connections: int | None = None
+    database_keepalive_expiry: float | None = None
+    database_deadline: float | None = None
+    database_breaker_failures: int | None = None
+    database_breaker_reset: float | None = None
+    database_batch_window_ms: float | None = None
+    database_batch_max_size: int | None = None
+    token_cache_ttl: float | None = None
+    token_cache_negative_ttl: float | None = None
+    token_cache_max_size: int | None = None
+    token_cache_grace: float | None = None
+    decoded_token_cache_size: int | None = None
+    shared_token_cache: bool | None = None
+    shared_token_cache_path: str | None = None
+    shared_token_cache_slots: int | None = None
+    invalidation_transports: list[str] | None = None
+    invalidation_socket_dir: str | None = None
+    invalidation_multicast_group: str | None = None
+    invalidation_multicast_port: int | None = None
+    invalidation_multicast_ttl: int | None = None
+    invalidation_peers: list[str] | None = None
+    invalidation_http_timeout: float | None = None
+    invalidation_max_age: float | None = None
+    metrics: bool | None = None
+    log_file: bool | None = None
+    log_level: str | None = None
+    request_log_level: str | None = None
+    request_log_sample_rate: float | None = None
 
 
 class Fastauth:
     def __init__(self, settings: FastauthSettings | dict | None = None):
+        # The config file is read here at the latest, before settings override it
+        load_config()
         if isinstance(settings, dict):
             settings = FastauthSettings(**settings)
         self.__update_settings(settings)
@@ -32,6 +95,8 @@ class Fastauth:
             access_token_paths = settings.access_token_paths or []
 
             DatabaseConfig.PATH = database_path or DatabaseConfig.PATH
+            DatabaseConfig.STORE = settings.token_store or DatabaseConfig.STORE
+            DatabaseConfig.SQLITE_PATH = settings.sqlite_path or DatabaseConfig.SQLITE_PATH
             ConfigServer.MASTER_TOKEN = master_token or ConfigServer.MASTER_TOKEN
             TokenConfig.CRYPTOGRAPHY_KEY = (
                 cryptography_key or TokenConfig.CRYPTOGRAPHY_KEY
@@ -40,6 +105,104 @@ class Fastauth:
             ConfigServer.ACCESS_TOKEN_PATHS = (
                 access_token_paths + ConfigServer.ACCESS_TOKEN_PATHS
             )
+            # Kept over the config file when it is reloaded
+            config_watcher.overrides = {
+                "master_token": master_token,
+                "cryptography_key": cryptography_key,
+                "master_token_paths": master_token_paths,
+                "access_token_paths": access_token_paths,
+            }
+
+            if settings.asgi_middleware is not None:
+                ConfigServer.ASGI_MIDDLEWARE = settings.asgi_middleware
+            if settings.websocket_denial is not None:
+                ConfigServer.WEBSOCKET_DENIAL = settings.websocket_denial
+            if settings.websocket_sessions is not None:
+                ConfigServer.WEBSOCKET_SESSIONS = settings.websocket_sessions
+            if settings.openapi_prebuild is not None:
+                ConfigServer.OPENAPI_PREBUILD = settings.openapi_prebuild
+            if settings.config_reload_interval is not None:
+                ConfigServer.CONFIG_RELOAD_INTERVAL = settings.config_reload_interval
+
+            if settings.stateless_verification is not None:
+                TokenConfig.STATELESS = settings.stateless_verification
+            if settings.revocation_sync_interval is not None:
+                TokenConfig.REVOCATION_SYNC_INTERVAL = settings.revocation_sync_interval
+            if settings.jwt_codec is not None:
+                TokenConfig.CODEC = settings.jwt_codec
+            if settings.bulk_chunk_size is not None:
+                TokenConfig.BULK_CHUNK_SIZE = settings.bulk_chunk_size
+            if settings.bulk_process_threshold is not None:
+                TokenConfig.BULK_PROCESS_THRESHOLD = settings.bulk_process_threshold
+            if settings.bulk_max_workers is not None:
+                TokenConfig.BULK_MAX_WORKERS = settings.bulk_max_workers
+
+            if settings.database_timeout is not None:
+                DatabaseConfig.TIMEOUT = settings.database_timeout
+            if settings.database_max_connections is not None:
+                DatabaseConfig.MAX_CONNECTIONS = settings.database_max_connections
+            if settings.database_max_keepalive_connections is not None:
+                DatabaseConfig.MAX_KEEPALIVE_CONNECTIONS = (
+                    settings.database_max_keepalive_connections
+                )
+            if settings.database_keepalive_expiry is not None:
+                DatabaseConfig.KEEPALIVE_EXPIRY = settings.database_keepalive_expiry
+            if settings.database_deadline is not None:
+                DatabaseConfig.DEADLINE = settings.database_deadline
+            if settings.database_breaker_failures is not None:
+                DatabaseConfig.BREAKER_FAILURES = settings.database_breaker_failures
+            if settings.database_breaker_reset is not None:
+                DatabaseConfig.BREAKER_RESET = settings.database_breaker_reset
+            if settings.database_batch_window_ms is not None:
+                DatabaseConfig.BATCH_WINDOW_MS = settings.database_batch_window_ms
+            if settings.database_batch_max_size is not None:
+                DatabaseConfig.BATCH_MAX_SIZE = settings.database_batch_max_size
+
+            if settings.token_cache_ttl is not None:
+                CacheConfig.TTL = settings.token_cache_ttl
+            if settings.token_cache_negative_ttl is not None:
+                CacheConfig.NEGATIVE_TTL = settings.token_cache_negative_ttl
+            if settings.token_cache_max_size is not None:
+                CacheConfig.MAX_SIZE = settings.token_cache_max_size
+            if settings.token_cache_grace is not None:
+                CacheConfig.GRACE = settings.token_cache_grace
+            if settings.decoded_token_cache_size is not None:
+                CacheConfig.DECODED_MAX_SIZE = settings.decoded_token_cache_size
+            if settings.shared_token_cache is not None:
+                CacheConfig.SHARED = settings.shared_token_cache
+            if settings.shared_token_cache_path is not None:
+                CacheConfig.SHARED_PATH = settings.shared_token_cache_path
+            if settings.shared_token_cache_slots is not None:
+                CacheConfig.SHARED_SLOTS = settings.shared_token_cache_slots
+
+            if settings.invalidation_transports is not None:
+                InvalidationConfig.TRANSPORTS = settings.invalidation_transports
+            if settings.invalidation_socket_dir is not None:
+                InvalidationConfig.SOCKET_DIR = settings.invalidation_socket_dir
+            if settings.invalidation_multicast_group is not None:
+                InvalidationConfig.MULTICAST_GROUP = settings.invalidation_multicast_group
+            if settings.invalidation_multicast_port is not None:
+                InvalidationConfig.MULTICAST_PORT = settings.invalidation_multicast_port
+            if settings.invalidation_multicast_ttl is not None:
+                InvalidationConfig.MULTICAST_TTL = settings.invalidation_multicast_ttl
+            if settings.invalidation_peers is not None:
+                InvalidationConfig.PEERS = settings.invalidation_peers
+            if settings.invalidation_http_timeout is not None:
+                InvalidationConfig.HTTP_TIMEOUT = settings.invalidation_http_timeout
+            if settings.invalidation_max_age is not None:
+                InvalidationConfig.MAX_AGE = settings.invalidation_max_age
+
+            if settings.metrics is not None:
+                MetricsConfig.ENABLED = settings.metrics
+
+            log_settings = (
+                settings.log_file,
+                settings.log_level,
+                settings.request_log_level,
+                settings.request_log_sample_rate,
+            )
+            if any(value is not None for value in log_settings):
+                configure_logging(*log_settings)
 
     def set_auth(
         self,
@@ -48,7 +211,11 @@ class Fastauth:
     ) -> None:
         """
         Configure authentication for a FastAPI application.
-        Adds AccessTokenMiddleware, installs FastauthOpenAPI, and includes the given routers.
+        Compiles the protected path lists into the path policy index, adds AccessTokenMiddleware (or AccessTokenASGIMiddleware when `asgi_middleware`
+        is enabled), installs FastauthOpenAPI, includes the given routers (and
+        MetricsRouter when `metrics` is enabled, InvalidationRouter with the "http"
+        invalidation transport) and hooks the token store (and the
+        config watcher when `config_reload_interval` is set) into the application lifespan.
 
         Args:
             fastapp : FastAPI
@@ -57,8 +224,56 @@ class Fastauth:
                 Routers to include (default: TokenRouter().route).
 
         """
-        fastapp.add_middleware(AccessTokenMiddleware)
+        compile_policy()
+        fastapp.add_middleware(
+            AccessTokenASGIMiddleware
+            if ConfigServer.ASGI_MIDDLEWARE
+            else AccessTokenMiddleware
+        )
         openapi: FastauthOpenAPI = FastauthOpenAPI(app=fastapp)
-        fastapp.openapi = lambda: openapi()
+        openapi.install()
+        # The security requirements follow the protected paths
+        config_watcher.subscribe(openapi.invalidate)
         for router in routers:
             fastapp.include_router(router=router)
+        if MetricsConfig.ENABLED:
+            fastapp.include_router(router=MetricsRouter().route)
+        if "http" in InvalidationConfig.TRANSPORTS:
+            fastapp.include_router(router=InvalidationRouter().route)
+        self.__wrap_lifespan(fastapp, openapi)
+
+    def __wrap_lifespan(self, fastapp: FastAPI, openapi: FastauthOpenAPI) -> None:
+        """
+        Open the token store, the shared token cache and the invalidation bus (and, in stateless mode, the
+        revocation list sync) on
+        startup and close them on shutdown, around whatever lifespan the application
+        already defines. With `config_reload_interval`, the config file is watched
+        while the application runs. With `openapi_prebuild`, the OpenAPI document is generated
+        and serialized in a thread during startup, once every route is registered.
+        """
+        app_lifespan = fastapp.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app):
+            await token_store().open()
+            shared_tokens.open()
+            await invalidation_bus.open()
+            if TokenConfig.STATELESS:
+                revocation_list.start()
+            config_watcher.start(ConfigServer.CONFIG_RELOAD_INTERVAL)
+            try:
+                async with app_lifespan(app) as state:
+                    if ConfigServer.OPENAPI_PREBUILD and fastapp.openapi_url:
+                        await asyncio.to_thread(
+                            openapi.build, fastapp.root_path.rstrip("/")
+                        )
+                    yield state
+            finally:
+                await config_watcher.stop()
+                await revocation_list.stop()
+                websocket_sessions.stop()
+                await invalidation_bus.close()
+                await token_store().close()
+                shared_tokens.close()
+
+        fastapp.router.lifespan_context = lifespan
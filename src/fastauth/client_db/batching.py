@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+from ..config import DatabaseConfig
+
+
+class BatchLoader:
+    """
+    DataLoader-style micro-batching of single-key loads.
+
+    Keys requested through `load` are collected for `DatabaseConfig.BATCH_WINDOW_MS`
+    milliseconds, or until `DatabaseConfig.BATCH_MAX_SIZE` keys are waiting, and are
+    then resolved by one call to `load_many(keys) -> {key: value}`. Keys missing from
+    the result resolve to None and exception values are raised to that key's awaiters
+    only; an exception raised by `load_many` itself is delivered to every awaiter of
+    that batch.
+    """
+
+    def __init__(self, load_many: Callable[[list[Any]], Awaitable[dict[Any, Any]]]):
+        self.__load_many = load_many
+        self.__pending: dict[Any, list[asyncio.Future]] = {}
+        self.__timer: asyncio.TimerHandle | None = None
+        self.batches: int = 0
+        self.keys: int = 0
+
+    async def load(self, key: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self.__pending.setdefault(key, []).append(future)
+
+        if len(self.__pending) >= DatabaseConfig.BATCH_MAX_SIZE:
+            self.__dispatch()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(
+                DatabaseConfig.BATCH_WINDOW_MS / 1000, self.__dispatch
+            )
+        return await future
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "keys": self.keys}
+
+    def __dispatch(self) -> None:
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        if not self.__pending:
+            return
+
+        batch, self.__pending = self.__pending, {}
+        self.batches += 1
+        self.keys += len(batch)
+        asyncio.ensure_future(self.__resolve(batch))
+
+    async def __resolve(self, batch: dict[Any, list[asyncio.Future]]) -> None:
+        try:
+            results: dict = await self.__load_many(list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, futures in batch.items():
+            value = results.get(key)
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
@@ -0,0 +1,131 @@
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+from ..config import logger, DatabaseConfig
+from .stores import DatabaseError
+
+T = TypeVar("T")
+
+CLOSED: str = "closed"
+OPEN: str = "open"
+HALF_OPEN: str = "half_open"
+
+
+class CircuitOpenError(DatabaseError):
+    """The token store is considered down: the call was not attempted."""
+
+
+class CircuitBreaker:
+    """
+    Fails token store calls fast while the store is down, instead of letting every
+    request wait for its own timeout and piling load on a recovering database.
+
+    - Closed: calls go through. After `DatabaseConfig.BREAKER_FAILURES` consecutive
+      failures (a `DatabaseError`: unreachable store, 5xx answer, or a call exceeding
+      `DatabaseConfig.DEADLINE`) the breaker opens. A write the store rejects
+      (`False`, e.g. a 4xx answer) says the store is up and counts as a success.
+    - Open: calls raise `CircuitOpenError` at once, for `DatabaseConfig.BREAKER_RESET` seconds.
+    - Half-open: then, a single call probes the store while the others keep failing
+      fast. Success closes the breaker, failure opens it for another period.
+
+    Callbacks registered with `on_recover` run when the breaker closes again
+    (`client_db` revalidates the tokens it served from its grace window).
+    `BREAKER_FAILURES = 0` disables the breaker; the deadline still applies.
+    """
+
+    def __init__(self):
+        self.state: str = CLOSED
+        self.failures: int = 0
+        self.rejected: int = 0
+        self.opened: int = 0
+        self.__opened_at: float = 0.0
+        self.__probing: bool = False
+        self.__recover: list[Callable[[], Any]] = []
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+    def on_recover(self, callback: Callable[[], Any]) -> None:
+        if callback not in self.__recover:
+            self.__recover.append(callback)
+
+    async def call(self, operation: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run `call()` (a token store operation) through the breaker."""
+        probe: bool = self.__admit(operation)
+        try:
+            deadline: float | None = DatabaseConfig.DEADLINE
+            if deadline:
+                try:
+                    result: T = await asyncio.wait_for(call(), deadline)
+                except asyncio.TimeoutError as e:
+                    raise DatabaseError(f"{operation} timed out after {deadline}s") from e
+            else:
+                result = await call()
+        except DatabaseError:
+            self.__failure(operation)
+            raise
+        except asyncio.CancelledError:
+            # The caller went away: no verdict on the store
+            if probe:
+                self.__probing = False
+            raise
+        self.__success()
+        return result
+
+    def reset(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.__probing = False
+
+    def __admit(self, operation: str) -> bool:
+        """Raise `CircuitOpenError` unless the call may go through; True for a half-open probe."""
+        if self.state == CLOSED:
+            return False
+        if (
+            self.state == OPEN
+            and time.monotonic() - self.__opened_at >= DatabaseConfig.BREAKER_RESET
+        ):
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self.__probing:
+            self.__probing = True
+            return True
+        self.rejected += 1
+        raise CircuitOpenError(f"Token store unavailable, {operation} not attempted")
+
+    def __failure(self, operation: str) -> None:
+        self.__probing = False
+        self.failures += 1
+        threshold: int = DatabaseConfig.BREAKER_FAILURES
+        if threshold <= 0:
+            return
+        if self.state == HALF_OPEN or self.failures >= threshold:
+            if self.state != OPEN:
+                self.opened += 1
+                logger.warning(
+                    f"Token store circuit opened after {self.failures} failure(s) ({operation}); "
+                    f"retrying in {DatabaseConfig.BREAKER_RESET}s"
+                )
+            self.state = OPEN
+            self.__opened_at = time.monotonic()
+
+    def __success(self) -> None:
+        self.failures = 0
+        self.__probing = False
+        if self.state == CLOSED:
+            return
+        self.state = CLOSED
+        logger.info("Token store circuit closed: the store answers again")
+        for callback in self.__recover:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Circuit recovery callback failed. Error: {str(e)}")
+
+
+database_breaker: CircuitBreaker = CircuitBreaker()
+"""Breaker in front of the active token store, see `CircuitBreaker`."""
@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from ..config import CacheConfig
+
+MISS = object()
+"""Sentinel returned by `TokenCache.get` when nothing usable is cached."""
+
+
+class TokenCache:
+    """
+    Bounded in-memory TTL/LRU cache of canonical access tokens keyed by `client_id`.
+
+    - Found tokens live for `CacheConfig.TTL` seconds.
+    - Unknown client ids are cached as `None` for `CacheConfig.NEGATIVE_TTL` seconds,
+      so repeated requests with a stale or forged `client_id` do not reach the database.
+    - When `CacheConfig.MAX_SIZE` entries are stored, the least recently used one is evicted.
+    - A TTL of `0` disables the cache.
+    - With `CacheConfig.GRACE`, found tokens are kept that much longer after they
+      expire: `get` no longer returns them, but `stale` does, for when the token store
+      cannot answer (stale-if-error).
+
+    Settings are read on every write, so changes applied by `Fastauth()` take effect
+    without rebuilding the cache.
+    """
+
+    def __init__(self):
+        self.__entries: OrderedDict[str, tuple[float, str | None]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stale_hits: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, client_id: str) -> str | None | object:
+        """
+        Return the cached token (or `None` for a cached unknown client),
+        or `MISS` if the entry is absent or expired.
+        """
+        entry = self.__entries.get(client_id)
+        if entry is None:
+            self.misses += 1
+            return MISS
+
+        expires_at, token = entry
+        now: float = time.monotonic()
+        if expires_at <= now:
+            # Kept for `stale` within the grace window
+            if token is None or expires_at + CacheConfig.GRACE <= now:
+                self.__entries.pop(client_id, None)
+            self.misses += 1
+            return MISS
+
+        self.__entries.move_to_end(client_id)
+        self.hits += 1
+        return token
+
+    def set(self, client_id: str, token: str | None) -> None:
+        ttl: float = CacheConfig.TTL if token is not None else CacheConfig.NEGATIVE_TTL
+        if ttl <= 0 or CacheConfig.TTL <= 0:
+            self.__entries.pop(client_id, None)
+            return
+
+        self.__entries[client_id] = (time.monotonic() + ttl, token)
+        self.__entries.move_to_end(client_id)
+        while len(self.__entries) > CacheConfig.MAX_SIZE:
+            self.__entries.popitem(last=False)
+
+    def stale(self, client_id: str) -> str | None:
+        """The last known token of `client_id`, fresh or expired less than `CacheConfig.GRACE` ago."""
+        entry = self.__entries.get(client_id)
+        if entry is None or entry[1] is None:
+            return None
+        expires_at, token = entry
+        if expires_at + max(CacheConfig.GRACE, 0) <= time.monotonic():
+            return None
+        self.stale_hits += 1
+        return token
+
+    def add(self, client_id: str, token: str | None) -> None:
+        """Like `set`, but keeps a live entry untouched (e.g. one written by `save_token`
+        while a slower database lookup for the same client was in flight)."""
+        entry = self.__entries.get(client_id)
+        if entry is None or entry[0] <= time.monotonic():
+            self.set(client_id, token)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.__entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale_hits,
+        }
+
+    def invalidate(self, client_id: str) -> None:
+        self.__entries.pop(client_id, None)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+
+token_cache: TokenCache = TokenCache()
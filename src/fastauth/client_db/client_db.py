@@ -1,15 +1,36 @@
-import httpx
-from typing import Optional
+import asyncio
+from typing import Awaitable, Callable, Optional, TypeVar
 from ..config import logger, DatabaseConfig
+from ..metrics import observe_database
+from .cache import token_cache, MISS
+from .revocation import revocation_list
+from .sessions import websocket_sessions
+from .shared_cache import shared_tokens
+from .invalidation import invalidation_bus
+from .singleflight import SingleFlight
+from .batching import BatchLoader
+from .breaker import database_breaker
+from .stores import token_store, DatabaseError
 
+T = TypeVar("T")
+# Clients revalidated per `load_many` call after an outage
+REVALIDATE_CHUNK: int = 100
 
-def save_token(
+token_lookups: SingleFlight = SingleFlight()
+"""Concurrent lookups of the same client_id share one token store request."""
+
+stale_clients: set[str] = set()
+"""Clients whose token was served from the grace window, revalidated on recovery."""
+
+
+async def save_token(
     client_id: str,
     access_token: str,
     refresh_token: str,
 ) -> bool:
     """
-    Save the access and refresh tokens for a given client ID to the database via a POST request.
+    Save the access and refresh tokens for a given client ID in the active token store
+    (by default, a POST request to the database API).
 
     Args:
         client_id (str): The unique identifier for the client.
@@ -18,22 +39,91 @@ def save_token(
 
     Returns:
         bool: True if the tokens were saved successfully, False otherwise.
+
+    On success the new access token replaces the cached one for `client_id` (in every
+    worker with the shared token cache), so the next request is checked against the
+    fresh token without a database lookup, and WebSocket sessions opened with the
+    previous token are closed. Other workers and nodes are told to drop their cached
+    token through `invalidation_bus`.
     """
 
-    DATABASE_API_URL: str = DatabaseConfig.PATH
-    if DATABASE_API_URL is None:
-        logger.error("Database API URL is not configured.")
+    saved: bool = await _store_write(
+        "save",
+        lambda: token_store().save(
+            client_id=client_id,
+            access_token=access_token,
+            refresh_token=refresh_token,
+        ),
+    )
+    token_lookups.forget(client_id)
+    invalidation_bus.publish((client_id,))
+    if not saved:
+        token_cache.invalidate(client_id)
+        shared_tokens.invalidate(client_id)
         return False
-    url: str = f"{DATABASE_API_URL}/token?client_id={client_id}"
-    payload: dict = {"access_token": access_token, "refresh_token": refresh_token}
-    data: dict = {"data": payload}
-    response = httpx.post(url, json=data)
-    return response.status_code == 200
 
+    token_cache.set(client_id, access_token)
+    shared_tokens.set(client_id, access_token)
+    websocket_sessions.supersede(client_id, access_token)
+    return True
+
+
+async def save_tokens(pairs: list[tuple[str, str, str]]) -> bool:
+    """
+    Save several `(client_id, access_token, refresh_token)` pairs with one batched
+    write to the active token store (by default, `PUT /token/batch` on the database API).
+
+    Returns:
+        bool: True if every pair was saved, False otherwise.
 
-def load_access_token(client_id: str) -> Optional[str]:
+    Cached tokens of these clients are dropped rather than replaced, so a bulk
+    provisioning run does not evict the tokens of clients currently in use.
     """
-    Retrieve the access token for a given client ID from the database via a GET request.
+
+    saved: bool = await _store_write("save_many", lambda: token_store().save_many(pairs))
+    invalidation_bus.publish(client_id for client_id, _, _ in pairs)
+    for client_id, access_token, _ in pairs:
+        token_lookups.forget(client_id)
+        token_cache.invalidate(client_id)
+        shared_tokens.invalidate(client_id)
+        if saved:
+            websocket_sessions.supersede(client_id, access_token)
+    return saved
+
+
+async def revoke_token(jti: str, exp: float) -> bool:
+    """
+    Revoke a token by its `jti` claim for stateless verification.
+    The revocation applies immediately in this process and is saved in the token
+    store so other processes pick it up on their next sync.
+
+    Args:
+        jti (str): The `jti` claim of the token to revoke.
+        exp (float): The `exp` claim of the token; the revocation is kept until then.
+
+    Returns:
+        bool: True if the token store saved the revocation, False otherwise.
+    """
+
+    revocation_list.add(jti, exp)
+    return await _store_write("revoke", lambda: token_store().revoke(jti, exp))
+
+
+async def load_access_token(client_id: str) -> Optional[str]:
+    """
+    Retrieve the access token for a given client ID from the active token store
+    (by default, a GET request to the database API through the shared pool).
+    Results, including unknown client ids, are served from `token_cache` while fresh;
+    database errors are never cached. On a cache miss, concurrent calls for the same
+    `client_id` share a single store request (`token_lookups`), and with
+    `database_batch_window_ms` set, lookups for different clients are grouped into
+    one `load_many` call (`token_batches`).
+
+    With the shared token cache open, `token_cache` is not read: this worker's copy
+    does not follow tokens replaced by another worker, the shared table does.
+
+    When the store fails or its circuit is open (`database_breaker`), a token that
+    expired from the cache less than `token_cache_grace` seconds ago is returned.
 
     Args:
         client_id (str): The unique identifier for the client.
@@ -42,28 +132,86 @@ def load_access_token(client_id: str) -> Optional[str]:
         Optional[str]: The access token if found, None otherwise.
     """
 
-    DATABASE_API_URL: str = DatabaseConfig.PATH
-    if DATABASE_API_URL is None:
-        logger.error("Database API URL is not configured.")
+    try:
+        return await _load_access_token(client_id)
+    except DatabaseError:
         return None
 
-    url = f"{DATABASE_API_URL}/token?client_id={client_id}"
+
+async def _load_access_token(client_id: str) -> Optional[str]:
+    """`load_access_token`, raising `DatabaseError` when the store cannot answer and no token is in grace."""
+    if not shared_tokens.enabled:
+        cached = token_cache.get(client_id)
+        if cached is not MISS:
+            return cached
+
     try:
-        response = httpx.get(url)
-        if response.status_code == 200:
-            data: dict = response.json()["data"]
-            access_token: str = data.get("access_token")
-            return access_token
-    except httpx.RequestError as e:
-        logger.warning(
-            f"An error occurred while requesting {e.request.url!r} for get data. Error: {str(e)}"
+        data: dict | None = await token_lookups.do(
+            client_id, lambda: _lookup_token_data(client_id=client_id)
         )
-    return None
+    except DatabaseError:
+        stale: str | None = token_cache.stale(client_id)
+        if stale is None:
+            raise
+        stale_clients.add(client_id)
+        return stale
+
+    access_token: str | None = data.get("access_token") if data is not None else None
+    token_cache.add(client_id, access_token)
+    shared_tokens.add(client_id, access_token)
+    return access_token
+
+
+async def load_access_tokens(client_ids: list[str]) -> dict[str, str]:
+    """
+    Retrieve the access tokens of several clients from the active token store with
+    one `load_many` call, bypassing the caches (which may lag behind another worker).
+    Unknown clients and failed lookups are left out.
+    """
+
+    try:
+        found: dict = await _store("load_many", lambda: token_store().load_many(client_ids))
+    except DatabaseError:
+        return {}
+    return {
+        client_id: data["access_token"]
+        for client_id, data in found.items()
+        if isinstance(data, dict) and data.get("access_token")
+    }
 
 
-def load_refresh_token(client_id: str) -> Optional[str]:
+async def verify_access_token(client_id: str, access_token: str) -> bool | None:
     """
-    Retrieve the refresh token for a given client ID from the database via a GET request.
+    Check `access_token` against the canonical token of `client_id`.
+
+    With the shared token cache open, the digest stored by any worker answers first;
+    a shared miss (eviction, invalidation) goes to the token store, never to this
+    worker's `token_cache`, which may still hold a token another worker replaced.
+    Otherwise the token is loaded with `load_access_token`.
+
+    Returns:
+        bool | None: True if `access_token` is the canonical token, False if the
+        client has another one, None if the client is unknown.
+
+    Raises:
+        DatabaseError: The store cannot answer and no token of the client is cached
+        within the grace window.
+    """
+
+    if shared_tokens.enabled and client_id is not None:
+        digest = shared_tokens.get(client_id)
+        if digest is not MISS:
+            return None if digest is None else digest == shared_tokens.digest(access_token)
+
+    required_token: str | None = await _load_access_token(client_id)
+    if required_token is None:
+        return None
+    return required_token == access_token
+
+
+async def load_refresh_token(client_id: str) -> Optional[str]:
+    """
+    Retrieve the refresh token for a given client ID from the active token store.
 
     Args:
         client_id (str): The unique identifier for the client.
@@ -72,14 +220,82 @@ def load_refresh_token(client_id: str) -> Optional[str]:
         Optional[str]: The refresh token if found, None otherwise.
     """
 
-    DATABASE_API_URL: str = DatabaseConfig.PATH
-    if DATABASE_API_URL is None:
-        logger.error("Database API URL is not configured.")
+    try:
+        data: dict | None = await token_lookups.do(
+            client_id, lambda: _store("load", lambda: token_store().load(client_id))
+        )
+    except DatabaseError:
         return None
+    return data.get("refresh_token") if data is not None else None
+
+
+def _forget_clients(client_ids: list[str], same_host: bool) -> None:
+    """Drop the cached tokens of `client_ids`, replaced in another process (`invalidation_bus`)."""
+    for client_id in client_ids:
+        token_lookups.forget(client_id)
+        token_cache.invalidate(client_id)
+        if not same_host:
+            # On the sender's host, the shared cache already holds the new token
+            shared_tokens.invalidate(client_id)
+
+
+invalidation_bus.subscribe(_forget_clients)
+
+
+async def _revalidate() -> None:
+    """Reload the tokens served from the grace window during an outage, in the background."""
+    while stale_clients:
+        chunk: list[str] = [
+            stale_clients.pop() for _ in range(min(REVALIDATE_CHUNK, len(stale_clients)))
+        ]
+        try:
+            found: dict = await _store("load_many", lambda: token_store().load_many(chunk))
+        except DatabaseError as e:
+            # Down again: retried on the next recovery
+            stale_clients.update(chunk)
+            logger.warning(f"Token revalidation interrupted. Error: {str(e)}")
+            return
+        for client_id in chunk:
+            data = found.get(client_id)
+            if isinstance(data, Exception):
+                token_cache.invalidate(client_id)
+                continue
+            access_token: str | None = data.get("access_token") if data is not None else None
+            token_cache.set(client_id, access_token)
+            shared_tokens.set(client_id, access_token)
+
+
+def _schedule_revalidation() -> None:
+    if stale_clients:
+        try:
+            asyncio.get_running_loop().create_task(_revalidate())
+        except RuntimeError:
+            stale_clients.clear()
+
+
+database_breaker.on_recover(_schedule_revalidation)
+
+
+async def _store(operation: str, call: Callable[[], Awaitable[T]]) -> T:
+    """Run a token store operation through `database_breaker`, recording it in the metrics."""
+    return await database_breaker.call(operation, lambda: observe_database(operation, call()))
+
+
+async def _store_write(operation: str, call: Callable[[], Awaitable[bool]]) -> bool:
+    """`_store` for the operations reporting failures with `False`."""
+    try:
+        return await _store(operation, call)
+    except DatabaseError:
+        return False
+
+
+def _lookup_token_data(client_id: str):
+    if DatabaseConfig.BATCH_WINDOW_MS > 0:
+        return token_batches.load(client_id)
+    return _store("load", lambda: token_store().load(client_id))
+
 
-    url = f"{DATABASE_API_URL}/token?client_id={client_id}"
-    response = httpx.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        return data.get("refresh_token")
-    return None
+token_batches: BatchLoader = BatchLoader(
+    lambda keys: _store("load_many", lambda: token_store().load_many(keys))
+)
+"""Groups token lookups issued within `database_batch_window_ms` into one request."""
@@ -0,0 +1,40 @@
+import httpx
+from ..config import DatabaseConfig
+
+
+class DatabaseClient:
+    """
+    Process-wide pooled `httpx.AsyncClient` used to reach the database API.
+
+    A single client is shared by every token lookup so connections are kept
+    alive between requests instead of being opened for each call. Pool limits
+    and timeouts come from `DatabaseConfig`. `Fastauth.set_auth` opens the
+    client on application startup and closes it on shutdown; when used outside
+    of a lifespan (scripts, tests) the client is created lazily on first use.
+
+    `transport` replaces the network transport of the next client created, e.g. an
+    `httpx.ASGITransport` to serve the database API in-process in benchmarks.
+    """
+
+    transport: httpx.AsyncBaseTransport | None = None
+    __client: httpx.AsyncClient | None = None
+
+    @classmethod
+    def get(cls) -> httpx.AsyncClient:
+        if cls.__client is None or cls.__client.is_closed:
+            cls.__client = httpx.AsyncClient(
+                timeout=httpx.Timeout(DatabaseConfig.TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=DatabaseConfig.MAX_CONNECTIONS,
+                    max_keepalive_connections=DatabaseConfig.MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=DatabaseConfig.KEEPALIVE_EXPIRY,
+                ),
+                transport=cls.transport,
+            )
+        return cls.__client
+
+    @classmethod
+    async def aclose(cls) -> None:
+        if cls.__client is not None:
+            await cls.__client.aclose()
+            cls.__client = None
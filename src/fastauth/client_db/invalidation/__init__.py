@@ -0,0 +1,213 @@
+import json
+import time
+import hmac
+import socket
+import asyncio
+import hashlib
+import secrets
+import importlib
+from typing import Callable, Iterable
+from ...config import logger, InvalidationConfig, TokenConfig
+from .base import InvalidationTransport, Deliver
+
+# Built-in transports as "module:class", imported when selected (the HTTP fan-out
+# pulls in httpx); custom transport classes can be registered directly
+TRANSPORTS: dict[str, str | type[InvalidationTransport]] = {
+    "unix": "unix_socket:UnixSocketTransport",
+    "multicast": "multicast:MulticastTransport",
+    "http": "http_fanout:HTTPFanoutTransport",
+}
+
+MAGIC: bytes = b"FAI1"
+MAC_SIZE: int = hashlib.sha256().digest_size
+
+
+def transport_class(name: str) -> type[InvalidationTransport]:
+    """The `InvalidationTransport` class registered as `name` in `TRANSPORTS`."""
+    if name not in TRANSPORTS:
+        raise ValueError(
+            f"Unknown invalidation transport '{name}'. Available: {', '.join(TRANSPORTS)}"
+        )
+    transport = TRANSPORTS[name]
+    if isinstance(transport, str):
+        module, _, cls = transport.partition(":")
+        transport = getattr(importlib.import_module(f".{module}", __name__), cls)
+    return transport
+
+
+class InvalidationBus:
+    """
+    Broadcasts the client ids whose canonical token changed (`save_token`,
+    `save_tokens`) to the other worker processes and nodes, which drop them from
+    their token caches. Caches then follow token refreshes within milliseconds
+    instead of their TTL, so `token_cache_ttl` can be long.
+
+    - `publish` never waits: ids published during one event loop iteration are sent
+      together, in as few messages as the transports' size limits allow.
+    - Messages are signed with HMAC-SHA256 under a key derived from the cryptography
+      key (which every node of the deployment shares) and carry their send time.
+      Unsigned, forged and stale (`invalidation_max_age`) messages are rejected, and
+      a process ignores its own messages.
+    - Transports are best effort (see `InvalidationTransport`): the TTL still bounds
+      staleness when a message is lost.
+
+    Subscribers (`subscribe`) are called with `(client_ids, same_host)`;
+    `client_db` registers the handler that clears its caches.
+    `Fastauth.set_auth` opens the transports named by `invalidation_transports` with
+    the application lifespan.
+    """
+
+    def __init__(self):
+        self.origin: str = ""
+        self.host: str = socket.gethostname()
+        self.sent: int = 0
+        self.received: int = 0
+        self.rejected: int = 0
+        self.__transports: list[InvalidationTransport] = []
+        self.__subscribers: list[Callable[[list[str], bool], None]] = []
+        self.__pending: set[str] = set()
+        self.__flush: asyncio.Task | None = None
+        self.__keys: tuple[str, bytes] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.__transports)
+
+    def stats(self) -> dict:
+        return {"sent": self.sent, "received": self.received, "rejected": self.rejected}
+
+    def subscribe(self, callback: Callable[[list[str], bool], None]) -> None:
+        if callback not in self.__subscribers:
+            self.__subscribers.append(callback)
+
+    async def add_transport(self, transport: InvalidationTransport) -> None:
+        """Open `transport` and send through it from now on."""
+        await transport.open(self.receive)
+        self.__transports.append(transport)
+
+    async def open(self) -> None:
+        """Open the transports named by `InvalidationConfig.TRANSPORTS`."""
+        # Per process, drawn after the fork of the workers (gunicorn --preload)
+        self.origin = secrets.token_hex(8)
+        if not InvalidationConfig.TRANSPORTS:
+            return
+        if not TokenConfig.CRYPTOGRAPHY_KEY:
+            logger.error("Invalidation bus disabled: messages are signed with the cryptography key, which is not set")
+            return
+        for name in InvalidationConfig.TRANSPORTS:
+            try:
+                await self.add_transport(transport_class(name)())
+            except (OSError, ValueError) as e:
+                logger.error(f"Invalidation transport '{name}' not started. Error: {str(e)}")
+
+    async def close(self) -> None:
+        if self.__flush is not None:
+            # Send what was published before shutdown
+            await asyncio.shield(self.__flush)
+        transports, self.__transports = self.__transports, []
+        for transport in transports:
+            await transport.close()
+
+    def publish(self, client_ids: Iterable[str]) -> None:
+        """Schedule an invalidation of `client_ids` on every other process."""
+        if not self.__transports:
+            return
+        self.__pending.update(client_ids)
+        if self.__flush is None:
+            try:
+                self.__flush = asyncio.get_running_loop().create_task(self.__send_pending())
+            except RuntimeError:
+                self.__pending.clear()
+
+    def receive(self, message: bytes) -> bool:
+        """Check and apply a message from a transport. Returns False if it was rejected."""
+        body: dict | None = self.__verify(message)
+        if body is None:
+            self.rejected += 1
+            return False
+        if body.get("o") == self.origin:
+            return True
+
+        self.received += 1
+        client_ids: list[str] = [client_id for client_id in body.get("c", []) if isinstance(client_id, str)]
+        same_host: bool = body.get("h") == self.host
+        for callback in self.__subscribers:
+            try:
+                callback(client_ids, same_host)
+            except Exception as e:
+                logger.error(f"Invalidation subscriber failed. Error: {str(e)}")
+        return True
+
+    def encode(self, client_ids: list[str], max_size: int) -> list[bytes]:
+        """Sign `client_ids` into messages of at most `max_size` bytes."""
+        messages: list[bytes] = []
+        header: dict = {"o": self.origin, "h": self.host, "t": time.time()}
+        # JSON of an empty batch, and the room left for ids (each is `"id",`)
+        room: int = max_size - len(MAGIC) - MAC_SIZE - len(self.__dump({**header, "c": []}))
+        batch: list[str] = []
+        size: int = 0
+        for client_id in client_ids:
+            item: int = len(json.dumps(client_id).encode()) + 1
+            if batch and size + item > room:
+                messages.append(self.__sign({**header, "c": batch}))
+                batch, size = [], 0
+            batch.append(client_id)
+            size += item
+        if batch:
+            messages.append(self.__sign({**header, "c": batch}))
+        return messages
+
+    async def __send_pending(self) -> None:
+        try:
+            # Let the rest of this loop iteration publish into the same batch
+            await asyncio.sleep(0)
+            client_ids: list[str] = list(self.__pending)
+            self.__pending.clear()
+            self.__flush = None
+            for transport in list(self.__transports):
+                for message in self.encode(client_ids, transport.max_message_size):
+                    try:
+                        await transport.send(message)
+                        self.sent += 1
+                    except Exception as e:
+                        logger.warning(f"Invalidation send failed. Error: {str(e)}")
+        finally:
+            # Unless a publish during the sends already scheduled the next batch
+            if self.__flush is asyncio.current_task():
+                self.__flush = None
+
+    def __key(self) -> bytes:
+        secret: str = TokenConfig.CRYPTOGRAPHY_KEY or ""
+        # Derived once per cryptography key, which config hot reload can rotate
+        if self.__keys is None or self.__keys[0] is not secret:
+            self.__keys = (secret, hashlib.sha256(b"fastauth-invalidation:" + secret.encode()).digest())
+        return self.__keys[1]
+
+    @staticmethod
+    def __dump(body: dict) -> bytes:
+        return json.dumps(body, separators=(",", ":")).encode()
+
+    def __sign(self, body: dict) -> bytes:
+        payload: bytes = self.__dump(body)
+        return MAGIC + hmac.digest(self.__key(), payload, "sha256") + payload
+
+    def __verify(self, message: bytes) -> dict | None:
+        if not message.startswith(MAGIC) or len(message) < len(MAGIC) + MAC_SIZE:
+            return None
+        mac: bytes = message[len(MAGIC) : len(MAGIC) + MAC_SIZE]
+        payload: bytes = message[len(MAGIC) + MAC_SIZE :]
+        if not hmac.compare_digest(mac, hmac.digest(self.__key(), payload, "sha256")):
+            return None
+        try:
+            body = json.loads(payload)
+        except ValueError:
+            return None
+        if not isinstance(body, dict) or not isinstance(body.get("t"), (int, float)):
+            return None
+        if abs(time.time() - body["t"]) > InvalidationConfig.MAX_AGE:
+            return None
+        return body
+
+
+invalidation_bus: InvalidationBus = InvalidationBus()
+"""Token change broadcasts of this process, see `InvalidationBus`."""
@@ -0,0 +1,49 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Callable
+
+Deliver = Callable[[bytes], bool]
+"""Called with each message a transport receives; returns whether it was accepted."""
+
+
+class InvalidationTransport(ABC):
+    """
+    Carries signed invalidation messages (opaque bytes) to the other processes.
+
+    The bus signs, batches and checks messages; a transport only moves bytes and is
+    best effort: a lost message leaves the other caches to expire on their TTL.
+
+    ### Implementations
+    - `UnixSocketTransport` (`"unix"`): datagrams to every worker of this host.
+    - `MulticastTransport` (`"multicast"`): UDP multicast to every node of the network segment.
+    - `HTTPFanoutTransport` (`"http"`): `POST` to each of `invalidation_peers`.
+
+    Custom transports can be installed with `invalidation_bus.add_transport(MyTransport())`.
+    """
+
+    # Largest message `send` accepts; the bus splits bigger batches
+    max_message_size: int = 8192
+
+    async def open(self, deliver: Deliver) -> None:
+        """Start receiving, passing each message to `deliver`. Called on application startup."""
+
+    async def close(self) -> None:
+        """Stop receiving and release resources. Called on application shutdown."""
+
+    @abstractmethod
+    async def send(self, message: bytes) -> None:
+        """Send `message` to every other process reachable through this transport."""
+
+
+class DatagramProtocol(asyncio.DatagramProtocol):
+    """Passes received datagrams to `deliver`."""
+
+    def __init__(self, deliver: Deliver):
+        self.deliver: Deliver = deliver
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.deliver(data)
+
+    def error_received(self, exc: Exception) -> None:
+        # Raised by a previous send on some platforms; the bus does not retry
+        pass
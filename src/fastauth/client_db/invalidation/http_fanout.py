@@ -0,0 +1,46 @@
+import asyncio
+import httpx
+from ...config import logger, InvalidationConfig
+from .base import InvalidationTransport, Deliver
+
+CONTENT_TYPE: str = "application/octet-stream"
+
+
+class HTTPFanoutTransport(InvalidationTransport):
+    """
+    Invalidations to other nodes over HTTP: each message is `POST`ed, concurrently,
+    to every URL of `invalidation_peers` (the `/auth/invalidate` endpoint of the
+    peers, see `InvalidationRouter`). Messages are received by that endpoint, not by
+    the transport. A peer that does not answer within `invalidation_http_timeout`
+    misses the message.
+    """
+
+    max_message_size: int = 1 << 20
+
+    def __init__(self, peers: list[str] | None = None):
+        self.peers: list[str] = list(peers if peers is not None else InvalidationConfig.PEERS)
+        self.__client: httpx.AsyncClient | None = None
+
+    async def open(self, deliver: Deliver) -> None:
+        self.__client = httpx.AsyncClient(timeout=httpx.Timeout(InvalidationConfig.HTTP_TIMEOUT))
+
+    async def close(self) -> None:
+        if self.__client is not None:
+            await self.__client.aclose()
+            self.__client = None
+
+    async def send(self, message: bytes) -> None:
+        if self.__client is None or not self.peers:
+            return
+        await asyncio.gather(*(self.__post(peer, message) for peer in self.peers))
+
+    async def __post(self, peer: str, message: bytes) -> None:
+        try:
+            response = await self.__client.post(
+                peer, content=message, headers={"Content-Type": CONTENT_TYPE}
+            )
+        except httpx.HTTPError as e:
+            logger.debug(f"Invalidation to {peer} failed. Error: {str(e)}")
+            return
+        if response.status_code >= 300:
+            logger.warning(f"Invalidation to {peer} rejected with status {response.status_code}")
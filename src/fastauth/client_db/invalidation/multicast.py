@@ -0,0 +1,72 @@
+import socket
+import struct
+import asyncio
+from ...config import logger, InvalidationConfig
+from .base import InvalidationTransport, DatagramProtocol, Deliver
+
+
+class MulticastTransport(InvalidationTransport):
+    """
+    Invalidations to every node of the network segment over UDP multicast
+    (`invalidation_multicast_group`:`invalidation_multicast_port`).
+
+    Each worker joins the group, so one send reaches the workers of every host
+    (loopback is enabled for the workers of the sending host). `invalidation_multicast_ttl`
+    limits the number of routers crossed (1: local segment only).
+    """
+
+    # Fits in one Ethernet frame: no IP fragmentation
+    max_message_size: int = 1400
+
+    def __init__(
+        self,
+        group: str | None = None,
+        port: int | None = None,
+        ttl: int | None = None,
+    ):
+        self.group: str = group or InvalidationConfig.MULTICAST_GROUP
+        self.port: int = port or InvalidationConfig.MULTICAST_PORT
+        self.ttl: int = ttl if ttl is not None else InvalidationConfig.MULTICAST_TTL
+        self.__transport: asyncio.DatagramTransport | None = None
+        self.__sender: socket.socket | None = None
+
+    async def open(self, deliver: Deliver) -> None:
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        try:
+            # Every worker of the host binds the same port and gets its own copy
+            receiver.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):
+                receiver.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            receiver.bind(("", self.port))
+            membership: bytes = struct.pack(
+                "4s4s", socket.inet_aton(self.group), socket.inet_aton("0.0.0.0")
+            )
+            receiver.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        except OSError:
+            receiver.close()
+            raise
+        loop = asyncio.get_running_loop()
+        self.__transport, _ = await loop.create_datagram_endpoint(
+            lambda: DatagramProtocol(deliver), sock=receiver
+        )
+
+        self.__sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.__sender.setblocking(False)
+        self.__sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, self.ttl)
+        self.__sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+
+    async def close(self) -> None:
+        if self.__transport is not None:
+            self.__transport.close()
+            self.__transport = None
+        if self.__sender is not None:
+            self.__sender.close()
+            self.__sender = None
+
+    async def send(self, message: bytes) -> None:
+        if self.__sender is None:
+            return
+        try:
+            self.__sender.sendto(message, (self.group, self.port))
+        except OSError as e:
+            logger.debug(f"Invalidation multicast dropped. Error: {str(e)}")
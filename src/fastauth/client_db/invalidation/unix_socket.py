@@ -0,0 +1,85 @@
+import os
+import socket
+import asyncio
+import hashlib
+import tempfile
+from ...config import logger, ConfigFile, InvalidationConfig
+from .base import InvalidationTransport, DatagramProtocol, Deliver
+
+SUFFIX: str = ".sock"
+
+
+def default_directory() -> str:
+    """One directory per config file, in `/dev/shm` when available."""
+    directory: str = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    project: str = hashlib.blake2b(
+        os.path.abspath(ConfigFile.PATH).encode(), digest_size=8
+    ).hexdigest()
+    return os.path.join(directory, f"fastauth-invalidation-{project}")
+
+
+class UnixSocketTransport(InvalidationTransport):
+    """
+    Invalidations between the worker processes of one host over Unix datagram sockets.
+
+    Each worker binds `<pid>.sock` in `invalidation_socket_dir`, and sends a message
+    to every other socket of the directory. Sockets left behind by workers that
+    died (connection refused) are removed by the next send. A worker whose receive
+    buffer is full drops the message rather than blocking the sender.
+    """
+
+    # Well below the default Unix datagram limits (net.core.wmem_default)
+    max_message_size: int = 65536
+
+    def __init__(self, directory: str | None = None):
+        self.directory: str = directory or InvalidationConfig.SOCKET_DIR or default_directory()
+        self.path: str = os.path.join(self.directory, f"{os.getpid()}{SUFFIX}")
+        self.__transport: asyncio.DatagramTransport | None = None
+        self.__sender: socket.socket | None = None
+
+    async def open(self, deliver: Deliver) -> None:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.path):
+            # Left by a previous process with the same pid
+            os.unlink(self.path)
+        loop = asyncio.get_running_loop()
+        self.__transport, _ = await loop.create_datagram_endpoint(
+            lambda: DatagramProtocol(deliver), local_addr=self.path, family=socket.AF_UNIX
+        )
+        os.chmod(self.path, 0o600)
+        self.__sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.__sender.setblocking(False)
+
+    async def close(self) -> None:
+        if self.__transport is not None:
+            self.__transport.close()
+            self.__transport = None
+        if self.__sender is not None:
+            self.__sender.close()
+            self.__sender = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def send(self, message: bytes) -> None:
+        if self.__sender is None:
+            return
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if not entry.name.endswith(SUFFIX) or entry.path == self.path:
+                continue
+            try:
+                self.__sender.sendto(message, entry.path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Nobody bound to it anymore
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+            except OSError as e:
+                # Receiver buffer full (BlockingIOError) or oversized message
+                logger.debug(f"Invalidation datagram to {entry.name} dropped. Error: {str(e)}")
@@ -0,0 +1,78 @@
+import asyncio
+import time
+from ..config import logger, TokenConfig
+from ..metrics import observe_database
+from .stores import token_store, DatabaseError
+
+
+class RevocationList:
+    """
+    In-memory set of revoked token ids (`jti` claim) used by stateless verification.
+
+    Each entry keeps the `exp` of the revoked token, so it is dropped once the token
+    would have expired anyway and the set only holds tokens that could still be presented.
+    The list is synced every `TokenConfig.REVOCATION_SYNC_INTERVAL` seconds from the
+    token store (`GET {database_api_path}/revoked` with the default HTTP store).
+    Revocations made in this process (`revoke_token`) apply immediately.
+    """
+
+    def __init__(self):
+        self.__revoked: dict[str, float] = {}
+        self.__task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self.__revoked)
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self.__revoked
+
+    def add(self, jti: str, exp: float) -> None:
+        if exp > time.time():
+            self.__revoked[jti] = exp
+
+    def update(self, revoked: dict[str, float]) -> None:
+        now: float = time.time()
+        for jti, exp in revoked.items():
+            if exp > now:
+                self.__revoked[jti] = exp
+        self.prune(now)
+
+    def prune(self, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        expired = [jti for jti, exp in self.__revoked.items() if exp <= now]
+        for jti in expired:
+            del self.__revoked[jti]
+
+    async def sync(self) -> bool:
+        """Pull the revocation list from the token store. Returns True on success."""
+        try:
+            revoked: dict[str, float] = await observe_database(
+                "load_revoked", token_store().load_revoked()
+            )
+        except DatabaseError as e:
+            logger.warning(f"Revocation list sync failed. Error: {str(e)}")
+            return False
+
+        self.update(revoked)
+        return True
+
+    def start(self) -> None:
+        if self.__task is None:
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+    async def __run(self) -> None:
+        while True:
+            await self.sync()
+            await asyncio.sleep(TokenConfig.REVOCATION_SYNC_INTERVAL)
+
+
+revocation_list: RevocationList = RevocationList()
@@ -0,0 +1,180 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any
+from ..config import logger
+
+# Policy violation, as for rejected handshakes
+CLOSE_CODE: int = 1008
+EXPIRED: str = "Access Token expired"
+SUPERSEDED: str = "Access Token superseded"
+# Heap entries left by closed sessions are dropped once they outnumber live ones
+COMPACT_MIN_ENTRIES: int = 1024
+
+
+class Session:
+    """
+    An open WebSocket authenticated with `token`, valid until `exp`, served by `task`.
+    `reason` is set when the registry ends the session.
+    """
+
+    __slots__ = ("websocket", "client_id", "token", "exp", "task", "open", "reason")
+
+    def __init__(
+        self,
+        websocket: Any,
+        client_id: str,
+        token: str,
+        exp: float,
+        task: asyncio.Task | None,
+    ):
+        self.websocket = websocket
+        self.client_id: str = client_id
+        self.token: str = token
+        self.exp: float = exp
+        self.task: asyncio.Task | None = task
+        self.open: bool = True
+        self.reason: str | None = None
+
+
+class SessionRegistry:
+    """
+    Open WebSocket sessions indexed by `client_id` and token expiry, so that a
+    connection does not outlive the token it was accepted with.
+
+    - `register` / `unregister` are called by `websocket_middleware` around the
+      handler; both are O(log n) at most.
+    - Expiries are kept in one min-heap watched by a single timer (`loop.call_at`),
+      re-armed for the earliest expiry: no task or timer per connection, whatever
+      the number of sockets.
+    - `supersede(client_id, token)` closes the sessions of `client_id` opened with
+      another token; `save_token` calls it whenever a new pair is issued or refreshed.
+    - Unregistered sessions are removed from the heap lazily; the heap is rebuilt
+      when dead entries outnumber live sessions, so memory stays proportional to
+      the open sockets.
+
+    Ending a session cancels the task serving it (the handler stops at its next
+    `await`, so it never writes to a closed socket) and the socket is then closed
+    with code 1008 and the reason (`EXPIRED` or `SUPERSEDED`) from that same task,
+    see `websocket_middleware`. Sessions registered without a task are closed directly.
+    Must be used from a single event loop.
+    """
+
+    def __init__(self):
+        self.__by_client: dict[str, set[Session]] = {}
+        self.__heap: list[tuple[float, int, Session]] = []
+        self.__sequence = itertools.count()
+        self.__timer: asyncio.TimerHandle | None = None
+        self.__timer_at: float = float("inf")
+        self.__size: int = 0
+        self.closed: dict[str, int] = {EXPIRED: 0, SUPERSEDED: 0}
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def stats(self) -> dict:
+        return {
+            "sessions": self.__size,
+            "clients": len(self.__by_client),
+            "expired": self.closed[EXPIRED],
+            "superseded": self.closed[SUPERSEDED],
+        }
+
+    def register(
+        self,
+        websocket: Any,
+        client_id: str,
+        token: str,
+        exp: float,
+        task: asyncio.Task | None = None,
+    ) -> Session:
+        session: Session = Session(websocket, client_id, token, exp, task)
+        self.__by_client.setdefault(client_id, set()).add(session)
+        self.__size += 1
+
+        if exp <= time.time():
+            self.__close(session, EXPIRED)
+            return session
+
+        heapq.heappush(self.__heap, (exp, next(self.__sequence), session))
+        if exp < self.__timer_at:
+            self.__arm(exp)
+        return session
+
+    def unregister(self, session: Session) -> None:
+        if not session.open:
+            return
+        session.open = False
+        self.__size -= 1
+        sessions: set[Session] | None = self.__by_client.get(session.client_id)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self.__by_client[session.client_id]
+        if len(self.__heap) > max(COMPACT_MIN_ENTRIES, 2 * self.__size):
+            self.__heap = [entry for entry in self.__heap if entry[2].open]
+            heapq.heapify(self.__heap)
+
+    def supersede(self, client_id: str, token: str) -> int:
+        """Close the sessions of `client_id` not opened with `token`. Returns how many."""
+        sessions: set[Session] | None = self.__by_client.get(client_id)
+        if not sessions:
+            return 0
+        stale: list[Session] = [session for session in sessions if session.token != token]
+        for session in stale:
+            self.__close(session, SUPERSEDED)
+        return len(stale)
+
+    def stop(self) -> None:
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        self.__timer_at = float("inf")
+
+    def __arm(self, exp: float) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self.__timer is not None:
+            self.__timer.cancel()
+        # Wall clock expiry to loop clock
+        self.__timer = loop.call_at(loop.time() + max(exp - time.time(), 0), self.__expire)
+        self.__timer_at = exp
+
+    def __expire(self) -> None:
+        self.__timer = None
+        self.__timer_at = float("inf")
+        now: float = time.time()
+        # `__close` may rebuild the heap: always go through the attribute
+        while self.__heap and (self.__heap[0][0] <= now or not self.__heap[0][2].open):
+            _, _, session = heapq.heappop(self.__heap)
+            if session.open:
+                self.__close(session, EXPIRED)
+        if self.__heap:
+            self.__arm(self.__heap[0][0])
+
+    def __close(self, session: Session, reason: str) -> None:
+        self.unregister(session)
+        self.closed[reason] += 1
+        session.reason = reason
+        if session.task is not None:
+            session.task.cancel()
+            return
+        try:
+            asyncio.get_running_loop().create_task(close_session(session.websocket, reason))
+        except RuntimeError:
+            pass
+
+
+async def close_session(websocket: Any, reason: str) -> None:
+    try:
+        await websocket.close(code=CLOSE_CODE, reason=reason)
+    except Exception as e:
+        # Already closed by the client or the handler
+        logger.debug(f"WebSocket session close failed. Error: {str(e)}")
+
+
+websocket_sessions: SessionRegistry = SessionRegistry()
+"""Open WebSocket sessions of this process, see `websocket_middleware`."""
@@ -0,0 +1,233 @@
+import os
+import mmap
+import time
+import struct
+import hashlib
+import tempfile
+from ..config import CacheConfig, ConfigFile, logger
+from .cache import MISS
+
+MAGIC: bytes = b"FATC"
+VERSION: int = 1
+# magic, version, slots, bucket size
+HEADER = struct.Struct("<4sIQI")
+HEADER_SIZE: int = 64
+# seq, client_id hash, token digest, expires at (wall clock), flags
+SLOT = struct.Struct("<Q16s16sdI")
+SLOT_SIZE: int = 64
+SEQ = struct.Struct("<Q")
+KEY_OFFSET: int = SEQ.size
+# A client_id is stored in one of the BUCKET_SIZE slots of its bucket
+BUCKET_SIZE: int = 8
+BUCKET_BYTES: int = BUCKET_SIZE * SLOT_SIZE
+
+EMPTY: int = 0
+TOKEN: int = 1
+UNKNOWN: int = 2
+# Seqlock reads retried before reporting a miss
+READ_RETRIES: int = 8
+
+
+def default_path() -> str:
+    """One segment per config file, in `/dev/shm` when available (RAM, never hits the disk)."""
+    directory: str = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    project: str = hashlib.blake2b(
+        os.path.abspath(ConfigFile.PATH).encode(), digest_size=8
+    ).hexdigest()
+    return os.path.join(directory, f"fastauth-tokens-{project}")
+
+
+class SharedTokenCache:
+    """
+    Token lookup results shared by every worker process of the application, in a
+    fixed-size hash table in a memory-mapped file (`/dev/shm` by default).
+
+    Each 64-byte slot holds a 16-byte BLAKE2b hash of the `client_id`, a 16-byte
+    digest of its canonical access token (or the "unknown client" flag) and the
+    entry expiry (`CacheConfig.TTL` / `CacheConfig.NEGATIVE_TTL`). Tokens themselves
+    are never written to the segment: `verify_access_token` compares digests.
+    A `client_id` lives in one of the `BUCKET_SIZE` slots of the bucket its hash
+    selects; when the bucket is full, the entry closest to expiry is replaced.
+
+    - Reads take no lock: each slot is a seqlock (a counter made odd while the slot
+      is written, read before and after the slot); a read that overlaps a write is
+      retried, then reported as a miss.
+    - Writes (misses and `save_token`, not the request hot path) serialize per
+      bucket across processes with a `fcntl` byte-range lock.
+
+    A token found by one worker, or saved by one, is then served to all of them, so
+    the hit rate no longer drops, and the database load no longer grows, with the
+    number of workers. Enabled with `"shared_token_cache": true`; the segment is
+    opened with the application lifespan (POSIX only, disabled with a warning elsewhere).
+    """
+
+    def __init__(self):
+        self.__map: mmap.mmap | None = None
+        self.__fd: int = -1
+        self.__buckets: int = 0
+        self.__locks: tuple = ()
+        self.path: str | None = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self.retries: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.__map is not None
+
+    @staticmethod
+    def key(client_id: str) -> bytes:
+        return hashlib.blake2b(client_id.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16, person=b"fastauth-token").digest()
+
+    def open(self) -> None:
+        if self.__map is not None or not CacheConfig.SHARED:
+            return
+        try:
+            import fcntl
+        except ImportError:
+            logger.warning("Shared token cache disabled: file locks are not available on this platform")
+            return
+
+        # Rounded up to whole buckets; the count is part of the file name, so workers
+        # started with another size never map a segment of a different layout
+        buckets: int = max(1, -(-CacheConfig.SHARED_SLOTS // BUCKET_SIZE))
+        path: str = f"{CacheConfig.SHARED_PATH or default_path()}-{buckets * BUCKET_SIZE}"
+        size: int = HEADER_SIZE + buckets * BUCKET_SIZE * SLOT_SIZE
+
+        fd: int = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            # The first worker formats the segment; the others wait for it
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                header: bytes = os.pread(fd, HEADER.size, 0)
+                expected: bytes = HEADER.pack(MAGIC, VERSION, buckets * BUCKET_SIZE, BUCKET_SIZE)
+                if header != expected or os.fstat(fd).st_size != size:
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, expected, 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self.__map = mmap.mmap(fd, size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        except OSError:
+            os.close(fd)
+            raise
+
+        self.__fd = fd
+        self.__buckets = buckets
+        self.__locks = (fcntl.lockf, fcntl.LOCK_EX, fcntl.LOCK_UN)
+        self.path = path
+        logger.debug(f"Shared token cache: {path}, {buckets * BUCKET_SIZE} slots")
+
+    def close(self) -> None:
+        if self.__map is not None:
+            self.__map.close()
+            os.close(self.__fd)
+        self.__map = None
+        self.__fd = -1
+
+    def get(self, client_id: str) -> bytes | None | object:
+        """
+        Return the digest of the canonical token of `client_id` (`None` for a client
+        cached as unknown), or `MISS` if no live entry is stored.
+        """
+        memory: mmap.mmap | None = self.__map
+        if memory is None:
+            return MISS
+        key: bytes = self.key(client_id)
+        start: int = HEADER_SIZE + int.from_bytes(key[:8], "little") % self.__buckets * BUCKET_BYTES
+        # One copy and search of the bucket instead of a read per slot
+        bucket: bytes = memory[start : start + BUCKET_BYTES]
+        position: int = bucket.find(key)
+        while position >= 0 and position % SLOT_SIZE != KEY_OFFSET:
+            position = bucket.find(key, position + 1)
+        if position >= 0:
+            position -= KEY_OFFSET
+            for _ in range(READ_RETRIES):
+                seq, slot_key, digest, expires_at, flags = SLOT.unpack_from(bucket, position)
+                # Even and unchanged since the copy: the slot was not being written
+                if not seq & 1 and SEQ.unpack_from(memory, start + position)[0] == seq:
+                    if slot_key == key and flags != EMPTY and expires_at > time.time():
+                        self.hits += 1
+                        return digest if flags == TOKEN else None
+                    break
+                self.retries += 1
+                bucket = memory[start : start + BUCKET_BYTES]
+        self.misses += 1
+        return MISS
+
+    def set(self, client_id: str, token: str | None) -> None:
+        """Store the digest of `token` for `client_id` (`None` caches an unknown client)."""
+        self.__store(client_id, token, keep_live=False)
+
+    def add(self, client_id: str, token: str | None) -> None:
+        """Like `set`, but keeps a live entry untouched (e.g. one just written by `save_token`
+        in another worker while this worker's database lookup was in flight)."""
+        self.__store(client_id, token, keep_live=True)
+
+    def invalidate(self, client_id: str) -> None:
+        self.__write(self.key(client_id), bytes(16), 0.0, EMPTY, keep_live=False)
+
+    def stats(self) -> dict:
+        return {
+            "slots": self.__buckets * BUCKET_SIZE,
+            "hits": self.hits,
+            "misses": self.misses,
+            "retries": self.retries,
+        }
+
+    def __store(self, client_id: str, token: str | None, keep_live: bool) -> None:
+        ttl: float = CacheConfig.TTL if token is not None else CacheConfig.NEGATIVE_TTL
+        if ttl <= 0 or CacheConfig.TTL <= 0:
+            if not keep_live:
+                self.invalidate(client_id)
+            return
+        digest, flags = (bytes(16), UNKNOWN) if token is None else (self.digest(token), TOKEN)
+        self.__write(self.key(client_id), digest, time.time() + ttl, flags, keep_live)
+
+    def __bucket(self, key: bytes) -> int:
+        return HEADER_SIZE + int.from_bytes(key[:8], "little") % self.__buckets * BUCKET_BYTES
+
+    def __write(self, key: bytes, digest: bytes, expires_at: float, flags: int, keep_live: bool) -> None:
+        memory: mmap.mmap | None = self.__map
+        if memory is None:
+            return
+        start: int = self.__bucket(key)
+        length: int = BUCKET_BYTES
+        lockf, lock, unlock = self.__locks
+        lockf(self.__fd, lock, length, start)
+        try:
+            now: float = time.time()
+            target: int = -1
+            victim: tuple[float, int] | None = None
+            for offset in range(start, start + length, SLOT_SIZE):
+                _, slot_key, _, slot_expires, slot_flags = SLOT.unpack_from(memory, offset)
+                if slot_key == key:
+                    if keep_live and slot_flags != EMPTY and slot_expires > now:
+                        return
+                    target = offset
+                    break
+                # Free, expired or closest to expiry: the slot to replace if the key is absent
+                rank: float = slot_expires if slot_flags != EMPTY else float("-inf")
+                if victim is None or rank < victim[0]:
+                    victim = (rank, offset)
+
+            if target < 0:
+                if flags == EMPTY:
+                    return
+                target = victim[1]
+
+            seq: int = SEQ.unpack_from(memory, target)[0]
+            # Odd while the slot is written: readers retry
+            SEQ.pack_into(memory, target, seq + 1)
+            SLOT.pack_into(memory, target, seq + 1, key, digest, expires_at, flags)
+            SEQ.pack_into(memory, target, seq + 2)
+        finally:
+            lockf(self.__fd, unlock, length, start)
+
+
+shared_tokens: SharedTokenCache = SharedTokenCache()
+"""Token lookups shared by the worker processes, see `SharedTokenCache`."""
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls by key: while a call for a key is in flight, every
+    other caller for the same key awaits that call instead of starting its own.
+
+    The call runs in its own task, so a waiter being cancelled (e.g. a client hanging
+    up) does not cancel the lookup the other waiters depend on. Results, errors and
+    timeouts are delivered to every waiter. `saved` counts the calls that were avoided.
+    """
+
+    def __init__(self):
+        self.__calls: dict[Any, asyncio.Task] = {}
+        self.saved: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__calls)
+
+    async def do(self, key: Any, call: Callable[[], Awaitable[Any]]) -> Any:
+        task: asyncio.Task | None = self.__calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self.__calls[key] = task
+            task.add_done_callback(lambda done: self.__release(key, done))
+        else:
+            self.saved += 1
+        return await asyncio.shield(task)
+
+    def forget(self, key: Any) -> None:
+        """Let the next caller for `key` start a new call instead of joining the current one."""
+        self.__calls.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self.__calls), "saved": self.saved}
+
+    def __release(self, key: Any, task: asyncio.Task) -> None:
+        if self.__calls.get(key) is task:
+            del self.__calls[key]
+        if not task.cancelled():
+            # Mark the error as retrieved even if every waiter went away
+            task.exception()
@@ -0,0 +1,46 @@
+import importlib
+from .base import TokenStore, DatabaseError
+from ...config import DatabaseConfig
+
+# Built-in stores as "module:class", imported when selected (the HTTP store pulls in
+# httpx); custom store classes can be registered directly
+STORES: dict[str, str | type[TokenStore]] = {
+    "http": "http_store:HTTPTokenStore",
+    "memory": "memory_store:MemoryTokenStore",
+    "sqlite": "sqlite_store:SQLiteTokenStore",
+}
+
+_active_store: TokenStore | None = None
+
+
+def store_class(name: str) -> type[TokenStore]:
+    """The `TokenStore` class registered as `name` in `STORES`."""
+    if name not in STORES:
+        raise ValueError(f"Unknown token_store '{name}'. Available: {', '.join(STORES)}")
+    store = STORES[name]
+    if isinstance(store, str):
+        module, _, cls = store.partition(":")
+        store = getattr(importlib.import_module(f".{module}", __name__), cls)
+    return store
+
+
+def token_store() -> TokenStore:
+    """Return the active token store, building the one named by `DatabaseConfig.STORE` on first use."""
+    global _active_store
+    if _active_store is None:
+        _active_store = store_class(DatabaseConfig.STORE)()
+    return _active_store
+
+
+def set_token_store(store: TokenStore | None) -> None:
+    """Install a custom `TokenStore` instance (None resets to the configured one)."""
+    global _active_store
+    _active_store = store
+
+
+def __getattr__(name: str):
+    # `from fastauth.client_db.stores import HTTPTokenStore` still works, lazily
+    for key, store in STORES.items():
+        if isinstance(store, str) and store.endswith(f":{name}"):
+            return store_class(key)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,72 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+
+class DatabaseError(Exception):
+    """The token store could not be reached or answered with an unexpected status."""
+
+
+class TokenStore(ABC):
+    """
+    Persistence backend for token pairs and revoked token ids.
+
+    Implementations must tell "unknown client" (return None) apart from "no
+    trustworthy answer" (raise `DatabaseError`): the first is cached as a negative
+    entry, the second is never cached. Likewise, writes return False when the store
+    rejects them and raise `DatabaseError` when it is unreachable or failing: only
+    the latter counts towards opening `database_breaker`.
+
+    ### Implementations
+    - `HTTPTokenStore` (`"token_store": "http"`, default): external database API at `database_api_path`.
+    - `MemoryTokenStore` (`"memory"`): process-local dict, for tests and single-process apps.
+    - `SQLiteTokenStore` (`"sqlite"`): local SQLite file in WAL mode at `sqlite_path`.
+
+    Custom stores can be installed with `set_token_store(MyStore())`.
+    """
+
+    async def open(self) -> None:
+        """Acquire resources (connections, files). Called on application startup."""
+
+    async def close(self) -> None:
+        """Release resources. Called on application shutdown."""
+
+    @abstractmethod
+    async def load(self, client_id: str) -> dict | None:
+        """Return `{"access_token": ..., "refresh_token": ...}` for `client_id`, or None if unknown."""
+
+    async def load_many(self, client_ids: list[str]) -> dict:
+        """
+        Return `{client_id: data}` for the known clients among `client_ids`.
+        Values may be exceptions for lookups that failed individually.
+        """
+        results = await asyncio.gather(
+            *(self.load(client_id) for client_id in client_ids),
+            return_exceptions=True,
+        )
+        return dict(zip(client_ids, results))
+
+    @abstractmethod
+    async def save(self, client_id: str, access_token: str, refresh_token: str) -> bool:
+        """Store the token pair of `client_id`, replacing any previous one. False if rejected."""
+
+    async def save_many(self, pairs: list[tuple[str, str, str]]) -> bool:
+        """
+        Store several `(client_id, access_token, refresh_token)` pairs at once.
+        Returns True only if every pair was stored.
+        """
+        results = await asyncio.gather(
+            *(self.save(*pair) for pair in pairs),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, DatabaseError):
+                raise result
+        return all(result is True for result in results)
+
+    @abstractmethod
+    async def load_revoked(self) -> dict[str, float]:
+        """Return the revoked token ids as `{jti: exp}`."""
+
+    @abstractmethod
+    async def revoke(self, jti: str, exp: float) -> bool:
+        """Record `jti` as revoked until `exp`. False if rejected."""
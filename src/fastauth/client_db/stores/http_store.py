@@ -0,0 +1,130 @@
+import httpx
+from ...config import logger, DatabaseConfig
+from ..http_client import DatabaseClient
+from .base import TokenStore, DatabaseError
+
+
+class HTTPTokenStore(TokenStore):
+    """
+    Token store backed by the external database API at `database_api_path`.
+
+    ### API contract
+    - `GET /token?client_id=<id>` → `{"data": {"access_token": ..., "refresh_token": ...}}`, 404 if unknown.
+    - `POST /token?client_id=<id>` with `{"data": {"access_token": ..., "refresh_token": ...}}`.
+    - `POST /token/batch` with `{"client_ids": [...]}` → `{"data": {client_id: {...}}}` (optional).
+    - `PUT /token/batch` with `{"data": {client_id: {"access_token": ..., "refresh_token": ...}}}` (optional).
+    - `GET /revoked` → `{"data": {jti: exp}}` and `POST /revoked` with `{"data": {jti: exp}}` (optional).
+
+    All requests go through the shared `DatabaseClient` pool.
+    """
+
+    def __init__(self):
+        self.__batch_endpoint: bool = True
+        self.__batch_save_endpoint: bool = True
+        self.__revoked_endpoint: bool = True
+
+    @property
+    def url(self) -> str:
+        DATABASE_API_URL: str = DatabaseConfig.PATH
+        if DATABASE_API_URL is None:
+            logger.error("Database API URL is not configured.")
+            raise DatabaseError("Database API URL is not configured")
+        return DATABASE_API_URL
+
+    async def open(self) -> None:
+        DatabaseClient.get()
+
+    async def close(self) -> None:
+        await DatabaseClient.aclose()
+
+    async def load(self, client_id: str) -> dict | None:
+        response = await self.__request("GET", "/token", params={"client_id": client_id})
+        if response.status_code == 200:
+            return response.json()["data"]
+        if response.status_code == 404:
+            return None
+        logger.warning(
+            f"Database API answered {response.status_code} for client_id={client_id}"
+        )
+        raise DatabaseError(f"Unexpected status code {response.status_code}")
+
+    async def load_many(self, client_ids: list[str]) -> dict:
+        if self.__batch_endpoint:
+            response = await self.__request(
+                "POST", "/token/batch", json={"client_ids": client_ids}
+            )
+            if response.status_code == 200:
+                return response.json().get("data") or {}
+            if response.status_code not in (404, 405):
+                logger.warning(f"Database API answered {response.status_code} for a batch")
+                raise DatabaseError(f"Unexpected status code {response.status_code}")
+
+            self.__batch_endpoint = False
+            logger.warning(
+                "Database API has no `/token/batch` endpoint; falling back to single lookups."
+            )
+
+        return await super().load_many(client_ids)
+
+    async def save(self, client_id: str, access_token: str, refresh_token: str) -> bool:
+        payload: dict = {"access_token": access_token, "refresh_token": refresh_token}
+        response = await self.__request(
+            "POST", "/token", params={"client_id": client_id}, json={"data": payload}
+        )
+        return self.__accepted(response, f"save of client_id={client_id}")
+
+    async def save_many(self, pairs: list[tuple[str, str, str]]) -> bool:
+        if self.__batch_save_endpoint:
+            payload: dict = {
+                client_id: {"access_token": access_token, "refresh_token": refresh_token}
+                for client_id, access_token, refresh_token in pairs
+            }
+            response = await self.__request("PUT", "/token/batch", json={"data": payload})
+            if response.status_code not in (404, 405):
+                return self.__accepted(response, "batch save")
+
+            self.__batch_save_endpoint = False
+            logger.warning(
+                "Database API has no `PUT /token/batch` endpoint; falling back to single saves."
+            )
+
+        return await super().save_many(pairs)
+
+    async def load_revoked(self) -> dict[str, float]:
+        response = await self.__request("GET", "/revoked")
+        if response.status_code == 200:
+            self.__revoked_endpoint = True
+            return response.json().get("data") or {}
+        if response.status_code == 404:
+            if self.__revoked_endpoint:
+                logger.warning(
+                    "Database API has no `/revoked` endpoint; only revocations made by this process are enforced."
+                )
+            self.__revoked_endpoint = False
+            return {}
+        raise DatabaseError(f"Unexpected status code {response.status_code}")
+
+    async def revoke(self, jti: str, exp: float) -> bool:
+        response = await self.__request("POST", "/revoked", json={"data": {jti: exp}})
+        return self.__accepted(response, "revocation")
+
+    @staticmethod
+    def __accepted(response: httpx.Response, operation: str) -> bool:
+        """True for a 200 answer to a write, False if rejected; 5xx raise `DatabaseError`."""
+        if response.status_code == 200:
+            return True
+        if response.status_code >= 500:
+            logger.warning(f"Database API answered {response.status_code} for a {operation}")
+            raise DatabaseError(f"Unexpected status code {response.status_code}")
+        logger.warning(f"Database API rejected a {operation} with {response.status_code}")
+        return False
+
+    async def __request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        url: str = f"{self.url}{path}"
+        try:
+            return await DatabaseClient.get().request(method, url, **kwargs)
+        except httpx.RequestError as e:
+            logger.warning(
+                f"An error occurred while requesting {e.request.url!r}. Error: {str(e)}"
+            )
+            raise DatabaseError(str(e)) from e
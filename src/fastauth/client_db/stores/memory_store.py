@@ -0,0 +1,48 @@
+import time
+from .base import TokenStore
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    Token store kept in a process-local dict.
+    Tokens are lost on restart and not shared between workers: intended for tests,
+    development and single-process deployments.
+    """
+
+    def __init__(self):
+        self.__tokens: dict[str, dict] = {}
+        self.__revoked: dict[str, float] = {}
+
+    async def load(self, client_id: str) -> dict | None:
+        data = self.__tokens.get(client_id)
+        return dict(data) if data is not None else None
+
+    async def load_many(self, client_ids: list[str]) -> dict:
+        return {
+            client_id: dict(self.__tokens[client_id])
+            for client_id in client_ids
+            if client_id in self.__tokens
+        }
+
+    async def save(self, client_id: str, access_token: str, refresh_token: str) -> bool:
+        self.__tokens[client_id] = {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+        }
+        return True
+
+    async def save_many(self, pairs: list[tuple[str, str, str]]) -> bool:
+        for client_id, access_token, refresh_token in pairs:
+            self.__tokens[client_id] = {
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+            }
+        return True
+
+    async def load_revoked(self) -> dict[str, float]:
+        now: float = time.time()
+        return {jti: exp for jti, exp in self.__revoked.items() if exp > now}
+
+    async def revoke(self, jti: str, exp: float) -> bool:
+        self.__revoked[jti] = exp
+        return True
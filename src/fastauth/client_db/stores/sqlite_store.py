@@ -0,0 +1,187 @@
+import time
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from ...config import logger, DatabaseConfig
+from .base import TokenStore, DatabaseError
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS tokens (
+        client_id TEXT PRIMARY KEY,
+        access_token TEXT NOT NULL,
+        refresh_token TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS revoked (
+        jti TEXT PRIMARY KEY,
+        exp REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS revoked_exp ON revoked (exp)",
+)
+
+SELECT_TOKEN = "SELECT access_token, refresh_token FROM tokens WHERE client_id = ?"
+UPSERT_TOKEN = """
+    INSERT INTO tokens (client_id, access_token, refresh_token, updated_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (client_id) DO UPDATE SET
+        access_token = excluded.access_token,
+        refresh_token = excluded.refresh_token,
+        updated_at = excluded.updated_at
+"""
+SELECT_REVOKED = "SELECT jti, exp FROM revoked WHERE exp > ?"
+INSERT_REVOKED = "INSERT OR REPLACE INTO revoked (jti, exp) VALUES (?, ?)"
+DELETE_EXPIRED = "DELETE FROM revoked WHERE exp <= ?"
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    Token store in a local SQLite database (`sqlite_path`), for deployments where the
+    application and its tokens live on the same host.
+
+    - WAL journal with `synchronous=NORMAL`: readers never block on the writer and
+      several worker processes can share the same file.
+    - `client_id` is the clustered primary key (`WITHOUT ROWID`), so a lookup is a
+      single B-tree search.
+    - Statements are constant strings, compiled once and reused from the connection's
+      statement cache.
+
+    Statements run on a dedicated thread that owns the connection, so the event loop
+    never waits on the disk or on another process holding the write lock
+    (`busy_timeout`); `database_deadline` bounds how long a request waits for them.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path: str = path or DatabaseConfig.SQLITE_PATH
+        self.__connection: sqlite3.Connection | None = None
+        self.__executor: ThreadPoolExecutor | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The store's connection, opened on first use. Only used from the store's thread."""
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=64,
+            )
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute("PRAGMA synchronous=NORMAL")
+            self.__connection.execute("PRAGMA busy_timeout=5000")
+            for statement in SCHEMA:
+                self.__connection.execute(statement)
+        return self.__connection
+
+    async def open(self) -> None:
+        await self.__run(lambda: self.connection)
+
+    async def close(self) -> None:
+        executor, self.__executor = self.__executor, None
+        if executor is None:
+            return
+        await asyncio.get_running_loop().run_in_executor(executor, self.__disconnect)
+        executor.shutdown(wait=False)
+
+    async def load(self, client_id: str) -> dict | None:
+        try:
+            row = await self.__run(self.__select, client_id)
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite token lookup failed. Error: {str(e)}")
+            raise DatabaseError(str(e)) from e
+        if row is None:
+            return None
+        return {"access_token": row[0], "refresh_token": row[1]}
+
+    async def load_many(self, client_ids: list[str]) -> dict:
+        try:
+            rows: dict = await self.__run(self.__select_many, client_ids)
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite token lookup failed. Error: {str(e)}")
+            raise DatabaseError(str(e)) from e
+        return {
+            client_id: {"access_token": row[0], "refresh_token": row[1]}
+            for client_id, row in rows.items()
+            if row is not None
+        }
+
+    async def save(self, client_id: str, access_token: str, refresh_token: str) -> bool:
+        try:
+            await self.__run(
+                self.__execute, UPSERT_TOKEN, (client_id, access_token, refresh_token, time.time())
+            )
+        except sqlite3.Error as e:
+            logger.error(f"SQLite token save failed. Error: {str(e)}")
+            raise DatabaseError(str(e)) from e
+        return True
+
+    async def save_many(self, pairs: list[tuple[str, str, str]]) -> bool:
+        try:
+            await self.__run(self.__upsert_many, pairs, time.time())
+        except sqlite3.Error as e:
+            logger.error(f"SQLite batch token save failed. Error: {str(e)}")
+            raise DatabaseError(str(e)) from e
+        return True
+
+    async def load_revoked(self) -> dict[str, float]:
+        try:
+            return await self.__run(self.__select_revoked, time.time())
+        except sqlite3.Error as e:
+            raise DatabaseError(str(e)) from e
+
+    async def revoke(self, jti: str, exp: float) -> bool:
+        try:
+            await self.__run(self.__execute, INSERT_REVOKED, (jti, exp))
+        except sqlite3.Error as e:
+            logger.error(f"SQLite revocation failed. Error: {str(e)}")
+            raise DatabaseError(str(e)) from e
+        return True
+
+    async def __run(self, call: Callable[..., Any], *args) -> Any:
+        if self.__executor is None:
+            # One thread: the connection is never used concurrently
+            self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fastauth-sqlite")
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, call, *args)
+
+    def __disconnect(self) -> None:
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def __execute(self, statement: str, parameters: tuple) -> None:
+        self.connection.execute(statement, parameters)
+
+    def __select(self, client_id: str) -> tuple | None:
+        return self.connection.execute(SELECT_TOKEN, (client_id,)).fetchone()
+
+    def __select_many(self, client_ids: list[str]) -> dict:
+        cursor = self.connection.cursor()
+        return {
+            client_id: cursor.execute(SELECT_TOKEN, (client_id,)).fetchone()
+            for client_id in client_ids
+        }
+
+    def __upsert_many(self, pairs: list[tuple[str, str, str]], now: float) -> None:
+        connection = self.connection
+        # One transaction: a single WAL commit for the whole batch
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(
+                UPSERT_TOKEN,
+                (
+                    (client_id, access_token, refresh_token, now)
+                    for client_id, access_token, refresh_token in pairs
+                ),
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def __select_revoked(self, now: float) -> dict[str, float]:
+        self.connection.execute(DELETE_EXPIRED, (now,))
+        return dict(self.connection.execute(SELECT_REVOKED, (now,)).fetchall())
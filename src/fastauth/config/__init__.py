@@ -1,2 +1,2 @@
-from .logger import logger
-from .server import ConfigServer, TokenConfig, DatabaseConfig
+from .logger import logger, LogConfig, configure_logging, log_request_path
+from .server import load_config, resolve_setting, ConfigFile, ConfigServer, TokenConfig, DatabaseConfig, CacheConfig, InvalidationConfig, MetricsConfig
@@ -1,7 +1,12 @@
+import os
+import sys
+import queue
+import atexit
+import random
 import logging
+import threading
 import logging.handlers
 from pathlib import Path
-import sys
 
 
 class CustomFormatter(logging.Formatter):
@@ -22,52 +27,165 @@ class CustomFormatter(logging.Formatter):
         logging.CRITICAL: format.replace("{color}", bold_red),
     }
 
+    def __init__(self):
+        super().__init__()
+        # One formatter per level, built once instead of once per record
+        self.__formatters: dict[int, logging.Formatter] = {
+            level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()
+        }
+        self.__default: logging.Formatter = logging.Formatter()
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self.__formatters.get(record.levelno, self.__default).format(record)
+
+
+class LogConfig:
+    # The file sink can also be disabled before import with FASTAUTH_LOG_FILE=0
+    FILE: bool = os.getenv("FASTAUTH_LOG_FILE", "1").lower() not in ("0", "false", "no")
+    LEVEL: int = logging.DEBUG
+    # Per-request "Request Path" records: level and fraction of requests logged
+    REQUEST_LEVEL: int = logging.INFO
+    REQUEST_SAMPLE_RATE: float = 1.0
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records untouched: message formatting happens in the listener thread.
+    Records with exception info still go through the default preparation, so the
+    traceback is rendered while it is available.
+    """
+
+    def prepare(self, record):
+        if record.exc_info:
+            return super().prepare(record)
+        return record
+
+
+_listener: logging.handlers.QueueListener | None = None
+_setup_lock = threading.Lock()
+
+
+class _SetupHandler(logging.Handler):
+    """
+    Placeholder handler until the first record: installs the real handlers
+    (`setup_logger`) and passes the record on. Importing fastauth therefore creates
+    no log directory, file or thread.
+    """
+
+    def emit(self, record):
+        with _setup_lock:
+            if self in logger.handlers:
+                setup_logger()
+        # Only this logger's new handlers: the caller already propagates to the parents
+        for handler in logger.handlers:
+            if handler is not self and record.levelno >= handler.level:
+                handler.handle(record)
 
 
 def setup_logger() -> logging.Logger:
-    """Configure logging for the MCP client with log rotation."""
+    """
+    Configure logging for the MCP client with log rotation.
+
+    The logger only puts records on an in-memory queue; a listener thread writes them
+    to stdout and, if `LogConfig.FILE` is enabled, to a rotating file. Callers on the
+    event loop never wait for terminal or disk I/O.
+    """
+    global _listener
     logger = logging.getLogger("client-mcp")
 
     # Remove existing handlers to avoid duplicate logs
     if logger.hasHandlers():
         logger.handlers.clear()
-
-    # Define a consistent log directory in the user's home folder
-    log_dir = Path.home() / ".local" / "share" / "fastchat-mcp"
-    log_dir.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
-
-    # Define the log file path
-    log_file = log_dir / "mcp_client.log"
-
-    # Create a rotating file handler
-    # - Rotate when log reaches 5MB
-    # - Keep 3 backup files
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_file,
-        maxBytes=5 * 1024 * 1024,  # 5MB
-        backupCount=3,
-        encoding="utf-8",
-    )
-
-    # Add formatter to file handler
-    file_handler.setFormatter(CustomFormatter())
-
-    # Add handler to logger
-    logger.addHandler(file_handler)
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+
+    formatter = CustomFormatter()
+    handlers: list[logging.Handler] = []
+
+    if LogConfig.FILE:
+        # Define a consistent log directory in the user's home folder
+        log_dir = Path.home() / ".local" / "share" / "fastchat-mcp"
+        try:
+            log_dir.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
+        except OSError:
+            # Read-only or missing home: log to stdout only
+            log_dir = None
+
+        if log_dir is not None:
+            # Define the log file path
+            log_file = log_dir / "mcp_client.log"
+
+            # Create a rotating file handler
+            # - Rotate when log reaches 5MB
+            # - Keep 3 backup files
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=5 * 1024 * 1024,  # 5MB
+                backupCount=3,
+                encoding="utf-8",
+                delay=True,
+            )
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
 
     # Terminal Handler  (stdout)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(CustomFormatter())
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(formatter)
+    handlers.append(console_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(_RecordQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
 
     # Set level
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(LogConfig.LEVEL)
 
     return logger
 
 
-logger = setup_logger()
\ No newline at end of file
+def configure_logging(
+    file: bool | None = None,
+    level: int | str | None = None,
+    request_level: int | str | None = None,
+    request_sample_rate: float | None = None,
+) -> logging.Logger:
+    """Update `LogConfig` and rebuild the handlers. None keeps the current value."""
+    if file is not None:
+        LogConfig.FILE = file
+    if level is not None:
+        LogConfig.LEVEL = _level(level)
+    if request_level is not None:
+        LogConfig.REQUEST_LEVEL = _level(request_level)
+    if request_sample_rate is not None:
+        LogConfig.REQUEST_SAMPLE_RATE = request_sample_rate
+    return setup_logger()
+
+
+def log_request_path(path: str) -> None:
+    """Log the request path at `LogConfig.REQUEST_LEVEL` for a sample of the requests."""
+    if not logger.isEnabledFor(LogConfig.REQUEST_LEVEL):
+        return
+    if LogConfig.REQUEST_SAMPLE_RATE < 1.0 and random.random() >= LogConfig.REQUEST_SAMPLE_RATE:
+        return
+    logger.log(LogConfig.REQUEST_LEVEL, "Request Path: %s", path)
+
+
+def _level(level: int | str) -> int:
+    return level if isinstance(level, int) else logging.getLevelNamesMapping()[level.upper()]
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
+logger = logging.getLogger("client-mcp")
+logger.handlers.clear()
+logger.addHandler(_SetupHandler())
+logger.setLevel(LogConfig.LEVEL)
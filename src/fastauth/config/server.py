@@ -1,46 +1,202 @@
 import os
 import json
-from .logger import logger
+import threading
+from typing import Any, Callable
+from .logger import logger, configure_logging
 
 
 class ConfigFile:
     PATH: str = "fastauth.config.json"
     DATA: dict = {}
+    LOADED: bool = False
 
 
-if ConfigFile.DATA == {}:
-    # Singleton
-    try:
-        with open(ConfigFile.PATH, "r") as f:
-            ConfigFile.DATA = json.load(f)
-    except FileNotFoundError:
-        logger.warning(
-            "Configuration file not found. Please create '.fastauth.config.json' or pass settings via paramaters in `Fastauth()`"
+_load_lock = threading.Lock()
+
+
+def load_config() -> dict:
+    """
+    Read `ConfigFile.PATH` once (on first use of a setting, or by `Fastauth()`) and
+    apply its logging settings. Returns the parsed settings, `{}` without a file.
+    """
+    if ConfigFile.LOADED:
+        return ConfigFile.DATA
+    with _load_lock:
+        if ConfigFile.LOADED:
+            return ConfigFile.DATA
+        try:
+            with open(ConfigFile.PATH, "r") as f:
+                ConfigFile.DATA = json.load(f)
+        except FileNotFoundError:
+            logger.warning(
+                "Configuration file not found. Please create '.fastauth.config.json' or pass settings via paramaters in `Fastauth()`"
+            )
+        ConfigFile.LOADED = True
+
+    config: dict = ConfigFile.DATA
+    if any(
+        key in config
+        for key in ("log_file", "log_level", "request_log_level", "request_log_sample_rate")
+    ):
+        configure_logging(
+            file=config.get("log_file"),
+            level=config.get("log_level"),
+            request_level=config.get("request_log_level"),
+            request_sample_rate=config.get("request_log_sample_rate"),
         )
+    return config
+
+
+class setting:
+    """
+    Config class attribute resolved from the config file on first access.
+
+    `setting("key", default)` reads `config.get("key", default)`; `setting(factory)`
+    calls `factory(config)`. The resolved value then replaces the descriptor on the
+    class, so later reads are plain class attribute lookups, and assignments
+    (`TokenConfig.CODEC = "fast"`, as `Fastauth()` does) simply override it.
+    """
+
+    def __init__(self, key: str | Callable[[dict], Any], default: Any = None):
+        self.key = key
+        self.default: Any = default
+        self.name: str = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        _settings[(owner, name)] = self
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        value: Any = self.resolve(load_config())
+        setattr(owner, self.name, value)
+        return value
 
-config: dict = ConfigFile.DATA
+    def resolve(self, config: dict) -> Any:
+        """The value of this setting for the parsed settings `config`."""
+        return self.key(config) if callable(self.key) else config.get(self.key, self.default)
+
+
+_settings: dict[tuple[type, str], setting] = {}
+
+
+def resolve_setting(owner: type, name: str, config: dict) -> Any:
+    """
+    Resolve `owner.name` against `config` (e.g. a newly read config file) with the
+    same defaults and environment fallbacks as on first access, without assigning it.
+    """
+    return _settings[(owner, name)].resolve(config)
 
 
 class ConfigServer:
-    MASTER_TOKEN: str | None = (
-        config.get("master_token", None)
+    MASTER_TOKEN: str | None = setting(
+        lambda config: config.get("master_token", None)
         if config.get("master_token", None) is not None
         else os.getenv("MASTER_TOKEN", None)
     )
 
-    MASTER_PATHS: list[str] = ["/auth/token/new"] + config.get("master_token_paths", [])
-    ACCESS_TOKEN_PATHS: list[str] = config.get("access_token_paths", [])
+    MASTER_PATHS: list[str] = setting(
+        lambda config: ["/auth/token/new", "/auth/token/bulk"]
+        + config.get("master_token_paths", [])
+    )
+    ACCESS_TOKEN_PATHS: list[str] = setting("access_token_paths", [])
+
+    # Use the pure ASGI `AccessTokenASGIMiddleware` instead of `AccessTokenMiddleware`
+    ASGI_MIDDLEWARE: bool = setting("asgi_middleware", False)
+
+    # How `websocket_middleware` rejects a handshake: "accept" (accept, send the error
+    # and close), "close" (close before accept) or "http" (HTTP 401 denial response)
+    WEBSOCKET_DENIAL: str = setting("websocket_denial", "accept")
+    # Close access-token WebSockets when their token expires or is replaced
+    WEBSOCKET_SESSIONS: bool = setting("websocket_sessions", False)
+
+    # Generate and serialize the OpenAPI schema at startup instead of on the first hit
+    OPENAPI_PREBUILD: bool = setting("openapi_prebuild", True)
+
+    # Seconds between checks of the config file for changes to the master token, the
+    # protected paths and the cryptography key (0 disables hot reload)
+    CONFIG_RELOAD_INTERVAL: float = setting("config_reload_interval", 0)
 
 
 class TokenConfig:
-    CRYPTOGRAPHY_KEY: str = os.getenv("CRYPTOGRAPHY_KEY", None) or config.get(
-        "cryptography_key", None
+    CRYPTOGRAPHY_KEY: str = setting(
+        lambda config: os.getenv("CRYPTOGRAPHY_KEY", None)
+        or config.get("cryptography_key", None)
     )
 
+    # Accept access tokens on signature + `exp` + revocation list, without a database lookup
+    STATELESS: bool = setting("stateless_verification", False)
+    REVOCATION_SYNC_INTERVAL: float = setting("revocation_sync_interval", 60.0)
+
+    # JWT implementation: "jose" (python-jose) or "fast" (built-in HS256 codec)
+    CODEC: str = setting("jwt_codec", "jose")
+
+    # `/auth/token/bulk`: pairs encoded and saved per chunk; batches of at least
+    # BULK_PROCESS_THRESHOLD clients are encoded in a process pool (0 disables it)
+    BULK_CHUNK_SIZE: int = setting("bulk_chunk_size", 500)
+    BULK_PROCESS_THRESHOLD: int = setting("bulk_process_threshold", 50000)
+    BULK_MAX_WORKERS: int | None = setting("bulk_max_workers", None)
+
 
 class DatabaseConfig:
-    PATH: str | None = (
-        config.get("database_api_path", None)
-        if config.get("database_api_path", None) is not None
-        else None
-    )
+    PATH: str | None = setting("database_api_path", None)
+
+    # Token store backend: "http" (database API), "memory" or "sqlite"
+    STORE: str = setting("token_store", "http")
+    SQLITE_PATH: str = setting("sqlite_path", "fastauth_tokens.db")
+
+    # Shared `httpx.AsyncClient` pool used to reach the database API
+    TIMEOUT: float = setting("database_timeout", 5.0)
+    MAX_CONNECTIONS: int = setting("database_max_connections", 100)
+    MAX_KEEPALIVE_CONNECTIONS: int = setting("database_max_keepalive_connections", 20)
+    KEEPALIVE_EXPIRY: float = setting("database_keepalive_expiry", 5.0)
+
+    # Whole-call limit on any token store operation, on top of the HTTP pool timeouts
+    # (0 disables it), and the circuit breaker: opened after BREAKER_FAILURES
+    # consecutive failures (0 disables it), probed again after BREAKER_RESET seconds
+    DEADLINE: float = setting("database_deadline", 10.0)
+    BREAKER_FAILURES: int = setting("database_breaker_failures", 5)
+    BREAKER_RESET: float = setting("database_breaker_reset", 10.0)
+
+    # Micro-batching of token lookups into `POST /token/batch` (0 ms disables it)
+    BATCH_WINDOW_MS: float = setting("database_batch_window_ms", 0)
+    BATCH_MAX_SIZE: int = setting("database_batch_max_size", 100)
+
+
+class CacheConfig:
+    # In-process cache of canonical access tokens in front of the database API
+    TTL: float = setting("token_cache_ttl", 300.0)
+    NEGATIVE_TTL: float = setting("token_cache_negative_ttl", 5.0)
+    MAX_SIZE: int = setting("token_cache_max_size", 10000)
+    # Expired tokens are still served for this long (seconds) when the token store
+    # fails or its circuit is open, and revalidated once it recovers (0 disables it)
+    GRACE: float = setting("token_cache_grace", 0)
+
+    # Verified JWT claims keyed by token digest, see `utils/decoded_cache.py`
+    DECODED_MAX_SIZE: int = setting("decoded_token_cache_size", 10000)
+
+    # Token lookups shared by worker processes in a memory-mapped table, see
+    # `client_db/shared_cache.py` (path: a segment in /dev/shm per config file)
+    SHARED: bool = setting("shared_token_cache", False)
+    SHARED_PATH: str | None = setting("shared_token_cache_path", None)
+    SHARED_SLOTS: int = setting("shared_token_cache_slots", 65536)
+
+
+class InvalidationConfig:
+    # Transports broadcasting token changes to other workers and nodes, any of
+    # "unix" (workers on this host), "multicast" and "http" (peers); empty disables it
+    TRANSPORTS: list[str] = setting("invalidation_transports", [])
+    # Unix datagram sockets of the workers (default: a directory in /dev/shm per config file)
+    SOCKET_DIR: str | None = setting("invalidation_socket_dir", None)
+    MULTICAST_GROUP: str = setting("invalidation_multicast_group", "239.255.70.65")
+    MULTICAST_PORT: int = setting("invalidation_multicast_port", 47565)
+    MULTICAST_TTL: int = setting("invalidation_multicast_ttl", 1)
+    # `POST /auth/invalidate` URLs of the other nodes for the "http" transport
+    PEERS: list[str] = setting("invalidation_peers", [])
+    HTTP_TIMEOUT: float = setting("invalidation_http_timeout", 2.0)
+    # Signed messages older than this (seconds) are rejected
+    MAX_AGE: float = setting("invalidation_max_age", 30.0)
+
+
+class MetricsConfig:
+    # Auth stage timings and counters, served as Prometheus text at `/auth/metrics`
+    ENABLED: bool = setting("metrics", False)
@@ -0,0 +1,9 @@
+from .metrics import (
+    registry,
+    observe_database,
+    record_outcome,
+    MASTER_SECONDS,
+    DECODE_SECONDS,
+    LOOKUP_SECONDS,
+    TOTAL_SECONDS,
+)
@@ -0,0 +1,335 @@
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Awaitable, Callable, TypeVar
+from ..config import MetricsConfig
+
+T = TypeVar("T")
+
+# Seconds; auth stages range from sub-microsecond (master check) to database round trips
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+class HistogramChild:
+    """Bucket counts, sum and count of one label set of a `Histogram`."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets: tuple[float, ...] = buckets
+        # One slot per bucket plus the +Inf bucket, not cumulative
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class CounterChild:
+    """Value of one label set of a `Counter`."""
+
+    def __init__(self):
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class Metric(ABC):
+    """A named metric with one child per label set, rendered in the Prometheus text format."""
+
+    kind: str = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name: str = name
+        self.help: str = help
+        self.label_names: tuple[str, ...] = labels
+        self.children: dict[tuple[str, ...], HistogramChild | CounterChild] = {}
+
+    def labels(self, *values: str):
+        """The child for these label values; hot paths should keep the returned child."""
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}")
+            child = self.children[values] = self._child()
+        return child
+
+    @abstractmethod
+    def _child(self) -> HistogramChild | CounterChild:
+        """A new child, for a label set seen for the first time."""
+
+    def _labels(self, values: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self.children.items():
+            lines.extend(self._samples(values, child))
+        return lines
+
+    @abstractmethod
+    def _samples(self, values, child) -> list[str]:
+        """The sample lines of `child`, labelled with `values`."""
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets: tuple[float, ...] = buckets
+
+    def _child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def _samples(self, values, child: HistogramChild) -> list[str]:
+        lines: list[str] = []
+        cumulative: int = 0
+        for bound, count in zip((*self.buckets, "+Inf"), child.counts):
+            cumulative += count
+            le: str = bound if isinstance(bound, str) else _number(bound)
+            labels: str = self._labels(values, 'le="' + le + '"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        lines.append(f"{self.name}_sum{self._labels(values)} {_number(child.sum)}")
+        lines.append(f"{self.name}_count{self._labels(values)} {child.count}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _child(self) -> CounterChild:
+        return CounterChild()
+
+    def _samples(self, values, child: CounterChild) -> list[str]:
+        return [f"{self.name}{self._labels(values)} {_number(child.value)}"]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class Registry:
+    """
+    Metrics rendered together. Collectors run before each render, to copy values
+    kept elsewhere (cache statistics, ...) into their metrics.
+    """
+
+    def __init__(self):
+        self.metrics: list[Metric] = []
+        self.collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def collector(self, collect: Callable[[], None]) -> Callable[[], None]:
+        self.collectors.append(collect)
+        return collect
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        for collect in self.collectors:
+            collect()
+        lines: list[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry: Registry = Registry()
+
+auth_stage_seconds: Histogram = registry.register(
+    Histogram(
+        "fastauth_auth_stage_seconds",
+        "Time spent in each stage of the token checks.",
+        labels=("stage",),
+    )
+)
+auth_outcomes: Counter = registry.register(
+    Counter(
+        "fastauth_auth_outcomes_total",
+        "Token checks by check and outcome (ok or the 401 reason).",
+        labels=("check", "outcome"),
+    )
+)
+database_seconds: Histogram = registry.register(
+    Histogram(
+        "fastauth_database_request_seconds",
+        "Latency of token store operations made by client_db.",
+        labels=("operation",),
+    )
+)
+database_errors: Counter = registry.register(
+    Counter(
+        "fastauth_database_errors_total",
+        "Failed token store operations made by client_db.",
+        labels=("operation",),
+    )
+)
+
+MASTER_SECONDS: HistogramChild = auth_stage_seconds.labels("master")
+DECODE_SECONDS: HistogramChild = auth_stage_seconds.labels("decode")
+LOOKUP_SECONDS: HistogramChild = auth_stage_seconds.labels("lookup")
+TOTAL_SECONDS: HistogramChild = auth_stage_seconds.labels("total")
+
+cache_entries: Gauge = registry.register(
+    Gauge("fastauth_cache_entries", "Entries held by each cache.", labels=("cache",))
+)
+cache_requests: Counter = registry.register(
+    Counter(
+        "fastauth_cache_requests_total",
+        "Cache reads by cache and result (hit, miss, or stale: served in grace during an outage).",
+        labels=("cache", "result"),
+    )
+)
+database_saved: Counter = registry.register(
+    Counter(
+        "fastauth_database_lookups_saved_total",
+        "Token lookups answered by a concurrent lookup for the same client_id.",
+    )
+)
+database_batches: Counter = registry.register(
+    Counter("fastauth_database_batches_total", "Batched token lookups sent to the token store.")
+)
+database_batched_keys: Counter = registry.register(
+    Counter("fastauth_database_batched_keys_total", "Client ids carried by batched lookups.")
+)
+revoked_tokens: Gauge = registry.register(
+    Gauge("fastauth_revoked_tokens", "Unexpired token ids in the revocation list.")
+)
+websocket_sessions_open: Gauge = registry.register(
+    Gauge("fastauth_websocket_sessions", "Open WebSocket sessions tracked for token expiry.")
+)
+websocket_sessions_closed: Counter = registry.register(
+    Counter(
+        "fastauth_websocket_sessions_closed_total",
+        "WebSocket sessions closed by the registry, by reason (expired or superseded).",
+        labels=("reason",),
+    )
+)
+
+
+invalidations: Counter = registry.register(
+    Counter(
+        "fastauth_invalidation_messages_total",
+        "Invalidation bus messages, by direction (sent, received or rejected).",
+        labels=("direction",),
+    )
+)
+breaker_state: Gauge = registry.register(
+    Gauge(
+        "fastauth_database_circuit_state",
+        "Token store circuit breaker state (0: closed, 1: half-open, 2: open).",
+    )
+)
+breaker_rejected: Counter = registry.register(
+    Counter(
+        "fastauth_database_circuit_rejected_total",
+        "Token store calls failed fast by the open circuit breaker.",
+    )
+)
+BREAKER_STATES: dict[str, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+
+@registry.collector
+def collect_client_stats() -> None:
+    # Imported here: client_db reports to this module and imports it first
+    from ..client_db.cache import token_cache
+    from ..client_db.client_db import token_lookups, token_batches
+    from ..client_db.revocation import revocation_list
+    from ..client_db.sessions import websocket_sessions
+    from ..client_db.shared_cache import shared_tokens
+    from ..client_db.invalidation import invalidation_bus
+    from ..client_db.breaker import database_breaker
+    from ..utils.decoded_cache import decoded_tokens
+
+    for cache, stats in (("token", token_cache.stats()), ("decoded", decoded_tokens.stats())):
+        cache_entries.labels(cache).value = stats["size"]
+        cache_requests.labels(cache, "hit").value = stats["hits"]
+        cache_requests.labels(cache, "miss").value = stats["misses"]
+    cache_requests.labels("token", "stale").value = token_cache.stats()["stale"]
+    if shared_tokens.enabled:
+        shared: dict = shared_tokens.stats()
+        cache_requests.labels("shared", "hit").value = shared["hits"]
+        cache_requests.labels("shared", "miss").value = shared["misses"]
+
+    database_saved.labels().value = token_lookups.stats()["saved"]
+    batches: dict = token_batches.stats()
+    database_batches.labels().value = batches["batches"]
+    database_batched_keys.labels().value = batches["keys"]
+    revoked_tokens.labels().value = len(revocation_list)
+    breaker: dict = database_breaker.stats()
+    breaker_state.labels().value = BREAKER_STATES[breaker["state"]]
+    breaker_rejected.labels().value = breaker["rejected"]
+    if invalidation_bus.enabled:
+        for direction, count in invalidation_bus.stats().items():
+            invalidations.labels(direction).value = count
+    sessions: dict = websocket_sessions.stats()
+    websocket_sessions_open.labels().value = sessions["sessions"]
+    websocket_sessions_closed.labels("expired").value = sessions["expired"]
+    websocket_sessions_closed.labels("superseded").value = sessions["superseded"]
+
+
+def record_outcome(check: str, outcome: str) -> None:
+    if MetricsConfig.ENABLED:
+        auth_outcomes.labels(check, outcome).inc()
+
+
+async def observe_database(operation: str, call: Awaitable[T]) -> T:
+    """
+    Await a token store operation, recording its latency and whether it failed.
+    A raised exception or a `False` result (how `save` / `revoke` report failures)
+    counts as an error.
+    """
+    if not MetricsConfig.ENABLED:
+        return await call
+
+    start: float = time.perf_counter()
+    try:
+        result = await call
+    except Exception:
+        database_errors.labels(operation).inc()
+        raise
+    finally:
+        database_seconds.labels(operation).observe(time.perf_counter() - start)
+    if result is False:
+        database_errors.labels(operation).inc()
+    return result
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -1,2 +1,3 @@
 from .middleware import AccessTokenMiddleware
+from .asgi import AccessTokenASGIMiddleware
 from .websocket import websocket_middleware,TokenType
\ No newline at end of file
@@ -0,0 +1,123 @@
+import json
+import time
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .checks import (
+    check_master,
+    check_access,
+    required_tokens,
+    UNAUTHORIZED_MASTER_TOKEN,
+    NULL_ACCESS_TOKEN,
+    INVALID_ACCESS_TOKEN,
+    INVALID_CLIENT_ID,
+    UNAUTHORIZED_ACCESS_TOKEN,
+    DATABASE_UNAVAILABLE,
+    failure_status,
+)
+from .policy import AuthRequirement
+from ..config import log_request_path, MetricsConfig
+from ..metrics import TOTAL_SECONDS
+
+MASTER_TOKEN_HEADER = b"master-token"
+ACCESS_TOKEN_HEADER = b"access-token"
+
+
+def _json_body(detail: str) -> bytes:
+    # Same encoding as `starlette.responses.JSONResponse`
+    return json.dumps(
+        {"detail": detail},
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+UNAUTHORIZED_BODIES: dict[str, bytes] = {
+    detail: _json_body(detail)
+    for detail in (
+        UNAUTHORIZED_MASTER_TOKEN,
+        NULL_ACCESS_TOKEN,
+        INVALID_ACCESS_TOKEN,
+        INVALID_CLIENT_ID,
+        UNAUTHORIZED_ACCESS_TOKEN,
+        DATABASE_UNAVAILABLE,
+    )
+}
+
+
+class AccessTokenASGIMiddleware:
+    """
+    AccessTokenASGIMiddleware: pure ASGI variant of `AccessTokenMiddleware`.
+
+    Enforces exactly the same master and access token checks and answers with the
+    same 401 JSON bodies, but without Starlette's `BaseHTTPMiddleware` machinery
+    (no task group, no request/response stream wrapping):
+
+    - Headers are read straight from `scope["headers"]`; no `Request` is built.
+    - Failures are answered with prebuilt 401 bodies.
+    - Unprotected paths, websocket and lifespan scopes are forwarded untouched,
+      so streaming responses behave as if the middleware was not installed.
+
+    Enable it with `"asgi_middleware": true` in the settings, or add it directly:
+    ```python
+    app.add_middleware(AccessTokenASGIMiddleware)
+    ```
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        log_request_path(path)
+
+        start: float = time.perf_counter() if MetricsConfig.ENABLED else 0.0
+        detail: str | None = await self.__check(scope, path)
+        if start:
+            TOTAL_SECONDS.observe(time.perf_counter() - start)
+
+        if detail is not None:
+            await unauthorized(send, detail)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def __check(self, scope: Scope, path: str) -> str | None:
+        requirement: AuthRequirement = required_tokens(path, scope["method"])
+        if not requirement:
+            return None
+
+        master_token: str | None = None
+        access_token: str | None = None
+        for name, value in scope["headers"]:
+            if name == MASTER_TOKEN_HEADER:
+                master_token = value.decode("latin-1")
+            elif name == ACCESS_TOKEN_HEADER:
+                access_token = value.decode("latin-1")
+
+        detail: str | None = None
+        if requirement & AuthRequirement.MASTER:
+            detail = check_master(master_token)
+        if detail is None and requirement & AuthRequirement.ACCESS:
+            detail = await check_access(access_token)
+        return detail
+
+
+async def unauthorized(send: Send, detail: str) -> None:
+    body: bytes = UNAUTHORIZED_BODIES.get(detail) or _json_body(detail)
+    await send(
+        {
+            "type": "http.response.start",
+            "status": failure_status(detail),
+            "headers": [
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"content-type", b"application/json"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
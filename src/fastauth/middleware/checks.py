@@ -0,0 +1,131 @@
+import time
+from http import HTTPStatus
+from .policy import AuthRequirement, active_policy
+from ..config import ConfigServer, TokenConfig, MetricsConfig
+from ..metrics import record_outcome, MASTER_SECONDS, DECODE_SECONDS, LOOKUP_SECONDS
+from ..utils import TokenCriptografy
+from ..client_db.revocation import revocation_list
+from ..client_db.client_db import verify_access_token
+from ..client_db.stores import DatabaseError
+
+UNAUTHORIZED_MASTER_TOKEN = "Unauthorized Master Token"
+NULL_ACCESS_TOKEN = "Invalid Access Token. Access Token is null"
+INVALID_ACCESS_TOKEN = "Invalid Access Token"
+INVALID_CLIENT_ID = "Invalid Client ID"
+UNAUTHORIZED_ACCESS_TOKEN = "Unauthorized Access Token"
+DATABASE_UNAVAILABLE = "Token database unavailable"
+
+
+def failure_status(detail: str) -> HTTPStatus:
+    """HTTP status of a failed check: 503 when the token store could not answer, else 401."""
+    if detail == DATABASE_UNAVAILABLE:
+        return HTTPStatus.SERVICE_UNAVAILABLE
+    return HTTPStatus.UNAUTHORIZED
+
+
+def required_tokens(path: str, method: str | None = None) -> AuthRequirement:
+    return active_policy().lookup(path, method)
+
+
+def require_master_path(path: str, method: str | None = None) -> bool:
+    return bool(required_tokens(path, method) & AuthRequirement.MASTER)
+
+
+def require_access_path(path: str, method: str | None = None) -> bool:
+    return bool(required_tokens(path, method) & AuthRequirement.ACCESS)
+
+
+def check_master(master_token: str | None) -> str | None:
+    """
+    Validate a MASTER-TOKEN header value against `ConfigServer.MASTER_TOKEN`.
+
+    Returns:
+        str | None: The 401 detail message on failure, None if the token is valid.
+    """
+    if not MetricsConfig.ENABLED:
+        return _check_master(master_token)
+
+    start: float = time.perf_counter()
+    detail: str | None = _check_master(master_token)
+    MASTER_SECONDS.observe(time.perf_counter() - start)
+    record_outcome("master", "ok" if detail is None else "unauthorized")
+    return detail
+
+
+def _check_master(master_token: str | None) -> str | None:
+    required_token: str = ConfigServer.MASTER_TOKEN
+    if master_token != required_token or master_token is None:
+        return UNAUTHORIZED_MASTER_TOKEN
+    return None
+
+
+async def check_access(access_token: str | None) -> str | None:
+    """
+    Validate an ACCESS-TOKEN header value: decode it and compare it with the
+    canonical token stored for its `client_id` (by digest, through the shared token
+    cache, when `shared_token_cache` is enabled).
+
+    With `TokenConfig.STATELESS` enabled, a token carrying a `jti` claim is accepted on
+    its signature, `exp` and `type` alone, unless its `jti` is in the revocation list;
+    no database lookup is made. Tokens issued without `jti` still go through the lookup.
+
+    When the token store is down (or its circuit is open) and the client's token is
+    not cached, not even within `token_cache_grace`, the check fails with
+    `DATABASE_UNAVAILABLE`, answered with 503 rather than 401 (`failure_status`).
+
+    With `MetricsConfig.ENABLED`, decode and lookup times and the outcome (ok or the
+    401 reason) are recorded in `fastauth.metrics`.
+
+    Returns:
+        str | None: The 401 (or 503) detail message on failure, None if the token is valid.
+    """
+    if access_token is None:
+        record_outcome("access", "null_token")
+        return NULL_ACCESS_TOKEN
+
+    metrics: bool = MetricsConfig.ENABLED
+    start: float = time.perf_counter() if metrics else 0.0
+    payload: dict = {}
+    try:
+        payload = TokenCriptografy.decode(access_token)
+    except Exception as e:
+        record_outcome("access", "decode_error")
+        return f"{INVALID_ACCESS_TOKEN}. Error: {e}"
+    finally:
+        if metrics:
+            DECODE_SECONDS.observe(time.perf_counter() - start)
+
+    client_id: str | None = payload.get("client_id")
+    jti: str | None = payload.get("jti")
+    if TokenConfig.STATELESS and jti is not None:
+        if client_id is None or payload.get("type") != "access":
+            record_outcome("access", "invalid_token")
+            return INVALID_ACCESS_TOKEN
+        if revocation_list.is_revoked(jti):
+            record_outcome("access", "revoked")
+            return UNAUTHORIZED_ACCESS_TOKEN
+        record_outcome("access", "ok")
+        return None
+
+    if metrics:
+        start = time.perf_counter()
+    try:
+        matches: bool | None = await verify_access_token(client_id, access_token)
+    except DatabaseError:
+        record_outcome("access", "database_unavailable")
+        return DATABASE_UNAVAILABLE
+    finally:
+        if metrics:
+            LOOKUP_SECONDS.observe(time.perf_counter() - start)
+
+    if matches is None:
+        record_outcome("access", "invalid_client")
+        return INVALID_CLIENT_ID
+    if client_id is None:
+        record_outcome("access", "invalid_token")
+        return INVALID_ACCESS_TOKEN
+    if not matches:
+        record_outcome("access", "mismatch")
+        return UNAUTHORIZED_ACCESS_TOKEN
+    record_outcome("access", "ok")
+    return None
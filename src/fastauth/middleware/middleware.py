@@ -1,11 +1,19 @@
+import time
 from fastapi import Request
-from http import HTTPStatus
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response, JSONResponse
 
-from .utils import Params, get_access_token
-from ..config import logger, ConfigServer
-from ..utils import TokenCriptografy
+from .checks import (
+    check_master,
+    check_access,
+    required_tokens,
+    require_master_path,
+    require_access_path,
+    failure_status,
+)
+from .policy import AuthRequirement
+from ..config import log_request_path, MetricsConfig
+from ..metrics import TOTAL_SECONDS
 
 
 class AccessTokenMiddleware(BaseHTTPMiddleware):
@@ -16,13 +24,15 @@ class AccessTokenMiddleware(BaseHTTPMiddleware):
     authorization checks when applicable:
 
     ### 1. Master token check
-        - Trigger: require_master_token(request) returns True.
+        - Trigger: the request path and method match a master rule
+          (`ConfigServer.MASTER_PATHS`, `master_token_paths`).
         - Expected header: "MASTER-TOKEN".
         - Validation: header value is compared to ConfigServer.MASTER_TOKEN.
         - Failure: returns a JSONResponse with HTTP 401 and detail "Unauthorized Master Token".
 
     ### 2. Access token check
-        - Trigger: require_access_token(request) returns True.
+        - Trigger: the request path and method match an access rule
+          (`ConfigServer.ACCESS_TOKEN_PATHS`, `access_token_paths`).
         - Expected header: "ACCESS-TOKEN".
         - Validation flow:
              a. If the header is missing, returns HTTP 401 with detail
@@ -31,16 +41,23 @@ class AccessTokenMiddleware(BaseHTTPMiddleware):
                  decoding error is caught and returned as HTTP 401 with the error text.
              c. The decoded payload must contain "client_id". If missing, returns
                  HTTP 401 with detail "Invalid Access Token".
-             d. The middleware retrieves the canonical token for the client via
-                 get_access_token(client_id). If that returns None, returns HTTP 401
-                 with detail "Invalid Client ID".
+             d. The token is checked against the canonical token of the client via
+                 verify_access_token(client_id, access_token). If the client is
+                 unknown, returns HTTP 401 with detail "Invalid Client ID". If the
+                 token store is unavailable and no token of the client is cached,
+                 returns HTTP 503 with detail "Token database unavailable".
              e. If the canonical token does not exactly match the provided access
                  token, returns HTTP 401 with detail "Unauthorized Access Token".
 
+    Which checks apply is answered by one lookup in the compiled `PathPolicy`
+    (see `middleware/policy.py`); a path matching both kinds of rules gets both.
+
     ### Behavior
     - If neither check applies or both checks pass, the request is forwarded to
       the downstream handler by awaiting call_next(request).
-    - The middleware logs incoming request paths (via logger.info).
+    - The middleware logs incoming request paths (via log_request_path, see `LogConfig`).
+    - With `MetricsConfig.ENABLED`, the time spent in the checks is recorded as the
+      "total" stage of `fastauth_auth_stage_seconds`.
     - Token decoding exceptions are handled and converted to HTTP 401 responses;
       they do not propagate.
 
@@ -49,7 +66,8 @@ class AccessTokenMiddleware(BaseHTTPMiddleware):
       - request: Starlette/FastAPI Request instance.
       - call_next: callable that receives the request and returns a Response (awaitable).
       - Returns: a Response instance. On authorization failure, returns a JSONResponse
-         with status code 401 and a JSON body containing a "detail" message.
+         with status code 401 (503 when the token store is unavailable) and a JSON
+         body containing a "detail" message.
 
     ### Notes and considerations
     - This middleware is asynchronous and intended for ASGI apps (e.g., FastAPI).
@@ -58,81 +76,57 @@ class AccessTokenMiddleware(BaseHTTPMiddleware):
     """
 
     async def dispatch(self, req: Request, call_next) -> Response:
-        logger.info(f"Request Path: {req.url.path}")
+        log_request_path(req.url.path)
+
+        start: float = time.perf_counter() if MetricsConfig.ENABLED else 0.0
+        denied: Response | None = await self.__check(req)
+        if start:
+            TOTAL_SECONDS.observe(time.perf_counter() - start)
+        if denied is not None:
+            return denied
+
+        return await call_next(req)
 
-        check_master: Response | None = self.__check_master(req=req)
+    async def __check(self, req: Request) -> Response | None:
+        requirement: AuthRequirement = required_tokens(req.url.path, req.method)
+
+        check_master: Response | None = self.__check_master(req, requirement)
         if check_master is not None:
             return check_master
 
-        check_access: Response | None = self.__check_access(req=req)
-        if check_access is not None:
-            return check_access
+        return await self.__check_access(req, requirement)
 
-        return await call_next(req)
+    def __check_master(
+        self, req: Request, requirement: AuthRequirement
+    ) -> Response | None:
+        if requirement & AuthRequirement.MASTER:
+            detail: str | None = check_master(req.headers.get("MASTER-TOKEN"))
+            if detail is not None:
+                return unauthorized(detail)
 
-    def __check_master(self, req: Request) -> Response | None:
-        if require_master_token(req):
-            master_token: str = req.headers.get("MASTER-TOKEN")
-            required_token: str = ConfigServer.MASTER_TOKEN
+        return None
 
-            if master_token != required_token or master_token is None:
-                return JSONResponse(
-                    content={"detail": "Unauthorized Master Token"},
-                    status_code=HTTPStatus.UNAUTHORIZED,
-                )
+    async def __check_access(
+        self, req: Request, requirement: AuthRequirement
+    ) -> Response | None:
+        if requirement & AuthRequirement.ACCESS:
+            detail: str | None = await check_access(req.headers.get("ACCESS-TOKEN"))
+            if detail is not None:
+                return unauthorized(detail)
 
         return None
 
-    def __check_access(self, req: Request) -> Response | None:
-        if require_access_token(req):
-            # client_id: str | None = Params(req).get_param("client_id")
-            access_token: str = req.headers.get("ACCESS-TOKEN")
-            if access_token is None:
-                return JSONResponse(
-                    content={"detail": "Invalid Access Token. Access Token is null"},
-                    status_code=HTTPStatus.UNAUTHORIZED,
-                )
-            payload: dict = {}
-            try:
-                payload = TokenCriptografy.decode(access_token)
-            except Exception as e:
-                return JSONResponse(
-                    content={"detail": f"Invalid Access Token. Error: {e}"},
-                    status_code=HTTPStatus.UNAUTHORIZED,
-                )
-
-            client_id: str | None = payload.get("client_id")
-            required_token: str = get_access_token(client_id)
-
-            if required_token is None:
-                return JSONResponse(
-                    content={"detail": "Invalid Client ID"},
-                    status_code=HTTPStatus.UNAUTHORIZED,
-                )
-            if client_id is None:
-                return JSONResponse(
-                    content={"detail": "Invalid Access Token"},
-                    status_code=HTTPStatus.UNAUTHORIZED,
-                )
-
-            if required_token != access_token:
-                return JSONResponse(
-                    content={"detail": "Unauthorized Access Token"},
-                    status_code=HTTPStatus.UNAUTHORIZED,
-                )
 
-        return None
+def unauthorized(detail: str) -> Response:
+    return JSONResponse(
+        content={"detail": detail},
+        status_code=failure_status(detail),
+    )
 
 
 def require_master_token(req: Request) -> bool:
-    for path in ConfigServer.MASTER_PATHS:
-        if req.url.path.startswith(path):
-            return True
-    return False
+    return require_master_path(req.url.path, req.method)
 
 
 def require_access_token(req: Request) -> bool:
-    for path in ConfigServer.ACCESS_TOKEN_PATHS:
-        if req.url.path.startswith(path):
-            return True
-    return False
+    return require_access_path(req.url.path, req.method)
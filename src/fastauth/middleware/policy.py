@@ -0,0 +1,183 @@
+import re
+import fnmatch
+from enum import IntFlag
+from ..config import ConfigServer
+from .templates import may_match
+
+METHODS_RULE = re.compile(r"^([A-Za-z]+(?:\s*,\s*[A-Za-z]+)*)\s+(\S.*)$")
+GLOB_CHARS = ("*", "?", "[")
+
+
+class AuthRequirement(IntFlag):
+    NONE = 0
+    MASTER = 1
+    ACCESS = 2
+
+
+_REQUIREMENTS: tuple[AuthRequirement, ...] = tuple(AuthRequirement(i) for i in range(4))
+
+
+class _Node:
+    __slots__ = ("children", "any_method", "methods")
+
+    def __init__(self):
+        # first char of the edge label -> (edge label, child node)
+        self.children: dict[str, tuple[str, "_Node"]] = {}
+        self.any_method: int = 0
+        self.methods: dict[str, int] | None = None
+
+
+class PathPolicy:
+    """
+    Compiled index of the protected paths in `ConfigServer.MASTER_PATHS` and
+    `ConfigServer.ACCESS_TOKEN_PATHS`.
+
+    Plain prefixes are stored in a radix tree, so `lookup` walks the request path
+    once no matter how many prefixes are configured, and answers which tokens the
+    path requires (`AuthRequirement.MASTER`, `AuthRequirement.ACCESS`, both or `NONE`).
+
+    ### Rule syntax
+    - `"/admin"`: prefix, as before (`path.startswith("/admin")`).
+    - `"/files/*/private"`: glob (`*`, `?`, `[...]`) matched against the whole path.
+    - `"re:^/v[0-9]+/billing"`: regular expression matched at the start of the path.
+    - `"POST /items"`, `"PUT,DELETE re:^/items/[0-9]+$"`: any of the above restricted
+      to the given HTTP methods.
+
+    Glob and regex rules are checked one by one after the tree walk, so keep them
+    for the cases prefixes cannot express.
+
+    `lookup_template` answers the same question for OpenAPI path templates
+    (`/items/{id}`), which rules written against request paths may not match as is.
+    """
+
+    def __init__(self, master_paths: list[str], access_paths: list[str]):
+        self.__root: _Node = _Node()
+        self.__patterns: list[tuple[re.Pattern, frozenset[str] | None, int]] = []
+        # Every rule as a pattern, prefixes included, for `lookup_template`
+        self.__rules: list[tuple[re.Pattern, frozenset[str] | None, int]] = []
+        for rule in master_paths:
+            self.__add(rule, AuthRequirement.MASTER)
+        for rule in access_paths:
+            self.__add(rule, AuthRequirement.ACCESS)
+
+    def lookup(self, path: str, method: str | None = None) -> AuthRequirement:
+        flags: int = 0
+        node: _Node = self.__root
+        pos: int = 0
+        end: int = len(path)
+        while True:
+            flags |= node.any_method
+            if node.methods is not None and method is not None:
+                flags |= node.methods.get(method, 0)
+            if pos >= end:
+                break
+            edge = node.children.get(path[pos])
+            if edge is None or not path.startswith(edge[0], pos):
+                break
+            pos += len(edge[0])
+            node = edge[1]
+
+        for pattern, methods, flag in self.__patterns:
+            if flags & flag or (methods is not None and method not in methods):
+                continue
+            if pattern.match(path):
+                flags |= flag
+
+        return _REQUIREMENTS[flags]
+
+    def lookup_template(self, template: str, method: str | None = None) -> AuthRequirement:
+        """
+        `lookup` for an OpenAPI path template: a rule applies if it matches some
+        request path of the template, each `{param}` standing for any single segment
+        (see `templates.may_match`). Used to document the operations' security, not
+        on the request path.
+        """
+        if "{" not in template:
+            return self.lookup(template, method)
+        flags: int = 0
+        for pattern, methods, flag in self.__rules:
+            if flags & flag or (methods is not None and method not in methods):
+                continue
+            if may_match(pattern, template):
+                flags |= flag
+        return _REQUIREMENTS[flags]
+
+    def __add(self, rule: str, requirement: AuthRequirement) -> None:
+        # Plain ints inside the index: IntFlag arithmetic is much slower
+        flag: int = int(requirement)
+        methods: frozenset[str] | None = None
+        match = METHODS_RULE.match(rule)
+        if match is not None:
+            methods = frozenset(m.strip().upper() for m in match.group(1).split(","))
+            rule = match.group(2)
+
+        if rule.startswith("re:"):
+            self.__patterns.append((re.compile(rule[3:]), methods, flag))
+        elif any(char in rule for char in GLOB_CHARS):
+            self.__patterns.append(
+                (re.compile(fnmatch.translate(rule)), methods, flag)
+            )
+        else:
+            self.__insert(rule, methods, flag)
+            self.__rules.append((re.compile(re.escape(rule)), methods, flag))
+            return
+        self.__rules.append(self.__patterns[-1])
+
+    def __insert(self, prefix: str, methods: frozenset[str] | None, flag: int) -> None:
+        node: _Node = self.__root
+        pos: int = 0
+        while pos < len(prefix):
+            edge = node.children.get(prefix[pos])
+            if edge is None:
+                child = _Node()
+                node.children[prefix[pos]] = (prefix[pos:], child)
+                node = child
+                break
+
+            label, child = edge
+            common: int = 0
+            limit: int = min(len(label), len(prefix) - pos)
+            while common < limit and label[common] == prefix[pos + common]:
+                common += 1
+
+            if common < len(label):
+                # Split the edge so the new prefix ends (or branches) on a node
+                middle = _Node()
+                middle.children[label[common]] = (label[common:], child)
+                node.children[prefix[pos]] = (label[:common], middle)
+                child = middle
+
+            node = child
+            pos += common
+
+        if methods is None:
+            node.any_method |= flag
+            return
+        if node.methods is None:
+            node.methods = {}
+        for method in methods:
+            node.methods[method] = node.methods.get(method, 0) | flag
+
+
+_active_policy: PathPolicy | None = None
+
+
+def compile_policy() -> PathPolicy:
+    """Compile the current `ConfigServer` path lists and make them the active policy."""
+    global _active_policy
+    _active_policy = PathPolicy(
+        master_paths=ConfigServer.MASTER_PATHS,
+        access_paths=ConfigServer.ACCESS_TOKEN_PATHS,
+    )
+    return _active_policy
+
+
+def install_policy(policy: PathPolicy) -> None:
+    """Make an already compiled `policy` the active one (config hot reload)."""
+    global _active_policy
+    _active_policy = policy
+
+
+def active_policy() -> PathPolicy:
+    """Return the policy compiled by `Fastauth.set_auth`, compiling it on first use otherwise."""
+    return _active_policy if _active_policy is not None else compile_policy()
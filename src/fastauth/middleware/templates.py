@@ -0,0 +1,203 @@
+import re
+import string
+from re import _parser
+
+# Characters tried for a path parameter; a segment is one or more of them
+SEGMENT_CHARS: str = string.ascii_letters + string.digits + "-._~%:@!$&'()*+,;=é"
+# Repeats with a wider range are expanded as unbounded (they may then match more)
+REPEAT_LIMIT: int = 32
+
+PARAM = re.compile(r"\{[^{}/:]+(:[^{}]+)?\}")
+
+# Token kinds of a path template
+SEGMENT: int = 0  # {param}: one or more characters other than "/"
+SUBPATH: int = 1  # {param:path}: one or more characters, "/" included
+
+# Edge kinds of the automaton
+_CHAR, _EPSILON, _BEGIN, _END = range(4)
+
+_CATEGORIES: dict = {
+    _parser.CATEGORY_DIGIT: re.compile(r"\d"),
+    _parser.CATEGORY_NOT_DIGIT: re.compile(r"\D"),
+    _parser.CATEGORY_WORD: re.compile(r"\w"),
+    _parser.CATEGORY_NOT_WORD: re.compile(r"\W"),
+    _parser.CATEGORY_SPACE: re.compile(r"\s"),
+    _parser.CATEGORY_NOT_SPACE: re.compile(r"\S"),
+}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def may_match(pattern: re.Pattern, template: str) -> bool:
+    """
+    Whether `pattern.match` accepts some request path of the OpenAPI path
+    `template` (`/items/{id}`), each `{param}` standing for any single segment and
+    each `{param:path}` for any sub-path.
+
+    The pattern is compiled into a small automaton run over the template, so a glob
+    such as `/items/*` is found to protect `/items/{id}` although it does not match
+    the template string itself. Constructs the automaton does not model (lookarounds,
+    backreferences) are assumed to match.
+    """
+    try:
+        automaton = _Automaton(pattern)
+    except _Unsupported:
+        return True
+    return automaton.run(_tokens(template))
+
+
+def _tokens(template: str) -> list:
+    tokens: list = []
+    pos: int = 0
+    for match in PARAM.finditer(template):
+        tokens.extend(template[pos : match.start()])
+        tokens.append(SUBPATH if match.group(1) == ":path" else SEGMENT)
+        pos = match.end()
+    tokens.extend(template[pos:])
+    return tokens
+
+
+class _Automaton:
+    """Thompson automaton of a parsed regular expression, over single characters."""
+
+    def __init__(self, pattern: re.Pattern):
+        self.ignore_case: bool = bool(pattern.flags & re.IGNORECASE)
+        self.edges: list[list[tuple[int, object, int]]] = [[]]
+        self.accept: int = self.__sequence(_parser.parse(pattern.pattern, pattern.flags), 0)
+
+    def run(self, tokens: list) -> bool:
+        states: set[int] = self.__closure({0}, begin=True, end=not tokens)
+        for index, token in enumerate(tokens):
+            if self.accept in states:
+                return True
+            end: bool = index == len(tokens) - 1
+            if isinstance(token, str):
+                states = self.__closure(self.__step(states, lambda test: test(token)), end=end)
+                continue
+
+            # A parameter: one or more characters, each any allowed one
+            chars: str = SEGMENT_CHARS if token == SEGMENT else SEGMENT_CHARS + "/"
+            step = lambda test: any(test(char) for char in chars)  # noqa: E731
+            reached: set[int] = set()
+            frontier: set[int] = states
+            while frontier:
+                frontier = self.__closure(self.__step(frontier, step)) - reached
+                reached |= frontier
+            states = self.__closure(reached, end=end) if end else reached
+            if not states:
+                return False
+        return self.accept in states
+
+    def __step(self, states: set[int], accepts) -> set[int]:
+        return {
+            target
+            for state in states
+            for kind, test, target in self.edges[state]
+            if kind == _CHAR and accepts(test)
+        }
+
+    def __closure(self, states: set[int], begin: bool = False, end: bool = False) -> set[int]:
+        stack: list[int] = list(states)
+        reached: set[int] = set(states)
+        while stack:
+            for kind, _, target in self.edges[stack.pop()]:
+                if target in reached:
+                    continue
+                if kind == _EPSILON or (kind == _BEGIN and begin) or (kind == _END and end):
+                    reached.add(target)
+                    stack.append(target)
+        return reached
+
+    def __state(self) -> int:
+        self.edges.append([])
+        return len(self.edges) - 1
+
+    def __edge(self, source: int, kind: int, test=None, target: int | None = None) -> int:
+        if target is None:
+            target = self.__state()
+        self.edges[source].append((kind, test, target))
+        return target
+
+    def __sequence(self, items, state: int) -> int:
+        for op, av in items:
+            state = self.__node(op, av, state)
+        return state
+
+    def __node(self, op, av, state: int) -> int:
+        if op in (_parser.LITERAL, _parser.NOT_LITERAL, _parser.ANY, _parser.IN):
+            return self.__edge(state, _CHAR, self.__test(op, av))
+        if op is _parser.AT:
+            if av in (_parser.AT_BEGINNING, _parser.AT_BEGINNING_STRING):
+                return self.__edge(state, _BEGIN)
+            if av in (_parser.AT_END, _parser.AT_END_STRING):
+                return self.__edge(state, _END)
+            return state  # word boundaries: assumed to hold
+        if op is _parser.SUBPATTERN:
+            return self.__sequence(av[3], state)
+        if op is _parser.ATOMIC_GROUP:
+            return self.__sequence(av, state)
+        if op is _parser.BRANCH:
+            end: int = self.__state()
+            for alternative in av[1]:
+                self.__edge(self.__sequence(alternative, state), _EPSILON, target=end)
+            return end
+        if op in (_parser.MAX_REPEAT, _parser.MIN_REPEAT, _parser.POSSESSIVE_REPEAT):
+            return self.__repeat(*av, state)
+        if op in (_parser.ASSERT, _parser.ASSERT_NOT):
+            return state  # lookarounds: assumed to hold
+        if op is _parser.GROUPREF:
+            # Any text, as the group may have captured
+            loop: int = self.__edge(state, _EPSILON)
+            self.__edge(loop, _CHAR, lambda char: True, loop)
+            return loop
+        if op is _parser.GROUPREF_EXISTS:
+            end = self.__state()
+            self.__edge(self.__sequence(av[1], state), _EPSILON, target=end)
+            self.__edge(self.__sequence(av[2] or [], state), _EPSILON, target=end)
+            return end
+        raise _Unsupported(op)
+
+    def __repeat(self, low: int, high: int, items, state: int) -> int:
+        for _ in range(min(low, REPEAT_LIMIT)):
+            state = self.__sequence(items, state)
+        if high == _parser.MAXREPEAT or high - low > REPEAT_LIMIT:
+            loop: int = self.__edge(state, _EPSILON)
+            self.__edge(self.__sequence(items, loop), _EPSILON, target=loop)
+            return loop
+        end: int = self.__edge(state, _EPSILON)
+        for _ in range(high - low):
+            state = self.__sequence(items, state)
+            self.__edge(state, _EPSILON, target=end)
+        return end
+
+    def __test(self, op, av):
+        """A predicate on one character for a LITERAL, NOT_LITERAL, ANY or IN node."""
+        if op is _parser.ANY:
+            return lambda char: True
+        if op in (_parser.LITERAL, _parser.NOT_LITERAL):
+            expected: str = chr(av)
+            negate: bool = op is _parser.NOT_LITERAL
+            if self.ignore_case:
+                return lambda char: (char.lower() == expected.lower()) != negate
+            return lambda char: (char == expected) != negate
+
+        negate = bool(av) and av[0][0] is _parser.NEGATE
+        tests = [self.__item(item_op, item_av) for item_op, item_av in av[negate:]]
+
+        def test(char: str) -> bool:
+            chars = {char, char.lower(), char.upper()} if self.ignore_case else (char,)
+            return any(item(c) for item in tests for c in chars) != negate
+
+        return test
+
+    @staticmethod
+    def __item(op, av):
+        if op is _parser.LITERAL:
+            return lambda char: char == chr(av)
+        if op is _parser.RANGE:
+            return lambda char: av[0] <= ord(char) <= av[1]
+        if op is _parser.CATEGORY and av in _CATEGORIES:
+            return lambda char: _CATEGORIES[av].match(char) is not None
+        return lambda char: True
@@ -1,7 +1,6 @@
 from typing import Any
 from fastapi import Request
 from fastapi.routing import Match
-from ..client_db.client_db import load_access_token
 
 
 class Params:
@@ -31,6 +30,3 @@ class Params:
 def match_key(recived_key, key):
     return key == recived_key
 
-
-def get_access_token(client_id: str):
-    return load_access_token(client_id=client_id)
@@ -1,9 +1,16 @@
+import asyncio
 from functools import wraps
 from fastapi import HTTPException, WebSocket
+from fastapi.responses import JSONResponse
 from enum import Enum
-from .utils import Params, match_key, get_access_token
+from .checks import check_access, check_master, failure_status
+from ..config import ConfigServer, logger
 from ..utils import TokenCriptografy
-from ..config import logger, ConfigServer
+from ..client_db.sessions import websocket_sessions, Session, close_session
+
+DENIAL_MODES: tuple[str, ...] = ("accept", "close", "http")
+# Policy violation: the close code sent for rejected tokens
+CLOSE_CODE: int = 1008
 
 
 class TokenType(Enum):
@@ -11,21 +18,44 @@ class TokenType(Enum):
     MASTER = "master"
 
 
-def websocket_middleware(token_type: TokenType = TokenType.ACCESS):
+def websocket_middleware(
+    token_type: TokenType = TokenType.ACCESS, denial: str | None = None
+):
     """
     Decorator factory that enforces token-based authentication for FastAPI WebSocket endpoints.
     This decorator inspects incoming WebSocket headers and performs one of two checks before
     allowing the wrapped handler to run:
-    - `TokenType.ACCESS` (default): expects header "ACCESS-TOKEN", decodes it, verifies the client_id
-        and compares the token against the stored access key. On failure it calls the connection
-        disconnect helper and prevents the handler from executing.
+    - `TokenType.ACCESS` (default): expects header "ACCESS-TOKEN" and validates it exactly like
+        `AccessTokenMiddleware` does (including stateless verification when enabled). On failure it
+        calls the connection disconnect helper and prevents the handler from executing.
     - `TokenType.MASTER`: expects header "MASTER-TOKEN" and compares it to ConfigServer.MASTER_TOKEN.
         On mismatch it disconnects the client and prevents handler execution.
 
+    Tokens are verified with the same async checks as the HTTP middlewares (token and
+    decoded token caches, stateless verification), so the event loop never blocks.
+
+    How a rejected client is disconnected depends on `denial`:
+    - `"accept"` (default): the connection is accepted, a JSON error message is sent and
+        the socket is closed with code 1008.
+    - `"close"`: the handshake is closed before accept; the client receives an HTTP 403
+        and no WebSocket is ever established.
+    - `"http"`: the handshake is answered with an HTTP 401 and the same JSON body as the
+        HTTP middlewares (`{"detail": ...}`), through the ASGI WebSocket Denial Response
+        extension; servers without the extension fall back to `"close"`.
+
+    `"close"` and `"http"` make reconnect storms (e.g. clients retrying with an expired
+    token) cost one HTTP exchange per attempt instead of a full upgrade.
+
+    With the `websocket_sessions` setting, access-token connections are registered in
+    `client_db.sessions.websocket_sessions` while the handler runs, and closed (code
+    1008) when their token's `exp` is reached or a new token is saved for the client.
+
     ### Parameters
     `token_type`: `TokenType`
             Token type required for the endpoint (`TokenType.ACCESS` or `TokenType.MASTER`). Defaults to
             `TokenType.ACCESS`.
+    `denial`: `str | None`
+            `"accept"`, `"close"` or `"http"`. Defaults to the `websocket_denial` setting.
     ---
     ### Example
     ```python
@@ -44,46 +74,97 @@ def websocket_middleware(token_type: TokenType = TokenType.ACCESS):
         (first parameter should be a WebSocket).
     """
 
+    if denial is not None and denial not in DENIAL_MODES:
+        raise ValueError(f"denial must be one of {DENIAL_MODES}, got {denial!r}")
+
     def decorator(func):
         @wraps(func)
         async def wrapper(websocket: WebSocket, *args, **kwargs):
-            disconnected: bool = False
             if token_type == TokenType.ACCESS:
                 token = websocket.headers.get("ACCESS-TOKEN")
-                try:
-                    payload = TokenCriptografy.decode(token)
-                    client_id = payload.get("client_id")
-                    client_key = get_access_token(client_id)
-                    if token is None or not match_key(token, client_key):
-                        await disconnect(websocket=websocket)
-                        disconnected = True
-
-                except Exception:
-                    await disconnect(websocket=websocket)
+                detail = await check_access(token)
+                if detail is not None:
+                    return await reject(websocket, detail, denial)
+                if ConfigServer.WEBSOCKET_SESSIONS:
+                    return await run_session(func, websocket, token, *args, **kwargs)
 
             if token_type == TokenType.MASTER:
-                token = websocket.headers.get("MASTER-TOKEN")
-                master_token: str = ConfigServer.MASTER_TOKEN
-
-                if token is None or master_token != token:
-                    await disconnect(
-                        websocket=websocket,
-                        detail="Disconnected: Unauthorized Master Token",
+                detail = check_master(websocket.headers.get("MASTER-TOKEN"))
+                if detail is not None:
+                    return await reject(
+                        websocket,
+                        detail,
+                        denial,
+                        message="Disconnected: Unauthorized Master Token",
                     )
-                    disconnected = True
 
-            if not disconnected:
-                return await func(websocket, *args, **kwargs)
+            return await func(websocket, *args, **kwargs)
 
         return wrapper
 
     return decorator
 
 
+async def run_session(func, websocket: WebSocket, token: str, *args, **kwargs):
+    """Run the handler with `websocket` registered for expiry and supersession."""
+    # Served by the decoded token cache: `check_access` just verified this token
+    payload: dict = TokenCriptografy.decode(token)
+    session: Session = websocket_sessions.register(
+        websocket,
+        client_id=payload["client_id"],
+        token=token,
+        exp=float(payload.get("exp", float("inf"))),
+        task=asyncio.current_task(),
+    )
+    result = None
+    try:
+        result = await func(websocket, *args, **kwargs)
+    except asyncio.CancelledError:
+        # Cancelled by the registry: end the session instead of the request
+        if session.reason is None:
+            raise
+        asyncio.current_task().uncancel()
+    finally:
+        websocket_sessions.unregister(session)
+
+    if session.reason is not None:
+        await close_session(websocket, session.reason)
+    return result
+
+
+async def reject(
+    websocket: WebSocket,
+    detail: str,
+    denial: str | None = None,
+    message: str = "Disconnected: Unauthrized ACCESS-TOKEN",
+) -> None:
+    """
+    Disconnect a client whose token was rejected with `detail`, following `denial`
+    (see `websocket_middleware`). `message` is the error sent in `"accept"` mode.
+    """
+    denial = denial or ConfigServer.WEBSOCKET_DENIAL
+    if denial == "http":
+        if "websocket.http.response" in websocket.scope.get("extensions", {}):
+            await websocket.send_denial_response(
+                JSONResponse({"detail": detail}, status_code=failure_status(detail))
+            )
+            return
+        denial = "close"
+
+    if denial == "close":
+        # Before accept: the server answers the handshake with HTTP 403
+        await websocket.close(code=CLOSE_CODE)
+        return
+
+    if denial != "accept":
+        logger.warning(f"Unknown websocket_denial {denial!r}; using 'accept'")
+    await disconnect(websocket=websocket, detail=message)
+
+
 async def disconnect(
     websocket: WebSocket, detail: str = "Disconnected: Unauthrized ACCESS-TOKEN"
 ):
     await websocket.accept()
     await websocket.send_json({"status": "error", "detail": detail})
-    await websocket.close(code=1008)
+    await websocket.close(code=CLOSE_CODE)
     raise HTTPException(status_code=401, detail=detail)
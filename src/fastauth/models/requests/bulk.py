@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+
+class BulkTokenRequest(BaseModel):
+    """
+    Body of `POST /auth/token/bulk`: either the `client_ids` to issue tokens for,
+    or a `count` of new clients whose ids are generated (UUID4).
+    """
+
+    client_ids: list[str] | None = None
+    count: int | None = Field(default=None, gt=0)
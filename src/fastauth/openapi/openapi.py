@@ -1,8 +1,44 @@
-from fastapi import FastAPI
-from fastapi.openapi.utils import get_openapi
+import json
+import hashlib
+from fastapi import FastAPI, Request, Response
+from starlette.routing import Route
+from ..middleware.policy import AuthRequirement, active_policy
+
+SECURITY_SCHEMES: dict = {
+    "AccessTokenHeader": {
+        "type": "apiKey",
+        "name": "ACCESS-TOKEN",
+        "in": "header",
+    },
+    "MasterTokenHeader": {
+        "type": "apiKey",
+        "name": "MASTER-TOKEN",
+        "in": "header",
+    },
+}
+
+# OpenAPI operation keys of a path item (the others are `parameters`, `summary`, ...)
+HTTP_METHODS: frozenset[str] = frozenset(
+    ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+)
 
 
 class FastauthOpenAPI:
+    """
+    OpenAPI schema of the application, with the Fastauth token headers as security schemes.
+
+    - `security` is set only on the operations the path policy protects (the same
+      `MASTER_PATHS` / `ACCESS_TOKEN_PATHS` index the middleware uses): `MasterTokenHeader`,
+      `AccessTokenHeader`, or both when a path requires both tokens.
+    - The schema is generated once; `serve` answers `openapi_url` with the serialized
+      bytes, cached per `root_path`, and a strong `ETag`, and `If-None-Match` requests
+      with `304 Not Modified`.
+    - `build` can be run at startup (`Fastauth.set_auth` does it in the lifespan, in a
+      thread), so no request pays for the generation.
+
+    Call `invalidate()` after adding routes to an app whose schema was already built.
+    """
+
     def __init__(
         self,
         app: FastAPI,
@@ -14,11 +50,16 @@ class FastauthOpenAPI:
         self.title: str = title
         self.version: str = version
         self.description: str = description
+        # root_path -> (body, etag)
+        self.__documents: dict[str, tuple[bytes, str]] = {}
 
     def __call__(self):
         if self.app.openapi_schema:
             return self.app.openapi_schema
 
+        # Imported here: only needed to generate the schema, once
+        from fastapi.openapi.utils import get_openapi
+
         openapi_schema = get_openapi(
             title=self.title,
             version=self.version,
@@ -26,27 +67,91 @@ class FastauthOpenAPI:
             routes=self.app.routes,
         )
 
-        openapi_schema["components"]["securitySchemes"] = {
-            "AccessTokenHeader": {
-                "type": "apiKey",
-                "name": "ACCESS-TOKEN",
-                "in": "header",
-            },
-            "MasterTokenHeader": {
-                "type": "apiKey",
-                "name": "MASTER-TOKEN",
-                "in": "header",
-            },
-        }
-
-        for path in openapi_schema["paths"].values():
-            for method in path.values():
-                method["security"] = [
-                    {
-                        "AccessTokenHeader": [],
-                        "MasterTokenHeader": [],
-                    }
-                ]
+        openapi_schema.setdefault("components", {})["securitySchemes"] = SECURITY_SCHEMES
+
+        policy = active_policy()
+        for path, item in openapi_schema.get("paths", {}).items():
+            for method, operation in item.items():
+                if method not in HTTP_METHODS:
+                    continue
+                security = _security(policy.lookup_template(path, method.upper()))
+                if security is not None:
+                    operation["security"] = security
 
         self.app.openapi_schema = openapi_schema
-        return self.app.openapi_schema
\ No newline at end of file
+        return self.app.openapi_schema
+
+    def build(self, root_path: str = "") -> tuple[bytes, str]:
+        """Generate (if needed) and serialize the schema for `root_path`; returns `(body, etag)`."""
+        document = self.__documents.get(root_path)
+        if document is not None:
+            return document
+
+        schema: dict = self()
+        if root_path and self.app.root_path_in_servers:
+            server_urls = {server.get("url") for server in schema.get("servers", [])}
+            if root_path not in server_urls:
+                schema = dict(schema)
+                schema["servers"] = [{"url": root_path}] + schema.get("servers", [])
+
+        # Same encoding as `starlette.responses.JSONResponse`
+        body: bytes = json.dumps(
+            schema,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        etag: str = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.__documents[root_path] = document = (body, etag)
+        return document
+
+    def invalidate(self) -> None:
+        """Drop the generated schema and its serialized documents."""
+        self.app.openapi_schema = None
+        self.__documents.clear()
+
+    async def serve(self, request: Request) -> Response:
+        """`openapi_url` endpoint: cached bytes, `ETag` and `304` on `If-None-Match`."""
+        root_path: str = request.scope.get("root_path", "").rstrip("/")
+        body, etag = self.build(root_path)
+        headers: dict = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def install(self) -> None:
+        """Make this schema the app's `openapi()` and serve it at `openapi_url`."""
+        self.app.openapi = self
+        openapi_url: str | None = self.app.openapi_url
+        if not openapi_url:
+            return
+        # Replace the route FastAPI added, which serializes the schema on every hit
+        self.app.router.routes = [
+            route
+            for route in self.app.router.routes
+            if not (isinstance(route, Route) and route.path == openapi_url)
+        ]
+        self.app.add_route(openapi_url, self.serve, include_in_schema=False)
+
+
+def _security(requirement: AuthRequirement) -> list[dict] | None:
+    if not requirement:
+        return None
+    schemes: dict = {}
+    if requirement & AuthRequirement.ACCESS:
+        schemes["AccessTokenHeader"] = []
+    if requirement & AuthRequirement.MASTER:
+        schemes["MasterTokenHeader"] = []
+    # One object: every listed header is required
+    return [schemes]
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,220 @@
+import os
+import json
+import asyncio
+from typing import Any, Callable
+from .config import logger, resolve_setting, ConfigFile, ConfigServer, TokenConfig
+from .middleware.policy import PathPolicy, install_policy
+from .utils.decode_token import install_key
+from .utils.hs256 import HS256Codec
+
+# Settings applied by a reload; the others are read once and need a restart
+RELOADABLE: tuple[str, ...] = (
+    "master_token",
+    "master_token_paths",
+    "access_token_paths",
+    "cryptography_key",
+)
+
+
+class AuthSnapshot:
+    """
+    Authentication settings resolved from one version of the config file, with the
+    path policy and the HS256 codec already built from them.
+    """
+
+    __slots__ = ("master_token", "master_paths", "access_paths", "cryptography_key", "policy", "codec")
+
+    def __init__(
+        self,
+        master_token: str | None,
+        master_paths: list[str],
+        access_paths: list[str],
+        cryptography_key: str,
+        policy: PathPolicy,
+        codec: HS256Codec | None,
+    ):
+        self.master_token: str | None = master_token
+        self.master_paths: list[str] = master_paths
+        self.access_paths: list[str] = access_paths
+        self.cryptography_key: str = cryptography_key
+        self.policy: PathPolicy = policy
+        self.codec: HS256Codec | None = codec
+
+
+def build_snapshot(config: dict, overrides: dict) -> AuthSnapshot:
+    """
+    Validate `config` (a parsed config file) and build the snapshot it describes.
+    `overrides` are the values passed to `Fastauth()`, with the same precedence as
+    at startup. Raises `ValueError` when the settings are invalid.
+    """
+    if not isinstance(config, dict):
+        raise ValueError("the configuration must be a JSON object")
+    for key in ("master_token", "cryptography_key"):
+        if config.get(key) is not None and not isinstance(config[key], str):
+            raise ValueError(f"'{key}' must be a string")
+    for key in ("master_token_paths", "access_token_paths"):
+        paths = config.get(key, [])
+        if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+            raise ValueError(f"'{key}' must be a list of strings")
+
+    master_token: str | None = overrides.get("master_token") or resolve_setting(
+        ConfigServer, "MASTER_TOKEN", config
+    )
+    cryptography_key: str | None = overrides.get("cryptography_key") or resolve_setting(
+        TokenConfig, "CRYPTOGRAPHY_KEY", config
+    )
+    if not cryptography_key:
+        raise ValueError("'cryptography_key' is not set")
+    master_paths: list[str] = overrides.get("master_token_paths", []) + resolve_setting(
+        ConfigServer, "MASTER_PATHS", config
+    )
+    access_paths: list[str] = overrides.get("access_token_paths", []) + resolve_setting(
+        ConfigServer, "ACCESS_TOKEN_PATHS", config
+    )
+
+    try:
+        policy: PathPolicy = PathPolicy(master_paths=master_paths, access_paths=access_paths)
+    except Exception as e:
+        raise ValueError(f"invalid protected path rule: {e}") from e
+    codec: HS256Codec | None = HS256Codec(cryptography_key) if TokenConfig.CODEC == "fast" else None
+
+    return AuthSnapshot(master_token, master_paths, access_paths, cryptography_key, policy, codec)
+
+
+def _signature(path: str) -> tuple[int, int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class ConfigWatcher:
+    """
+    Hot reload of the authentication settings (`RELOADABLE`) from `ConfigFile.PATH`.
+
+    - The file is polled every `ConfigServer.CONFIG_RELOAD_INTERVAL` seconds; a change
+      of mtime, size or inode (editors and deploy tools replace the file) triggers a
+      reload. Polling is a single `stat`, and works on every platform and mount.
+    - Reading, parsing, validating and compiling the path policy and the HS256 codec
+      (`build_snapshot`) run in a thread, off the event loop.
+    - The new snapshot is then installed on the event loop in one synchronous step:
+      no request can run between two of the assignments, so every check sees either
+      the old or the new master token, paths, policy and key, never a mix.
+    - An invalid file is logged and ignored; the current settings stay in place until
+      the file changes again.
+
+    Values passed to `Fastauth()` keep their precedence over the file, as does the
+    `CRYPTOGRAPHY_KEY` environment variable. `subscribe` registers callbacks run after
+    each swap (`set_auth` uses it to regenerate the OpenAPI security requirements).
+    `Fastauth.set_auth` starts and stops the watcher with the application lifespan.
+    """
+
+    def __init__(self):
+        self.overrides: dict = {}
+        self.reloads: int = 0
+        self.failures: int = 0
+        self.__signature: tuple[int, int, int] | None = None
+        self.__callbacks: list[Callable[[], Any]] = []
+        self.__task: asyncio.Task | None = None
+        self.__lock: asyncio.Lock | None = None
+
+    def stats(self) -> dict:
+        return {"reloads": self.reloads, "failures": self.failures}
+
+    def subscribe(self, callback: Callable[[], Any]) -> None:
+        if callback not in self.__callbacks:
+            self.__callbacks.append(callback)
+
+    def start(self, interval: float) -> None:
+        if self.__task is None and interval > 0:
+            # The settings in use were read from the file as it is now
+            self.__signature = _signature(ConfigFile.PATH)
+            self.__task = asyncio.create_task(self.__run(interval))
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+    async def check(self) -> bool:
+        """Reload if the config file changed since the last check. Returns True on reload."""
+        signature = _signature(ConfigFile.PATH)
+        if signature is None or signature == self.__signature:
+            return False
+        return await self.reload()
+
+    async def reload(self) -> bool:
+        """Read, validate and install the config file now. Returns True on success."""
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            try:
+                signature, config, snapshot = await asyncio.to_thread(self.__build)
+            except FileNotFoundError:
+                logger.warning(f"Configuration reload skipped: '{ConfigFile.PATH}' not found")
+                return False
+            except (OSError, ValueError) as e:
+                # Not retried until the file changes again
+                self.__signature = _signature(ConfigFile.PATH)
+                self.failures += 1
+                logger.error(f"Configuration reload failed, keeping the current settings. Error: {str(e)}")
+                return False
+
+            self.__signature = signature
+            changed: list[str] = self.__install(snapshot, config)
+            self.reloads += 1
+            logger.info(
+                f"Configuration reloaded: {', '.join(changed) if changed else 'no authentication change'}"
+            )
+            return True
+
+    def __build(self) -> tuple[tuple[int, int, int] | None, dict, AuthSnapshot]:
+        # Stat before reading: a write racing with the read changes the signature again
+        signature = _signature(ConfigFile.PATH)
+        with open(ConfigFile.PATH, "r") as f:
+            try:
+                config: Any = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"invalid JSON: {e}") from e
+        return signature, config, build_snapshot(config, self.overrides)
+
+    def __install(self, snapshot: AuthSnapshot, config: dict) -> list[str]:
+        """Swap `snapshot` in. Runs on the event loop without awaiting."""
+        changed: list[str] = [
+            name
+            for name, old, new in (
+                ("master_token", ConfigServer.MASTER_TOKEN, snapshot.master_token),
+                ("master_token_paths", ConfigServer.MASTER_PATHS, snapshot.master_paths),
+                ("access_token_paths", ConfigServer.ACCESS_TOKEN_PATHS, snapshot.access_paths),
+                ("cryptography_key", TokenConfig.CRYPTOGRAPHY_KEY, snapshot.cryptography_key),
+            )
+            if old != new
+        ]
+
+        ConfigFile.DATA = config
+        ConfigServer.MASTER_TOKEN = snapshot.master_token
+        ConfigServer.MASTER_PATHS = snapshot.master_paths
+        ConfigServer.ACCESS_TOKEN_PATHS = snapshot.access_paths
+        install_policy(snapshot.policy)
+        install_key(snapshot.cryptography_key, snapshot.codec)
+
+        for callback in self.__callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Configuration reload callback failed. Error: {str(e)}")
+        return changed
+
+    async def __run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.check()
+
+
+config_watcher: ConfigWatcher = ConfigWatcher()
+"""Watcher of this process' config file, see `ConfigWatcher`."""
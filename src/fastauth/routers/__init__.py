@@ -1 +1,3 @@
-from .auth import TokenRouter
\ No newline at end of file
+from .auth import TokenRouter
+from .metrics import MetricsRouter
+from .invalidation import InvalidationRouter
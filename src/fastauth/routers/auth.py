@@ -1,11 +1,21 @@
+import os
+import json
 import uuid
+import asyncio
+import inspect
 import datetime
-from jose import jwt
+import itertools
+from collections import deque
 from http import HTTPStatus
+from typing import AsyncIterator, Iterable, Iterator
 from fastapi.routing import APIRouter
+from starlette.responses import StreamingResponse
 from ..config import logger, TokenConfig
-from ..client_db.client_db import save_token
+from ..client_db.client_db import save_token, save_tokens, load_access_tokens, revoke_token
+from ..models.requests.bulk import BulkTokenRequest
 from ..models.responses.standart import standard_response
+from ..utils import TokenCriptografy
+from ..utils.token_pairs import token_payloads, encode_token_pairs
 
 
 class TokenRouter:
@@ -13,10 +23,11 @@ class TokenRouter:
     TokenRouter provides a modular authentication route handler for FastAPI applications, enabling easy integration of token-based authentication endpoints.
 
     ## Usage
-    - Instantiate TokenRouter and use its `route` property to obtain an APIRouter with pre-configured `/token/new` and `/token/refresh` endpoints.
+    - Instantiate TokenRouter and use its `route` property to obtain an APIRouter with pre-configured `/token/new`, `/token/refresh` and `/token/bulk` endpoints.
     - Pass the resulting router to your FastAPI app using `app.include_router(token_router.route)`.
     Customization:
     - To implement custom token generation logic, subclass TokenRouter and override the `__generate_access_token` and/or `__refresh_access_token` methods.
+      Overrides can be regular methods or coroutines; `async def` keeps custom generators non-blocking.
     Properties:
     - route: Returns an APIRouter instance with authentication endpoints for access and refresh token generation.
 
@@ -26,9 +37,9 @@ class TokenRouter:
     app.include_router(token_router.route)
     # For custom logic:
     class CustomTokenRouter(TokenRouter):
-        def __generate_access_token(self, client_id: str|None):
+        async def __generate_access_token(self, client_id: str|None):
             # Custom implementation here
-            pass
+            return await BaseTokenGeneration.generate_access_token(client_id=client_id)
     custom_router = CustomTokenRouter()
     app.include_router(custom_router.route)
     ```
@@ -55,6 +66,8 @@ class TokenRouter:
         If you don't need custom logic, you can use the default implementation provided by `BaseTokenGeneration`.
         The default implementation uses the `BaseTokenGeneration` class to generate access and refresh tokens
         based on the `client_id` or `refresh_token` provided.
+        Overrides may be plain methods or coroutines (`async def`); both are awaited
+        correctly by the endpoints.
         """
 
         @router.get("/token/new")
@@ -72,7 +85,9 @@ class TokenRouter:
             Note:
                 The access token should be included in the Authorization header for protected endpoints.
             """
-            return self.__generate_access_token(client_id=client_id)
+            return await _resolve(
+                self.__override("generate_access_token")(client_id=client_id)
+            )
 
         @router.get("/token/refresh")
         async def refresh_access_token(refresh_token: str):
@@ -89,7 +104,64 @@ class TokenRouter:
             Note:
                 The access token should be included in the Authorization header for protected endpoints.
             """
-            return self.__refresh_access_token(refresh_token=refresh_token)
+            return await _resolve(
+                self.__override("refresh_access_token")(refresh_token=refresh_token)
+            )
+
+        @router.post("/token/bulk")
+        async def generate_access_tokens_bulk(request: BulkTokenRequest):
+            """
+            Generates access and refresh tokens for many clients in one request.
+            Provide either `client_ids` (a list of ids) or `count` (that many new clients with generated UUIDs).
+            Pairs are encoded and saved in chunks with batched database writes, and streamed back
+            as NDJSON while the next chunk is processed, one line per client:
+            `{"client_id": ..., "access_token": ..., "refresh_token": ...}`, or
+            `{"client_id": ..., "error": ...}` if its chunk could not be saved.
+            Requires the MASTER-TOKEN header.
+            Example:
+                `POST /auth/token/bulk` with `{"count": 1000}`
+            """
+            if (request.client_ids is None) == (request.count is None):
+                return standard_response(
+                    status="error",
+                    message="Provide exactly one of `client_ids` or `count`",
+                    code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                )
+            if not TokenConfig.CRYPTOGRAPHY_KEY:
+                logger.error(
+                    "CRYPTOGRAFY_KEY is not set. Please set it in the environment or config file."
+                )
+                return standard_response(
+                    status="error",
+                    message="CRYPTOGRAFY_KEY is not set",
+                    code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                )
+
+            if request.client_ids is not None:
+                client_ids: Iterable[str] = request.client_ids
+                total: int = len(request.client_ids)
+            else:
+                client_ids = (str(uuid.uuid4()) for _ in range(request.count))
+                total = request.count
+
+            lines: AsyncIterator[bytes] = await _resolve(
+                self.__override("generate_access_tokens_bulk")(
+                    client_ids=client_ids, total=total
+                )
+            )
+            return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    def __override(self, name: str):
+        """
+        The most derived `__<name>` method. Double underscore names are mangled per
+        class (`_CustomTokenRouter__generate_access_token`), so a subclass override is
+        looked up under each class name of the MRO.
+        """
+        for cls in type(self).__mro__:
+            method = cls.__dict__.get(f"_{cls.__name__.lstrip('_')}__{name}")
+            if method is not None:
+                return method.__get__(self, type(self))
+        raise AttributeError(name)
 
     def __generate_access_token(self, client_id: str | None):
         """
@@ -112,6 +184,16 @@ class TokenRouter:
         """
         return BaseTokenGeneration.generate_access_token(client_id=client_id)
 
+    def __generate_access_tokens_bulk(self, client_ids: Iterable[str], total: int):
+        """
+        This method is intended to be overwritten by developers if custom bulk token generation logic is required.
+        It returns an async iterator of NDJSON `bytes` with the tokens generated for `client_ids`
+        (`total` of them), as `BaseTokenGeneration.generate_access_tokens_bulk` does.
+        """
+        return BaseTokenGeneration.generate_access_tokens_bulk(
+            client_ids=client_ids, total=total
+        )
+
     def __refresh_access_token(self, refresh_token: str):
         """
         This method is intended to be overwritten by developers if custom access token generation logic is required.
@@ -134,11 +216,47 @@ class TokenRouter:
         return BaseTokenGeneration.refresh_access_token(refresh_token=refresh_token)
 
 
+async def _resolve(result):
+    """Await `result` if the override returned a coroutine (or any awaitable)."""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
 class BaseTokenGeneration:
-    def generate_access_token(client_id: str | None) -> dict:
-        return BaseTokenGeneration.__generate_tokens_from_client(client_id=client_id)
+    async def generate_access_token(client_id: str | None) -> dict:
+        return await BaseTokenGeneration.__generate_tokens_from_client(client_id=client_id)
+
+    async def generate_access_tokens_bulk(
+        client_ids: Iterable[str], total: int
+    ) -> AsyncIterator[bytes]:
+        """
+        Generate and save token pairs for `client_ids`, yielding one NDJSON chunk per
+        `TokenConfig.BULK_CHUNK_SIZE` clients. Each chunk is saved with one batched write
+        (`save_tokens`) before its lines are yielded. With `total` of at least
+        `TokenConfig.BULK_PROCESS_THRESHOLD`, chunks are encoded in a process pool,
+        a few chunks ahead of the one being saved; only those chunks are held in memory.
+        """
+        key: str = TokenConfig.CRYPTOGRAPHY_KEY
+        codec: str = TokenConfig.CODEC
+        chunks: Iterator[list[str]] = _chunks(client_ids, max(1, TokenConfig.BULK_CHUNK_SIZE))
+
+        threshold: int = TokenConfig.BULK_PROCESS_THRESHOLD
+        if threshold > 0 and total >= threshold:
+            encoded = _encode_in_processes(chunks, key, codec)
+        else:
+            encoded = _encode_in_loop(chunks, key, codec)
 
-    def refresh_access_token(refresh_token: str) -> dict:
+        async for pairs in encoded:
+            superseded: list[str] = await _current_tokens([client_id for client_id, _, _ in pairs])
+            saved: bool = await save_tokens(pairs)
+            if not saved:
+                logger.error(f"Error saving {len(pairs)} tokens of a bulk issuance")
+            else:
+                await _revoke(superseded)
+            yield _ndjson(pairs, saved)
+
+    async def refresh_access_token(refresh_token: str) -> dict:
         CRYPTOGRAFY_KEY = TokenConfig.CRYPTOGRAPHY_KEY
         if not CRYPTOGRAFY_KEY:
             logger.error(
@@ -150,10 +268,8 @@ class BaseTokenGeneration:
                 code=HTTPStatus.INTERNAL_SERVER_ERROR,
             )
 
-        ALGORITHM = "HS256"
-
         try:
-            payload = jwt.decode(refresh_token, CRYPTOGRAFY_KEY, algorithms=[ALGORITHM])
+            payload = TokenCriptografy.decode(refresh_token)
             client_id = payload.get("client_id")
             if not client_id:
                 return standard_response(
@@ -169,9 +285,9 @@ class BaseTokenGeneration:
                 code=HTTPStatus.UNAUTHORIZED,
             )
 
-        return BaseTokenGeneration.__generate_tokens_from_client(client_id=client_id)
+        return await BaseTokenGeneration.__generate_tokens_from_client(client_id=client_id)
 
-    def __generate_tokens_from_client(client_id: str | None) -> dict:
+    async def __generate_tokens_from_client(client_id: str | None) -> dict:
         # Secret key for encoding the JWTs (should be kept secure in production)
         CRYPTOGRAFY_KEY = TokenConfig.CRYPTOGRAPHY_KEY
         if not CRYPTOGRAFY_KEY:
@@ -184,47 +300,24 @@ class BaseTokenGeneration:
                 code=HTTPStatus.INTERNAL_SERVER_ERROR,
             )
 
-        ALGORITHM = "HS256"
         client_id = client_id if client_id is not None else str(uuid.uuid4())
 
-        # Set token expiration times
-        ACCESS_TOKEN_EXPIRE_DAYS = 30
-        REFRESH_TOKEN_EXPIRE_DAYS = 365
-
-        # Generate expiration times
+        # Payloads for tokens, issued now
         now = datetime.datetime.now(datetime.timezone.utc)
+        access_token_payload, refresh_token_payload = token_payloads(client_id, now)
 
-        access_token_expires = now + datetime.timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
-        refresh_token_expires = now + datetime.timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-
-        # Payloads for tokens
-        access_token_payload = {
-            "client_id": client_id,
-            "type": "access",
-            "exp": access_token_expires,
-            "iat": now,
-        }
-        refresh_token_payload = {
-            "client_id": client_id,
-            "type": "refresh",
-            "exp": refresh_token_expires,
-            "iat": now,
-        }
-
-        # Generate JWT tokens using jose
-        access_token = jwt.encode(
-            access_token_payload, CRYPTOGRAFY_KEY, algorithm=ALGORITHM
-        )
-        refresh_token = jwt.encode(
-            refresh_token_payload, CRYPTOGRAFY_KEY, algorithm=ALGORITHM
-        )
+        # Generate JWT tokens with the configured codec (`jwt_codec`)
+        access_token = TokenCriptografy.encode(access_token_payload)
+        refresh_token = TokenCriptografy.encode(refresh_token_payload)
 
-        save = save_token(
+        superseded: list[str] = await _current_tokens([client_id])
+        save = await save_token(
             client_id=client_id,
             access_token=access_token,
             refresh_token=refresh_token,
         )
         if save:
+            await _revoke(superseded)
             return standard_response(
                 status="success",
                 message="Token generated",
@@ -242,3 +335,92 @@ class BaseTokenGeneration:
                 code=HTTPStatus.INTERNAL_SERVER_ERROR,
                 data={"client_id": client_id},
             )
+
+
+async def _current_tokens(client_ids: list[str]) -> list[str]:
+    """
+    With stateless verification, the access tokens a new issuance for `client_ids`
+    replaces: they pass on their signature alone until revoked (see `_revoke`).
+    """
+    if not TokenConfig.STATELESS:
+        return []
+    return list((await load_access_tokens(client_ids)).values())
+
+
+async def _revoke(tokens: list[str]) -> None:
+    """Revoke the `jti` of each of `tokens` until its `exp`, once its replacement is saved."""
+    revocations: list[tuple[str, float]] = []
+    for token in tokens:
+        try:
+            payload: dict = TokenCriptografy.decode(token)
+        except Exception:
+            # Expired (or not a token of ours): nothing left to revoke
+            continue
+        if payload.get("jti") is not None and payload.get("exp") is not None:
+            revocations.append((payload["jti"], payload["exp"]))
+    results = await asyncio.gather(*(revoke_token(jti, exp) for jti, exp in revocations))
+    if not all(results):
+        logger.error("Error saving the revocation of superseded access tokens")
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _chunks(client_ids: Iterable[str], size: int) -> Iterator[list[str]]:
+    iterator = iter(client_ids)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+async def _encode_in_loop(
+    chunks: Iterator[list[str]], key: str, codec: str
+) -> AsyncIterator[list[tuple[str, str, str]]]:
+    for chunk in chunks:
+        yield encode_token_pairs(chunk, key, codec, _now())
+
+
+async def _encode_in_processes(
+    chunks: Iterator[list[str]], key: str, codec: str
+) -> AsyncIterator[list[tuple[str, str, str]]]:
+    loop = asyncio.get_running_loop()
+    workers: int = TokenConfig.BULK_MAX_WORKERS or os.cpu_count() or 1
+    # Imported here: multiprocessing is only needed for very large batches
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[asyncio.Future] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(
+                loop.run_in_executor(pool, encode_token_pairs, chunk, key, codec, _now())
+            )
+            # Keep every worker busy while bounding the chunks held in memory
+            if len(pending) > workers:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _ndjson(pairs: list[tuple[str, str, str]], saved: bool) -> bytes:
+    if saved:
+        lines = (
+            json.dumps(
+                {
+                    "client_id": client_id,
+                    "access_token": access_token,
+                    "refresh_token": refresh_token,
+                }
+            )
+            for client_id, access_token, refresh_token in pairs
+        )
+    else:
+        lines = (
+            json.dumps({"client_id": client_id, "error": "Error saving token"})
+            for client_id, _, _ in pairs
+        )
+    return ("\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,54 @@
+from http import HTTPStatus
+from fastapi import Request
+from fastapi.routing import APIRouter
+from starlette.responses import Response, JSONResponse
+from ..client_db.invalidation import invalidation_bus
+
+INVALID_MESSAGE = "Invalid invalidation message"
+
+
+class InvalidationRouter:
+    """
+    InvalidationRouter receives the token invalidations sent by the other nodes with
+    the "http" invalidation transport (`invalidation_peers`).
+
+    ## Usage
+    - `Fastauth().set_auth(app)` includes it when `"http"` is in `invalidation_transports`.
+    - The body is a message signed by `invalidation_bus` with the shared cryptography
+      key: unsigned, forged or stale messages are answered with 401. No token header
+      is needed, so keep `/auth/invalidate` out of the protected paths.
+
+    ## Example
+    ```
+    "invalidation_transports": ["unix", "http"],
+    "invalidation_peers": ["http://10.0.0.2:8000/auth/invalidate", "http://10.0.0.3:8000/auth/invalidate"]
+    ```
+    """
+
+    def __init__(
+        self,
+        prefix: str = "/auth",
+        tags: list[str] = ["auth"],
+    ):
+        self.prefix = prefix
+        self.tags = tags
+
+    @property
+    def route(self) -> APIRouter:
+        _route = APIRouter(prefix=self.prefix, tags=self.tags)
+        self.__registry_enpoints(_route)
+        return _route
+
+    def __registry_enpoints(self, router: APIRouter):
+        @router.post("/invalidate", status_code=HTTPStatus.NO_CONTENT)
+        async def invalidate(request: Request):
+            """
+            Drop the cached tokens of the client ids listed in a signed invalidation
+            message (sent by `invalidation_bus` on another node).
+            """
+            if not invalidation_bus.receive(await request.body()):
+                return JSONResponse(
+                    content={"detail": INVALID_MESSAGE},
+                    status_code=HTTPStatus.UNAUTHORIZED,
+                )
+            return Response(status_code=HTTPStatus.NO_CONTENT)
@@ -0,0 +1,55 @@
+from http import HTTPStatus
+from fastapi import Header
+from fastapi.routing import APIRouter
+from starlette.responses import Response, JSONResponse
+from ..metrics import registry
+from ..middleware.checks import check_master
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsRouter:
+    """
+    MetricsRouter exposes the auth metrics (`fastauth.metrics`) as Prometheus text.
+
+    ## Usage
+    - `Fastauth().set_auth(app)` includes it when `"metrics": true` is set.
+    - It can also be included by hand: `app.include_router(MetricsRouter().route)`.
+    - The endpoint always requires the MASTER-TOKEN header, whether or not its path
+      is listed in `master_token_paths`.
+
+    ## Example
+    ```
+    curl -H "MASTER-TOKEN: <master-token>" http://localhost:8000/auth/metrics
+    ```
+    """
+
+    def __init__(
+        self,
+        prefix: str = "/auth",
+        tags: list[str] = ["auth"],
+    ):
+        self.prefix = prefix
+        self.tags = tags
+
+    @property
+    def route(self) -> APIRouter:
+        _route = APIRouter(prefix=self.prefix, tags=self.tags)
+        self.__registry_enpoints(_route)
+        return _route
+
+    def __registry_enpoints(self, router: APIRouter):
+        @router.get("/metrics")
+        async def metrics(master_token: str | None = Header(None, alias="MASTER-TOKEN")):
+            """
+            Auth stage timings, 401 reasons, token store latency and errors, and cache
+            counters in the Prometheus text exposition format.
+            Requires the MASTER-TOKEN header.
+            """
+            detail: str | None = check_master(master_token)
+            if detail is not None:
+                return JSONResponse(
+                    content={"detail": detail},
+                    status_code=HTTPStatus.UNAUTHORIZED,
+                )
+            return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
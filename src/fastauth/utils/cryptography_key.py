@@ -1,5 +1,3 @@
-from cryptography.fernet import Fernet
-
 if __name__ == "__main__":
     from envfile import write_key, key_in
 else:
@@ -10,6 +8,8 @@ VAR_NAME = "CRYPTOGRAPHY_KEY"
 
 def generate_cryptography_key(add2env: bool = True):
     """ """
+    from cryptography.fernet import Fernet
+
     key = Fernet.generate_key().decode()
     keep = "no"
     if add2env:
@@ -1,27 +1,86 @@
 from ..config import TokenConfig, logger
-from jose import jwt
+from .decoded_cache import decoded_tokens
+from .hs256 import HS256Codec, ALGORITHM
 
-ALGORITHM = "HS256"
+_fast_codec: tuple[str, HS256Codec] | None = None
+
+
+def _codec(key: str) -> HS256Codec | None:
+    """The built-in HS256 codec for `key` when `TokenConfig.CODEC` is "fast", else None."""
+    global _fast_codec
+    if TokenConfig.CODEC != "fast":
+        return None
+    if _fast_codec is None or _fast_codec[0] != key:
+        _fast_codec = (key, HS256Codec(key))
+    return _fast_codec[1]
+
+
+def install_key(key: str, codec: HS256Codec | None = None) -> None:
+    """
+    Make `key` the signing key, with its HS256 codec when already built (config hot
+    reload builds it off the event loop). Cached decoded claims are dropped on next use.
+    """
+    global _fast_codec
+    TokenConfig.CRYPTOGRAPHY_KEY = key
+    if codec is not None:
+        _fast_codec = (key, codec)
+
+
+def _jose():
+    """python-jose's `jwt` module, imported on first use: it pulls in `cryptography`."""
+    from jose import jwt
+
+    return jwt
+
+
+def _cryptography_key() -> str:
+    key: str = TokenConfig.CRYPTOGRAPHY_KEY
+    if not key:
+        logger.error(
+            "CRYPTOGRAFY_KEY is not set. Please set it in the environment or config file."
+        )
+        raise Exception(
+            "Internal Server Error: CRYPTOGRAFY_KEY is not set"
+        )
+    return key
 
 
 class TokenCriptografy:
     def decode(token):
-        if not TokenConfig.CRYPTOGRAPHY_KEY:
-            logger.error(
-                "CRYPTOGRAFY_KEY is not set. Please set it in the environment or config file."
-            )
-            raise Exception(
-                "Internal Server Error: CRYPTOGRAFY_KEY is not set"
+        """
+        Verify and decode a JWT signed with `TokenConfig.CRYPTOGRAPHY_KEY`.
+        Tokens already verified are answered from `decoded_tokens` until their `exp`.
+        """
+        key: str = _cryptography_key()
+
+        cacheable: bool = isinstance(token, str)
+        if cacheable:
+            claims: dict | None = decoded_tokens.get(token, key)
+            if claims is not None:
+                return claims
+
+        codec: HS256Codec | None = _codec(key)
+        if codec is not None:
+            claims = codec.decode(token)
+        else:
+            claims = _jose().decode(
+                token,
+                key,
+                algorithms=[ALGORITHM],
             )
-        return jwt.decode(
-            token,
-            TokenConfig.CRYPTOGRAPHY_KEY,
-            algorithms=[ALGORITHM],
-        )
+        if cacheable:
+            decoded_tokens.set(token, key, claims)
+        return claims
 
     def encode(payload):
-        return jwt.encode(
+        """Sign `payload` with `TokenConfig.CRYPTOGRAPHY_KEY` using the configured codec."""
+        key: str = _cryptography_key()
+
+        codec: HS256Codec | None = _codec(key)
+        if codec is not None:
+            return codec.encode(payload)
+        return _jose().encode(
             payload,
-            TokenConfig.CRYPTOGRAPHY_KEY,
+            key,
             algorithm=ALGORITHM,
         )
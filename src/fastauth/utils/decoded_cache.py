@@ -0,0 +1,74 @@
+import time
+import hashlib
+from collections import OrderedDict
+from ..config import CacheConfig
+
+
+class DecodedTokenCache:
+    """
+    Bounded LRU cache from a token digest to its verified claims.
+
+    `TokenCriptografy.decode` only runs the full JWT verification (base64, JSON, HMAC,
+    claim validation) the first time a token is seen; later calls with the same token
+    return the cached claims until the token's own `exp`. Entries are keyed by a
+    16-byte BLAKE2b digest of the token, and the whole cache is dropped when the
+    signing key changes. A size of `0` (`CacheConfig.DECODED_MAX_SIZE`) disables it.
+
+    `hits` and `misses` count lookups since start (or the last `clear`).
+    """
+
+    def __init__(self):
+        self.__entries: OrderedDict[bytes, tuple[float | None, dict]] = OrderedDict()
+        self.__key: str | None = None
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str, key: str) -> dict | None:
+        if CacheConfig.DECODED_MAX_SIZE <= 0:
+            return None
+        if key is not self.__key:
+            self.__entries.clear()
+            self.__key = key
+
+        digest: bytes = self.digest(token)
+        entry = self.__entries.get(digest)
+        if entry is not None:
+            expires_at, claims = entry
+            if expires_at is None or expires_at > time.time():
+                self.__entries.move_to_end(digest)
+                self.hits += 1
+                return dict(claims)
+            del self.__entries[digest]
+
+        self.misses += 1
+        return None
+
+    def set(self, token: str, key: str, claims: dict) -> None:
+        if CacheConfig.DECODED_MAX_SIZE <= 0 or key is not self.__key:
+            return
+
+        exp = claims.get("exp")
+        expires_at: float | None = float(exp) if isinstance(exp, (int, float)) else None
+        digest: bytes = self.digest(token)
+        self.__entries[digest] = (expires_at, dict(claims))
+        self.__entries.move_to_end(digest)
+        while len(self.__entries) > CacheConfig.DECODED_MAX_SIZE:
+            self.__entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"size": len(self.__entries), "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+decoded_tokens: DecodedTokenCache = DecodedTokenCache()
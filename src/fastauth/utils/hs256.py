@@ -0,0 +1,139 @@
+import hmac
+import json
+import time
+import base64
+import hashlib
+import binascii
+from datetime import datetime, timedelta, timezone
+
+ALGORITHM = "HS256"
+
+
+class TokenError(Exception):
+    """The token is malformed, has an invalid signature or invalid claims."""
+
+
+class ExpiredTokenError(TokenError):
+    """The token signature is valid but its `exp` claim is in the past."""
+
+
+_EPOCH: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SECOND: timedelta = timedelta(seconds=1)
+# Reused encoder: `json.dumps` with custom separators builds a new one per call
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _timestamp(value: datetime) -> int:
+    """Whole seconds since the epoch; naive datetimes are taken as UTC (as jose does)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _SECOND
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+# Same bytes python-jose writes for an HS256 header, so tokens are interchangeable
+HEADER: bytes = _b64encode(
+    json.dumps(
+        {"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":"), sort_keys=True
+    ).encode("utf-8")
+)
+_HEADER_TEXT: str = HEADER.decode("ascii")
+_TIME_CLAIMS: tuple[str, ...] = ("exp", "iat", "nbf")
+_STRING_CLAIMS: tuple[str, ...] = ("client_id", "type")
+
+
+class HS256Codec:
+    """
+    JWT codec for the single case fastauth uses: HS256 with one shared secret.
+
+    - The HMAC key schedule is computed once; each token only copies the keyed state.
+    - The encoded header is a constant, and tokens carrying exactly that header skip
+      header parsing on decode.
+    - Signatures are compared with `hmac.compare_digest`.
+    - Only the claims fastauth relies on are validated: `exp` (rejected once past),
+      `iat` and `nbf` (numeric), `client_id` and `type` (strings).
+
+    Output is byte-for-byte what `jose.jwt.encode(..., algorithm="HS256")` produces
+    for the same claims, and tokens from either codec decode with the other.
+    """
+
+    def __init__(self, key: str | bytes):
+        self.key: bytes = key.encode("utf-8") if isinstance(key, str) else key
+        self.__hmac = hmac.new(self.key, digestmod=hashlib.sha256)
+
+    def sign(self, signing_input: bytes) -> bytes:
+        mac = self.__hmac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, claims: dict) -> str:
+        for claim in _TIME_CLAIMS:
+            value = claims.get(claim)
+            if isinstance(value, datetime):
+                claims = {**claims, claim: _timestamp(value)}
+
+        payload: bytes = _b64encode(_dumps(claims).encode("utf-8"))
+        signing_input: bytes = HEADER + b"." + payload
+        return (signing_input + b"." + _b64encode(self.sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str | bytes) -> dict:
+        if isinstance(token, bytes):
+            token = token.decode("ascii", "replace")
+        try:
+            signing_input, signature = token.rsplit(".", 1)
+            header, payload = signing_input.split(".")
+            signature_bytes: bytes = _b64decode(signature)
+            signed: bytes = signing_input.encode("ascii")
+        except (ValueError, binascii.Error):
+            raise TokenError("Not enough segments")
+
+        if not hmac.compare_digest(self.sign(signed), signature_bytes):
+            raise TokenError("Signature verification failed.")
+
+        try:
+            if header != _HEADER_TEXT:
+                headers = json.loads(_b64decode(header))
+                if not isinstance(headers, dict) or headers.get("alg") != ALGORITHM:
+                    raise TokenError("The specified alg value is not allowed")
+            claims = json.loads(_b64decode(payload))
+        except (ValueError, binascii.Error):
+            raise TokenError("Invalid token encoding")
+        if not isinstance(claims, dict):
+            raise TokenError("Invalid payload string: must be a json object")
+
+        self.__validate(claims)
+        return claims
+
+    def __validate(self, claims: dict) -> None:
+        now: int = int(time.time())
+
+        if "iat" in claims:
+            if not _is_number(claims["iat"]):
+                raise TokenError("Issued At claim (iat) must be an integer.")
+
+        if "nbf" in claims:
+            if not _is_number(claims["nbf"]):
+                raise TokenError("Not Before claim (nbf) must be an integer.")
+            if claims["nbf"] > now:
+                raise TokenError("The token is not yet valid (nbf)")
+
+        if "exp" in claims:
+            if not _is_number(claims["exp"]):
+                raise TokenError("Expiration Time claim (exp) must be an integer.")
+            if claims["exp"] < now:
+                raise ExpiredTokenError("Signature has expired.")
+
+        for claim in _STRING_CLAIMS:
+            if claim in claims and not isinstance(claims[claim], str):
+                raise TokenError(f"Invalid claim ({claim}): must be a string.")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
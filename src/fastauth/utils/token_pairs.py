@@ -0,0 +1,79 @@
+import uuid
+import datetime
+from calendar import timegm
+from .hs256 import HS256Codec, ALGORITHM
+
+ACCESS_TOKEN_EXPIRE_DAYS = 30
+REFRESH_TOKEN_EXPIRE_DAYS = 365
+
+
+def token_payloads(client_id: str, now: datetime.datetime) -> tuple[dict, dict]:
+    """
+    Access and refresh token payloads for `client_id` issued at `now`.
+    `jti` identifies each token for revocation in stateless mode.
+    """
+    access_token_payload = {
+        "client_id": client_id,
+        "type": "access",
+        "exp": now + datetime.timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS),
+        "iat": now,
+        "jti": uuid.uuid4().hex,
+    }
+    refresh_token_payload = {
+        "client_id": client_id,
+        "type": "refresh",
+        "exp": now + datetime.timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        "iat": now,
+        "jti": uuid.uuid4().hex,
+    }
+    return access_token_payload, refresh_token_payload
+
+
+def encode_token_pairs(
+    client_ids: list[str],
+    key: str,
+    codec: str,
+    now: datetime.datetime,
+) -> list[tuple[str, str, str]]:
+    """
+    Encode an access and refresh token for each client id, as
+    `(client_id, access_token, refresh_token)`, with the same payloads as
+    `token_payloads`. Times are converted once for the whole list.
+
+    Takes the key and codec name explicitly instead of reading `TokenConfig`, so it
+    can run in a worker process that never received the application settings.
+    """
+    if codec == "fast":
+        encode = HS256Codec(key).encode
+    else:
+        from jose import jwt
+
+        def encode(payload: dict) -> str:
+            return jwt.encode(payload, key, algorithm=ALGORITHM)
+
+    iat: int = timegm(now.utctimetuple())
+    access_exp: int = iat + ACCESS_TOKEN_EXPIRE_DAYS * 86400
+    refresh_exp: int = iat + REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+    pairs: list[tuple[str, str, str]] = []
+    for client_id in client_ids:
+        access_token: str = encode(
+            {
+                "client_id": client_id,
+                "type": "access",
+                "exp": access_exp,
+                "iat": iat,
+                "jti": uuid.uuid4().hex,
+            }
+        )
+        refresh_token: str = encode(
+            {
+                "client_id": client_id,
+                "type": "refresh",
+                "exp": refresh_exp,
+                "iat": iat,
+                "jti": uuid.uuid4().hex,
+            }
+        )
+        pairs.append((client_id, access_token, refresh_token))
+    return pairs
@@ -0,0 +1,130 @@
+"""
+Import time of fastauth, measured with `python -X importtime` in fresh interpreters.
+
+Statements timed (each in its own process, `--repeat` times):
+
+- `import fastauth`: must stay cheap; lazy exports mean no FastAPI, jose, httpx,
+  cryptography, config file or log handler is loaded.
+- `from fastauth import Fastauth`: what an application pays at startup.
+
+Besides the cumulative time of each statement, the modules listed in `DEFERRED`
+must not be imported by it: the run fails (exit status 1) if one is, or if
+`--max-ms` is exceeded. `--output` / `--compare` use the same JSON reports as
+`suite.py`, so import time can be tracked across commits like the other stages.
+
+Run:
+    python tests/benchmarks/bench_import.py [--repeat 7] [--top 15] [--max-ms 50]
+        [--output report.json] [--compare baseline.json] [--threshold 0.10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+import harness
+
+STATEMENTS: dict[str, str] = {
+    "import": "import fastauth",
+    "fastauth": "from fastauth import Fastauth",
+}
+
+# Modules each statement must not import
+DEFERRED: dict[str, tuple[str, ...]] = {
+    "import": ("fastapi", "jose", "httpx", "cryptography", "fastauth.config"),
+    "fastauth": ("jose", "httpx", "cryptography", "multiprocessing"),
+}
+
+
+# Prints the wall time of the statement, in ns, on stdout
+TIMED: str = "import time\nstart = time.perf_counter_ns()\n{}\nprint(time.perf_counter_ns() - start)"
+
+
+def importtime(statement: str) -> tuple[int, dict[str, int]]:
+    """
+    Run `statement` in a fresh interpreter: its wall time in ns, and the cumulative
+    import time in µs of every module imported (interpreter startup included).
+    """
+    # No config file and no log file: measure the imports, not the environment
+    with tempfile.TemporaryDirectory(prefix="fastauth-import-") as workdir:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", TIMED.format(statement)],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=workdir,
+            env={**os.environ, "FASTAUTH_LOG_FILE": "0"},
+        )
+
+    modules: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return int(result.stdout), modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--max-ms", type=float, help="fail if `import fastauth` takes longer")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    # Modules already loaded by the interpreter startup are not the statement's
+    _, startup = importtime("pass")
+
+    failures: list[str] = []
+    results: list[harness.Result] = []
+    for name, statement in STATEMENTS.items():
+        result = harness.Result(key=f"import/{name}", number=1)
+        runs: list[dict[str, int]] = []
+        for _ in range(args.repeat):
+            elapsed_ns, modules = importtime(statement)
+            runs.append({module: cumulative for module, cumulative in modules.items() if module not in startup})
+            result.rounds_ns.append(float(elapsed_ns))
+        results.append(result)
+
+        loaded = set().union(*runs)
+        for module in DEFERRED[name]:
+            if module in loaded:
+                failures.append(f"`{statement}` imports {module}")
+
+        # Median over the runs, for modules seen in all of them
+        common = set.intersection(*(set(run) for run in runs))
+        medians = {module: statistics.median(run[module] for run in runs) for module in common}
+        print(f"\n{statement}: {len(loaded)} modules")
+        for module, cumulative in sorted(medians.items(), key=lambda item: -item[1])[: args.top]:
+            print(f"  {cumulative / 1000:>9.2f} ms  {module}")
+
+    print()
+    harness.print_results(results)
+
+    if args.max_ms is not None:
+        import_ms: float = results[0].median_ns / 1e6
+        if import_ms > args.max_ms:
+            failures.append(f"`import fastauth` took {import_ms:.2f} ms (max {args.max_ms} ms)")
+
+    data = harness.report(results, settings={"repeat": args.repeat, "python": sys.version.split()[0]})
+    if args.output:
+        harness.save(data, args.output)
+        print(f"\nreport written to {args.output}")
+    if args.compare:
+        regressions = harness.compare(harness.load(args.compare), data, args.threshold)
+        if regressions:
+            failures.append(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Encode / decode operations per second of python-jose against the built-in
+`HS256Codec`, with the claims fastauth issues. The decoded token cache is not
+involved: every decode verifies the signature and claims.
+
+Run:
+    python tests/benchmarks/bench_jwt_codec.py [--operations 20000]
+"""
+
+import argparse
+import datetime
+import timeit
+import uuid
+
+from jose import jwt
+from fastauth.utils.hs256 import HS256Codec
+
+KEY = "benchmark-cryptography-key"
+
+
+def claims() -> dict:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "client_id": str(uuid.uuid4()),
+        "type": "access",
+        "exp": now + datetime.timedelta(days=30),
+        "iat": now,
+        "jti": uuid.uuid4().hex,
+    }
+
+
+def main(operations: int) -> None:
+    codec = HS256Codec(KEY)
+    payload = claims()
+    token = codec.encode(payload)
+
+    cases = {
+        "jose": (
+            lambda: jwt.encode(dict(payload), KEY, algorithm="HS256"),
+            lambda: jwt.decode(token, KEY, algorithms=["HS256"]),
+        ),
+        "fast": (
+            lambda: codec.encode(payload),
+            lambda: codec.decode(token),
+        ),
+    }
+
+    print(f"{'codec':<6} {'encode ops/s':>13} {'decode ops/s':>13}")
+    results: dict[str, tuple[float, float]] = {}
+    for name, (encode, decode) in cases.items():
+        encode_time = min(timeit.repeat(encode, number=operations, repeat=3))
+        decode_time = min(timeit.repeat(decode, number=operations, repeat=3))
+        results[name] = (operations / encode_time, operations / decode_time)
+        print(f"{name:<6} {results[name][0]:>13,.0f} {results[name][1]:>13,.0f}")
+
+    print(
+        f"speedup: encode x{results['fast'][0] / results['jose'][0]:.1f}, "
+        f"decode x{results['fast'][1] / results['jose'][1]:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--operations", type=int, default=20000)
+    main(parser.parse_args().operations)
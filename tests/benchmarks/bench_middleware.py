@@ -0,0 +1,119 @@
+"""
+Requests/sec of `AccessTokenMiddleware` (BaseHTTPMiddleware) against
+`AccessTokenASGIMiddleware` (pure ASGI).
+
+The apps are called in-process through their ASGI interface, so the numbers
+measure middleware overhead only (no sockets, no HTTP parsing). The canonical
+access token is preloaded in the token cache, so no database is needed.
+
+Run:
+    python tests/benchmarks/bench_middleware.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from fastauth import Fastauth, AccessTokenMiddleware, AccessTokenASGIMiddleware
+from fastauth.config import logger
+from fastauth.client_db.cache import token_cache
+from fastauth.utils import TokenCriptografy
+
+MASTER_TOKEN = "benchmark-master-token"
+CLIENT_ID = "benchmark-client"
+
+Fastauth(
+    settings={
+        "master_token": MASTER_TOKEN,
+        "cryptography_key": "benchmark-cryptography-key",
+        "master_token_paths": ["/master"],
+        "access_token_paths": ["/access"],
+        "token_cache_ttl": 3600,
+    }
+)
+ACCESS_TOKEN = TokenCriptografy.encode(
+    {"client_id": CLIENT_ID, "type": "access", "exp": int(time.time()) + 3600}
+)
+
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/open")
+    async def open_route():
+        return {"status": "ok"}
+
+    @app.get("/master/health")
+    async def master_route():
+        return {"status": "ok"}
+
+    @app.get("/access/health")
+    async def access_route():
+        return {"status": "ok"}
+
+    return app
+
+
+def scope(path: str, headers: list[tuple[bytes, bytes]]) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000),
+    }
+
+
+async def run(app, request_scope: dict, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(request_scope), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+CASES = {
+    "unprotected": scope("/open", []),
+    "master": scope("/master/health", [(b"master-token", MASTER_TOKEN.encode())]),
+    "access": scope("/access/health", [(b"access-token", ACCESS_TOKEN.encode())]),
+    "denied": scope("/access/health", []),
+}
+
+
+async def main(requests: int) -> None:
+    token_cache.set(CLIENT_ID, ACCESS_TOKEN)
+    apps = {
+        "BaseHTTPMiddleware": build_app(AccessTokenMiddleware),
+        "ASGI": build_app(AccessTokenASGIMiddleware),
+    }
+    print(f"{'case':<12} {'middleware':<20} {'req/s':>10}")
+    for case, request_scope in CASES.items():
+        for name, app in apps.items():
+            await run(app, request_scope, requests // 10)  # warm up
+            rps = await run(app, request_scope, requests)
+            print(f"{case:<12} {name:<20} {rps:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Per-request path logging would dominate both measurements
+    logger.setLevel(logging.WARNING)
+    asyncio.run(main(args.requests))
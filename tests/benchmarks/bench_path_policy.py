@@ -0,0 +1,59 @@
+"""
+Path matching cost per request: the former linear `str.startswith` scans over
+`MASTER_PATHS` + `ACCESS_TOKEN_PATHS` against one `PathPolicy.lookup`.
+
+Run:
+    python tests/benchmarks/bench_path_policy.py [--lookups 200000]
+"""
+
+import argparse
+import random
+import timeit
+
+from fastauth.middleware.policy import PathPolicy
+
+SIZES = (10, 100, 1000)
+
+
+def prefixes(count: int, rng: random.Random) -> list[str]:
+    return [
+        f"/api/v{rng.randint(1, 3)}/{'svc' if i % 2 else 'res'}{i}/{rng.choice('abcdef')}"
+        for i in range(count)
+    ]
+
+
+def linear(master_paths: list[str], access_paths: list[str], path: str) -> tuple:
+    master = any(path.startswith(prefix) for prefix in master_paths)
+    access = any(path.startswith(prefix) for prefix in access_paths)
+    return master, access
+
+
+def main(lookups: int) -> None:
+    rng = random.Random(0)
+    print(f"{'prefixes':>8} {'case':<6} {'linear ns/op':>13} {'policy ns/op':>13}")
+    for size in SIZES:
+        rules = prefixes(size, rng)
+        master_paths, access_paths = rules[: size // 2], rules[size // 2 :]
+        policy = PathPolicy(master_paths, access_paths)
+        cases = {
+            "hit": access_paths[-1] + "/items/42",
+            "miss": "/public/health/check",
+        }
+        for case, path in cases.items():
+            linear_time = timeit.timeit(
+                lambda: linear(master_paths, access_paths, path), number=lookups
+            )
+            policy_time = timeit.timeit(
+                lambda: policy.lookup(path, "GET"), number=lookups
+            )
+            print(
+                f"{size:>8} {case:<6} {linear_time / lookups * 1e9:>13.0f} "
+                f"{policy_time / lookups * 1e9:>13.0f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.lookups)
@@ -0,0 +1,149 @@
+"""
+Database load and cache hit rate of token lookups as the number of worker processes grows,
+with each worker's local cache only and with the shared token cache (`shared_token_cache`).
+
+Every run sends the same total number of lookups (`--requests`), spread over
+`--workers` processes like a load balancer would, for `--clients` clients picked with
+a skewed (Pareto) distribution. The token store is an in-process stand-in that counts
+loads and waits `--latency-ms` per call. With local caches only, each worker loads
+every client it sees, so database loads grow with the worker count; with the shared
+cache, a client is loaded once for all of them.
+
+A last section times a single lookup hit in the local and in the shared cache.
+
+Run:
+    python tests/benchmarks/bench_shared_cache.py [--workers 1 2 4 8] [--clients 2000]
+        [--requests 40000] [--latency-ms 0.5] [--slots 65536]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from fastauth.client_db.client_db import verify_access_token
+from fastauth.client_db.shared_cache import shared_tokens
+from fastauth.client_db.cache import token_cache
+from fastauth.client_db.stores import set_token_store
+from fastauth.client_db.stores.memory_store import MemoryTokenStore
+from fastauth.config import CacheConfig
+
+
+def token_of(client_id: str) -> str:
+    return f"eyJ.{client_id}.signature"
+
+
+class CountingStore(MemoryTokenStore):
+    """Every client exists; each load waits `latency` and increments a counter shared by the workers."""
+
+    def __init__(self, loads, latency: float):
+        super().__init__()
+        self.loads = loads
+        self.latency: float = latency
+
+    async def load(self, client_id: str) -> dict | None:
+        with self.loads.get_lock():
+            self.loads.value += 1
+        await asyncio.sleep(self.latency)
+        return {"access_token": token_of(client_id), "refresh_token": "refresh"}
+
+
+def configure(shared: bool, path: str, slots: int) -> None:
+    CacheConfig.TTL = 300.0
+    CacheConfig.SHARED = shared
+    CacheConfig.SHARED_PATH = path
+    CacheConfig.SHARED_SLOTS = slots
+
+
+def worker(index: int, args: argparse.Namespace, shared: bool, path: str, loads, results) -> None:
+    configure(shared, path, args.slots)
+    shared_tokens.open()
+    set_token_store(CountingStore(loads, args.latency_ms / 1000))
+    rng = random.Random(index)
+    clients: list[str] = [f"client-{rng_index:06d}" for rng_index in range(args.clients)]
+    requests: int = args.requests // args.workers_now
+
+    async def run() -> None:
+        for _ in range(requests):
+            client_id: str = clients[min(int(rng.paretovariate(1.2)) - 1, args.clients - 1)]
+            if not await verify_access_token(client_id, token_of(client_id)):
+                raise RuntimeError(f"{client_id}: token rejected")
+
+    start: float = time.perf_counter()
+    asyncio.run(run())
+    results.put((requests, time.perf_counter() - start))
+    shared_tokens.close()
+
+
+def scenario(args: argparse.Namespace, workers: int, shared: bool) -> tuple[int, float]:
+    """Returns (database loads, lookups per second per worker)."""
+    context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    loads = context.Value("q", 0)
+    results = context.Queue()
+    args.workers_now = workers
+    with tempfile.TemporaryDirectory(prefix="fastauth-shared-") as directory:
+        path: str = os.path.join(directory, "tokens")
+        processes = [
+            context.Process(target=worker, args=(index, args, shared, path, loads, results))
+            for index in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        rates: list[float] = []
+        for _ in processes:
+            requests, elapsed = results.get()
+            rates.append(requests / elapsed)
+        for process in processes:
+            process.join()
+            if process.exitcode != 0:
+                raise SystemExit(f"worker failed with exit code {process.exitcode}")
+    return loads.value, sum(rates) / len(rates)
+
+
+def micro(args: argparse.Namespace, number: int = 200_000) -> None:
+    with tempfile.TemporaryDirectory(prefix="fastauth-shared-") as directory:
+        configure(True, os.path.join(directory, "tokens"), args.slots)
+        shared_tokens.open()
+        token_cache.set("client-000001", token_of("client-000001"))
+        shared_tokens.set("client-000001", token_of("client-000001"))
+
+        for name, call in (
+            ("local cache get", lambda: token_cache.get("client-000001")),
+            ("shared cache get", lambda: shared_tokens.get("client-000001")),
+            ("shared get + digest", lambda: shared_tokens.get("client-000001") == shared_tokens.digest(token_of("client-000001"))),
+        ):
+            start: float = time.perf_counter()
+            for _ in range(number):
+                call()
+            print(f"{name:<22} {(time.perf_counter() - start) / number * 1e9:>8.0f} ns")
+        shared_tokens.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=40000)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    parser.add_argument("--slots", type=int, default=65536)
+    args = parser.parse_args()
+
+    print(f"{args.requests:,} lookups, {args.clients:,} clients, {args.latency_ms} ms per database load\n")
+    print(f"{'workers':>7} {'cache':<7} {'db loads':>10} {'hit rate':>9} {'lookups/s/worker':>17}")
+    for workers in args.workers:
+        for shared in (False, True):
+            loads, rate = scenario(args, workers, shared)
+            hit_rate: float = 1 - loads / (args.requests // workers * workers)
+            print(f"{workers:>7} {'shared' if shared else 'local':<7} {loads:>10,} {hit_rate:>8.1%} {rate:>17,.0f}")
+
+    print()
+    micro(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Timing, reporting and comparison helpers for `tests/benchmarks/suite.py`.
+
+A case is a zero-argument callable (sync or async) timed as `repeat` rounds of
+`number` calls each; the report keeps the per-call time of every round, so two
+reports can be compared case by case.
+"""
+
+import gc
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+REPORT_VERSION = 1
+
+
+@dataclass
+class Case:
+    stage: str
+    name: str
+    call: Callable[[], Any]
+    number: int
+    setup: Callable[[], Any] | None = None
+    teardown: Callable[[], Any] | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}/{self.name}"
+
+
+@dataclass
+class Result:
+    key: str
+    number: int
+    rounds_ns: list[float] = field(default_factory=list)
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.rounds_ns)
+
+    @property
+    def min_ns(self) -> float:
+        return min(self.rounds_ns)
+
+    @property
+    def stdev_ns(self) -> float:
+        return statistics.stdev(self.rounds_ns) if len(self.rounds_ns) > 1 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "number": self.number,
+            "median_ns": round(self.median_ns, 1),
+            "min_ns": round(self.min_ns, 1),
+            "stdev_ns": round(self.stdev_ns, 1),
+            "ops_per_sec": round(1e9 / self.median_ns, 1),
+            "rounds_ns": [round(value, 1) for value in self.rounds_ns],
+        }
+
+
+async def measure(case: Case, repeat: int, warmup: int) -> Result:
+    is_async: bool = inspect.iscoroutinefunction(case.call)
+
+    async def run(number: int) -> float:
+        call = case.call
+        # Same as timeit: collections would land on arbitrary rounds
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            if is_async:
+                for _ in range(number):
+                    await call()
+            else:
+                for _ in range(number):
+                    call()
+            return (time.perf_counter_ns() - start) / number
+        finally:
+            gc.enable()
+
+    if case.setup is not None:
+        await _maybe_await(case.setup())
+    try:
+        await run(warmup)
+        result = Result(key=case.key, number=case.number)
+        for _ in range(repeat):
+            result.rounds_ns.append(await run(case.number))
+    finally:
+        if case.teardown is not None:
+            await _maybe_await(case.teardown())
+    return result
+
+
+async def _maybe_await(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def environment() -> dict:
+    def git(*args: str) -> str | None:
+        try:
+            return subprocess.run(
+                ["git", *args],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def report(results: list[Result], settings: dict) -> dict:
+    return {
+        "version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "settings": settings,
+        "results": {result.key: result.as_dict() for result in results},
+    }
+
+
+def print_results(results: list[Result]) -> None:
+    print(f"{'case':<40} {'median':>12} {'min':>12} {'ops/s':>12}")
+    for result in results:
+        print(
+            f"{result.key:<40} {_format_ns(result.median_ns):>12} "
+            f"{_format_ns(result.min_ns):>12} {1e9 / result.median_ns:>12,.0f}"
+        )
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Print the median change of every case present in both reports and return the
+    keys slower than the baseline by more than `threshold` (0.10 = 10%).
+    """
+    regressions: list[str] = []
+    base_commit = (baseline.get("environment", {}).get("commit") or "?")[:10]
+    current_commit = (current.get("environment", {}).get("commit") or "?")[:10]
+    if baseline.get("settings") != current.get("settings"):
+        print(f"\nwarning: settings differ from the baseline: {baseline.get('settings')}")
+    print(f"\n{'case':<40} {base_commit:>12} {current_commit:>12} {'change':>9}")
+
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"{key:<40} {'-':>12} {_format_ns(result['median_ns']):>12} {'new':>9}")
+            continue
+        change: float = result["median_ns"] / base["median_ns"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  << slower"
+        print(
+            f"{key:<40} {_format_ns(base['median_ns']):>12} "
+            f"{_format_ns(result['median_ns']):>12} {change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        data: dict = json.load(f)
+    if data.get("version") != REPORT_VERSION:
+        raise ValueError(f"{path}: unsupported report version {data.get('version')!r}")
+    return data
+
+
+def save(data: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def _format_ns(value: float) -> str:
+    if value >= 1e6:
+        return f"{value / 1e6:.2f} ms"
+    if value >= 1e3:
+        return f"{value / 1e3:.2f} µs"
+    return f"{value:.0f} ns"
+
@@ -0,0 +1,285 @@
+"""
+Benchmark suite for the auth hot path, one stage at a time:
+
+- policy      `required_tokens` path matching (`require_*_token`)
+- decode      `TokenCriptografy.decode`, with and without the decoded token cache
+- lookup      `load_access_token`, from the token cache and from the database
+- middleware  full request round trips through `AccessTokenMiddleware` and
+              `AccessTokenASGIMiddleware`, via an ASGI test client
+- issuance    `BaseTokenGeneration` new and refreshed token pairs
+
+The database is an in-process copy of the `examples/databases/json_database`
+router, reached through `httpx.ASGITransport` with the regular HTTP token store,
+so no server has to be running. Its files live in a temporary directory.
+
+Reports are JSON files holding the commit, environment and per-round timings;
+`--compare` prints the change against a previous report and exits with status 1
+when a case got slower than `--threshold`.
+
+Run:
+    python tests/benchmarks/suite.py [--stages policy,decode] [--repeat 7]
+        [--scale 1.0] [--codec jose|fast] [--output report.json]
+        [--compare baseline.json] [--threshold 0.10]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+import harness
+from harness import Case
+
+ROOT = Path(__file__).resolve().parents[2]
+JSON_DATABASE = ROOT / "examples" / "databases" / "json_database"
+STAGES = ("policy", "decode", "lookup", "middleware", "issuance")
+
+MASTER_TOKEN = "benchmark-master-token"
+CRYPTOGRAPHY_KEY = "benchmark-cryptography-key"
+DATABASE_URL = "http://jsondb/mydb/data"
+CLIENT_ID = "benchmark-client"
+ISSUANCE_CLIENTS = 100
+
+
+def settings(codec: str) -> dict:
+    # Enough rules that the policy is not trivially small
+    services = [f"/api/v1/service{i}" for i in range(50)]
+    return {
+        "database_api_path": DATABASE_URL,
+        "master_token": MASTER_TOKEN,
+        "cryptography_key": CRYPTOGRAPHY_KEY,
+        "master_token_paths": ["/master", *services[:25]],
+        "access_token_paths": ["/access", *services[25:]],
+        "jwt_codec": codec,
+        "log_file": False,
+        "log_level": "WARNING",
+    }
+
+
+def database_app() -> FastAPI:
+    """The JSON database example, mounted as `examples/databases/json_database/api.py` does."""
+    sys.path.insert(0, str(JSON_DATABASE))
+    from jsondb import router
+
+    app = FastAPI()
+    app.include_router(router=router, prefix="/mydb")
+    return app
+
+
+def protected_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/open")
+    async def open_route():
+        return {"status": "ok"}
+
+    @app.get("/master/health")
+    async def master_route():
+        return {"status": "ok"}
+
+    @app.get("/access/health")
+    async def access_route():
+        return {"status": "ok"}
+
+    return app
+
+
+def access_payload(client_id: str) -> dict:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "client_id": client_id,
+        "type": "access",
+        "exp": now + datetime.timedelta(days=30),
+        "iat": now,
+        "jti": "benchmark",
+    }
+
+
+async def build_cases(stages: list[str], scale: float) -> list[Case]:
+    from fastauth import AccessTokenMiddleware, AccessTokenASGIMiddleware
+    from fastauth.client_db.cache import token_cache
+    from fastauth.client_db.client_db import load_access_token, save_token
+    from fastauth.config import CacheConfig
+    from fastauth.middleware.checks import required_tokens
+    from fastauth.routers.auth import BaseTokenGeneration
+    from fastauth.utils import TokenCriptografy
+
+    def number(base: int) -> int:
+        return max(1, int(base * scale))
+
+    access_token: str = TokenCriptografy.encode(access_payload(CLIENT_ID))
+    if not await save_token(CLIENT_ID, access_token, access_token):
+        raise RuntimeError("The in-process JSON database did not save the benchmark token")
+
+    cases: list[Case] = []
+
+    if "policy" in stages:
+        for name, path in {
+            "master": "/auth/token/new",
+            "access-hit": "/api/v1/service40/items/42",
+            "miss": "/public/health/check",
+        }.items():
+            cases.append(
+                Case("policy", name, lambda path=path: required_tokens(path, "GET"), number(200000))
+            )
+
+    if "decode" in stages:
+        decoded_size: int = CacheConfig.DECODED_MAX_SIZE
+
+        def disable_decoded_cache():
+            CacheConfig.DECODED_MAX_SIZE = 0
+
+        def restore_decoded_cache():
+            CacheConfig.DECODED_MAX_SIZE = decoded_size
+
+        cases.append(
+            Case(
+                "decode",
+                "verify",
+                lambda: TokenCriptografy.decode(access_token),
+                number(20000),
+                setup=disable_decoded_cache,
+                teardown=restore_decoded_cache,
+            )
+        )
+        cases.append(
+            Case("decode", "cached", lambda: TokenCriptografy.decode(access_token), number(200000))
+        )
+
+    if "lookup" in stages:
+
+        async def lookup():
+            return await load_access_token(CLIENT_ID)
+
+        async def lookup_database():
+            token_cache.invalidate(CLIENT_ID)
+            return await load_access_token(CLIENT_ID)
+
+        if await lookup_database() != access_token:
+            raise RuntimeError("The in-process JSON database did not return the benchmark token")
+        cases.append(Case("lookup", "cached", lookup, number(100000)))
+        cases.append(Case("lookup", "database", lookup_database, number(1000)))
+
+    if "middleware" in stages:
+        requests = {
+            "open": ("/open", {}, 200),
+            "master": ("/master/health", {"MASTER-TOKEN": MASTER_TOKEN}, 200),
+            "access": ("/access/health", {"ACCESS-TOKEN": access_token}, 200),
+            "denied": ("/access/health", {}, 401),
+        }
+        for variant, middleware in {
+            "base": AccessTokenMiddleware,
+            "asgi": AccessTokenASGIMiddleware,
+        }.items():
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=protected_app(middleware)),
+                base_url="http://app",
+            )
+            for name, (path, headers, status) in requests.items():
+
+                async def request(client=client, path=path, headers=headers):
+                    return await client.get(path, headers=headers)
+
+                # A misconfigured run would otherwise time error responses
+                response = await request()
+                if response.status_code != status:
+                    raise RuntimeError(f"{variant}-{name}: expected {status}, got {response.status_code}")
+                cases.append(Case("middleware", f"{variant}-{name}", request, number(5000)))
+
+    if "issuance" in stages:
+        # A fixed set of clients keeps the JSON database file the same size across rounds
+        clients = [f"issuance-client-{i}" for i in range(ISSUANCE_CLIENTS)]
+        counter = iter(range(10**12))
+
+        async def issue():
+            client_id = clients[next(counter) % ISSUANCE_CLIENTS]
+            return await BaseTokenGeneration.generate_access_token(client_id=client_id)
+
+        response = await issue()
+        if response.status_code != 200:
+            raise RuntimeError(f"Token issuance failed with {response.status_code}")
+        refresh_token: str = json.loads(response.body)["data"]["refresh_token"]
+
+        async def refresh():
+            return await BaseTokenGeneration.refresh_access_token(refresh_token)
+
+        cases.append(Case("issuance", "new", issue, number(500)))
+        cases.append(Case("issuance", "refresh", refresh, number(500)))
+
+    return cases
+
+
+async def run(args: argparse.Namespace) -> list[harness.Result]:
+    from fastauth import Fastauth
+    from fastauth.client_db.http_client import DatabaseClient
+
+    Fastauth(settings=settings(args.codec))
+    DatabaseClient.transport = httpx.ASGITransport(app=database_app())
+    try:
+        cases = await build_cases(args.stages, args.scale)
+        results: list[harness.Result] = []
+        for case in cases:
+            results.append(await harness.measure(case, args.repeat, args.warmup))
+        return results
+    finally:
+        await DatabaseClient.aclose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stages", type=lambda value: value.split(","), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies calls per round")
+    parser.add_argument("--codec", choices=("jose", "fast"), default="jose")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    # The JSON database writes `data/` relative to the working directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="fastauth-bench-") as workdir:
+        os.chdir(workdir)
+        try:
+            results = asyncio.run(run(args))
+        finally:
+            os.chdir(cwd)
+
+    harness.print_results(results)
+    data = harness.report(
+        results,
+        settings={
+            "stages": args.stages,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "scale": args.scale,
+            "codec": args.codec,
+        },
+    )
+    if args.output:
+        harness.save(data, args.output)
+        print(f"\nreport written to {args.output}")
+
+    if args.compare:
+        regressions = harness.compare(harness.load(args.compare), data, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
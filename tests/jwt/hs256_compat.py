@@ -0,0 +1,144 @@
+"""
+Compatibility checks between the built-in `HS256Codec` and python-jose.
+
+Tokens are produced by one codec and verified by the other, with the claims
+fastauth issues, and both codecs must reject the same tampered or expired tokens.
+
+Run:
+    python tests/jwt/hs256_compat.py
+"""
+
+import json
+import time
+import uuid
+import base64
+import datetime
+
+from jose import jwt
+from jose.exceptions import JWTError
+from fastauth.utils.hs256 import HS256Codec, TokenError, ExpiredTokenError
+
+KEY = "compat-cryptography-key"
+OTHER_KEY = "another-cryptography-key"
+
+codec = HS256Codec(KEY)
+
+
+def payload(**claims) -> dict:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return {
+        "client_id": str(uuid.uuid4()),
+        "type": "access",
+        "exp": now + datetime.timedelta(days=30),
+        "iat": now,
+        "jti": uuid.uuid4().hex,
+        **claims,
+    }
+
+
+def jose_encode(claims: dict, key: str = KEY, **kwargs) -> str:
+    return jwt.encode(dict(claims), key, algorithm="HS256", **kwargs)
+
+
+def jose_decode(token: str, key: str = KEY) -> dict:
+    return jwt.decode(token, key, algorithms=["HS256"])
+
+
+def segment(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def resign(header: str, body: str) -> str:
+    """A token with a correct HS256 signature over an arbitrary header."""
+    signing_input = f"{header}.{body}".encode()
+    signature = base64.urlsafe_b64encode(codec.sign(signing_input)).rstrip(b"=").decode()
+    return f"{header}.{body}.{signature}"
+
+
+def rejects(decode, token: str, error: type = Exception) -> bool:
+    try:
+        decode(token)
+    except error:
+        return True
+    return False
+
+
+def check_same_bytes() -> None:
+    for claims in (payload(), payload(type="refresh"), {"a": "b"}, payload(client_id="ñandú ✓")):
+        assert codec.encode(dict(claims)) == jose_encode(claims), claims
+
+
+def check_jose_to_fast() -> None:
+    claims = payload()
+    token = jose_encode(claims)
+    assert codec.decode(token) == jose_decode(token)
+    assert codec.decode(token.encode("ascii")) == jose_decode(token)
+
+
+def check_fast_to_jose() -> None:
+    claims = payload(type="refresh")
+    token = codec.encode(claims)
+    assert jose_decode(token) == codec.decode(token)
+
+
+def check_extra_headers() -> None:
+    token = jose_encode(payload(), headers={"kid": "key-1"})
+    assert codec.decode(token) == jose_decode(token)
+
+
+def check_rejections() -> None:
+    valid = jose_encode(payload())
+    header, body, signature = valid.split(".")
+    flipped = signature[:-2] + ("A" if signature[-2] != "A" else "B") + signature[-1]
+    tampered_body = jose_encode(payload(type="refresh")).split(".")[1]
+    cases = {
+        "wrong key": jose_encode(payload(), key=OTHER_KEY),
+        "bad signature": f"{header}.{body}.{flipped}",
+        "swapped payload": f"{header}.{tampered_body}.{signature}",
+        "missing segment": f"{header}.{body}",
+        "garbage": "not-a-token",
+        "alg none": f"{segment({'alg': 'none', 'typ': 'JWT'})}.{body}.",
+        "alg HS512": resign(segment({"alg": "HS512", "typ": "JWT"}), body),
+    }
+    for case, token in cases.items():
+        assert rejects(codec.decode, token, TokenError), case
+        assert rejects(jose_decode, token, JWTError), case
+
+
+def check_claims() -> None:
+    now = int(time.time())
+    expired = jose_encode({"client_id": "c", "type": "access", "exp": now - 10, "iat": now - 20})
+    assert rejects(codec.decode, expired, ExpiredTokenError)
+    assert rejects(jose_decode, expired, JWTError)
+
+    bad_iat = jose_encode({"client_id": "c", "exp": now + 60, "iat": "yesterday"})
+    assert rejects(codec.decode, bad_iat, TokenError)
+    assert rejects(jose_decode, bad_iat, JWTError)
+
+    bad_exp = jose_encode({"client_id": "c", "exp": "tomorrow"})
+    assert rejects(codec.decode, bad_exp, TokenError)
+    assert rejects(jose_decode, bad_exp, JWTError)
+
+    not_before = jose_encode({"client_id": "c", "exp": now + 60, "nbf": now + 30})
+    assert rejects(codec.decode, not_before, TokenError)
+    assert rejects(jose_decode, not_before, JWTError)
+
+    # Claims fastauth reads must have the types it expects
+    assert rejects(codec.decode, jose_encode({"client_id": 42, "exp": now + 60}), TokenError)
+    assert rejects(codec.decode, jose_encode({"type": ["access"], "exp": now + 60}), TokenError)
+
+
+CHECKS = (
+    check_same_bytes,
+    check_jose_to_fast,
+    check_fast_to_jose,
+    check_extra_headers,
+    check_rejections,
+    check_claims,
+)
+
+
+if __name__ == "__main__":
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
@@ -0,0 +1,77 @@
+"""
+Checks that the OpenAPI document sets `security` on parameterised routes protected
+by glob and regex rules, which are written against request paths (`/items/42`) and
+not against the templates of the document (`/items/{item_id}`).
+
+Run:
+    python tests/openapi/security_templates.py
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastauth import Fastauth
+
+ACCESS = [{"AccessTokenHeader": []}]
+# One object: both headers are required
+BOTH = [{"AccessTokenHeader": [], "MasterTokenHeader": []}]
+
+
+def document() -> dict:
+    app = FastAPI()
+    Fastauth(
+        settings={
+            "token_store": "memory",
+            "master_token": "security-templates-master-token",
+            "cryptography_key": "security-templates-cryptography-key",
+            "master_token_paths": ["DELETE re:^/items/[0-9]+$"],
+            "access_token_paths": ["/items/*", "/files/*/private", "/static/*.css"],
+            "log_level": "WARNING",
+        }
+    ).set_auth(app)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.delete("/items/{item_id}")
+    def delete_item(item_id: int):
+        return {"item_id": item_id}
+
+    @app.get("/files/{file_id}/private")
+    def private_file(file_id: str):
+        return {"file_id": file_id}
+
+    @app.get("/files/{file_id}/public")
+    def public_file(file_id: str):
+        return {"file_id": file_id}
+
+    @app.get("/static/{name}")
+    def static(name: str):
+        return {"name": name}
+
+    @app.get("/users/{user_id}")
+    def read_user(user_id: str):
+        return {"user_id": user_id}
+
+    with TestClient(app) as c:
+        return c.get("/openapi.json").json()
+
+
+def check_security() -> None:
+    paths: dict = document()["paths"]
+    assert paths["/items/{item_id}"]["get"].get("security") == ACCESS
+    assert paths["/items/{item_id}"]["delete"].get("security") == BOTH
+    assert paths["/files/{file_id}/private"]["get"].get("security") == ACCESS
+    # Some names end with `.css`
+    assert paths["/static/{name}"]["get"].get("security") == ACCESS
+    assert "security" not in paths["/files/{file_id}/public"]["get"]
+    assert "security" not in paths["/users/{user_id}"]["get"]
+
+
+CHECKS = (check_security,)
+
+
+if __name__ == "__main__":
+    for check in CHECKS:
+        check()
+        print(f"ok  {check.__name__}")
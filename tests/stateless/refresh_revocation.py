@@ -0,0 +1,88 @@
+"""
+Checks that, with `stateless_verification`, issuing a new pair for a client revokes
+its previous access token: the old token must be rejected like in stateful mode.
+
+Uses the in-memory token store, no database API needed.
+
+Run:
+    python tests/stateless/refresh_revocation.py
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from fastauth import Fastauth
+
+MASTER_TOKEN = "refresh-revocation-master-token"
+
+
+def client(stateless: bool) -> TestClient:
+    app = FastAPI()
+    Fastauth(
+        settings={
+            "token_store": "memory",
+            "master_token": MASTER_TOKEN,
+            "cryptography_key": "refresh-revocation-cryptography-key",
+            "access_token_paths": ["/protected"],
+            "stateless_verification": stateless,
+            "log_level": "WARNING",
+        }
+    ).set_auth(app)
+
+    @app.get("/protected")
+    def protected():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def status(c: TestClient, access_token: str) -> int:
+    return c.get("/protected", headers={"ACCESS-TOKEN": access_token}).status_code
+
+
+def new_pair(c: TestClient, client_id: str) -> dict:
+    response = c.get(
+        "/auth/token/new", params={"client_id": client_id}, headers={"MASTER-TOKEN": MASTER_TOKEN}
+    )
+    return response.json()["data"]
+
+
+def check_refresh(stateless: bool) -> None:
+    with client(stateless) as c:
+        old: dict = new_pair(c, "refresh-client")
+        assert status(c, old["access_token"]) == 200
+
+        refreshed: dict = c.get(
+            "/auth/token/refresh", params={"refresh_token": old["refresh_token"]}
+        ).json()["data"]
+        assert status(c, refreshed["access_token"]) == 200
+        assert status(c, old["access_token"]) == 401, "superseded token still accepted"
+
+
+def check_reissue(stateless: bool) -> None:
+    with client(stateless) as c:
+        old: dict = new_pair(c, "reissued-client")
+        new: dict = new_pair(c, "reissued-client")
+        assert status(c, new["access_token"]) == 200
+        assert status(c, old["access_token"]) == 401, "superseded token still accepted"
+
+
+def check_bulk(stateless: bool) -> None:
+    with client(stateless) as c:
+        old: dict = new_pair(c, "bulk-client")
+        response = c.post(
+            "/auth/token/bulk",
+            json={"client_ids": ["bulk-client", "other-client"]},
+            headers={"MASTER-TOKEN": MASTER_TOKEN},
+        )
+        assert response.status_code == 200
+        assert status(c, old["access_token"]) == 401, "superseded token still accepted"
+
+
+CHECKS = (check_refresh, check_reissue, check_bulk)
+
+
+if __name__ == "__main__":
+    for stateless in (False, True):
+        for check in CHECKS:
+            check(stateless)
+            print(f"ok  {check.__name__} (stateless={stateless})")